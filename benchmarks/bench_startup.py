@@ -0,0 +1,97 @@
+# ============================================================================
+# benchmarks/bench_startup.py - Время импорта модулей (-X importtime)
+# ============================================================================
+"""
+Измеряет время импорта пакетов в свежем процессе через `python -X importtime`
+и сравнивает его с бюджетом. Заодно проверяет, что модули ядра не тянут
+tkinter и модули ui.
+
+Запуск из корня проекта:
+    python benchmarks/bench_startup.py [--repeat N]
+
+Код возврата 1, если бюджет превышен или найден запрещённый импорт.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модуль -> бюджет суммарного времени импорта (мс)
+IMPORT_BUDGETS_MS = {
+    'domain': 15,
+    'services': 10,
+    'services.state_manager': 60,
+    'services.batch_runner': 60,
+    'services.automaton_io': 60,
+    'ui.diagram_export': 80,
+}
+
+# Модули, которые должны импортироваться без tkinter и без ui
+HEADLESS_MODULES = [
+    'domain',
+    'services',
+    'services.state_manager',
+    'services.batch_runner',
+    'services.automaton_io',
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure_import(module: str) -> float:
+    """Суммарное время импорта module (мс) в новом процессе"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    # Суммируем cumulative строк верхнего уровня для самого модуля и его
+    # родительских пакетов (импорты интерпретатора при старте не учитываются)
+    parts = module.split(".")
+    names = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1 and match.group(4) in names:
+            total_us += int(match.group(2))
+    return total_us / 1000
+
+
+def forbidden_imports(module: str) -> list:
+    """Модули tkinter/ui, загруженные при импорте module"""
+    code = (f"import sys, {module}; "
+            "print(' '.join(m for m in sys.modules "
+            "if m.split('.')[0] in ('tkinter', '_tkinter', 'ui')))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="число замеров (медиана)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'модуль':<28}{'медиана, мс':>12}{'бюджет, мс':>12}")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        median = statistics.median(measure_import(module) for _ in range(args.repeat))
+        mark = "" if median <= budget else "  ПРЕВЫШЕН"
+        failed |= median > budget
+        print(f"{module:<28}{median:>12.2f}{budget:>12}{mark}")
+
+    for module in HEADLESS_MODULES:
+        extra = forbidden_imports(module)
+        if extra:
+            failed = True
+            print(f"{module}: импортирует {', '.join(extra)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+# ============================================================================
+# benchmarks/fuzz_engines.py - Дифференциальная проверка быстрых движков
+# ============================================================================
+"""
+Сравнивает быстрые пути симуляции с эталонной семантикой на случайных
+автоматах и словах, сокращает найденные расхождения до минимального
+контрпримера и измеряет пропускную способность каждого движка.
+
+Эталон для ДКА - MooreAutomaton.process_symbol (линейный поиск перехода,
+отсутствующий переход останавливает обработку, отсутствующий выход -
+None). Для НКА эталон - простое моделирование множеством состояний с
+политикой выходов 'union'.
+
+Запуск из корня проекта:
+    python benchmarks/fuzz_engines.py [--cases N] [--seed S] [--nfa-share P]
+
+Код возврата 1, если найдено расхождение.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from domain.compiled_automaton import MISSING
+from domain.finite_automaton import MooreAutomaton
+from domain.periodic import WordPower
+from domain.subset_automaton import SubsetAutomaton
+from services.batch_runner import process_word_line, run_batch
+from services.live_edit_processor import LiveEditProcessor
+from services.word_processing import WordProcessingJob
+
+# Алфавиты: однобуквенный и беспрефиксные многобуквенные (разбиение однозначно)
+ALPHABETS = [("a", "b", "c"), ("0", "1"), ("a", "ba", "bb"), ("x1", "x2", "y")]
+# Буква вне всех алфавитов (не начинает ни один символ)
+FOREIGN_SYMBOL = "z"
+# Выходы: пустая строка и имена, совпадающие с именами состояний
+OUTPUTS = ["0", "1", "2", "q1", ""]
+
+
+# === Случай: автомат в виде данных ===
+
+def random_case(rng, max_states, max_length, nfa):
+    """
+    Случайный автомат и слово
+
+    Returns:
+        tuple: (case - словарь с полями states, outputs, transitions,
+                initial, nfa; tokens - слово списком символов)
+    """
+    alphabet = rng.choice(ALPHABETS)
+    states = [f"q{i}" for i in range(rng.randint(1, max_states))]
+    outputs = {q: rng.choice(OUTPUTS) for q in states if rng.random() > 0.2}
+    transitions = []
+    for q in states:
+        for symbol in alphabet:
+            if rng.random() < 0.15:
+                continue  # незаданный переход
+            transitions.append((q, symbol, rng.choice(states)))
+            if nfa and rng.random() < 0.3:
+                transitions.append((q, symbol, rng.choice(states)))
+    case = {'states': states, 'outputs': outputs, 'transitions': transitions,
+            'initial': rng.choice(states), 'nfa': nfa}
+    tokens = [FOREIGN_SYMBOL if rng.random() < 0.02 else rng.choice(alphabet)
+              for _ in range(rng.randint(0, max_length))]
+    return case, tokens
+
+
+def build(case):
+    """MooreAutomaton по данным случая"""
+    automaton = MooreAutomaton()
+    for q in case['states']:
+        automaton.add_state(q, output=case['outputs'].get(q))
+    for q, symbol, target in case['transitions']:
+        automaton.add_transition(q, target, symbol)
+    automaton.set_initial_state(case['initial'])
+    return automaton
+
+
+def is_deterministic(case):
+    cells = [(q, symbol) for q, symbol, _ in case['transitions']]
+    return len(cells) == len(set(cells))
+
+
+# === Эталоны ===
+
+def reference_dfa(automaton, tokens):
+    """process_symbol по шагам; наблюдение - выходы, число шагов, состояние"""
+    automaton.current_state = automaton.initial_state
+    outputs = []
+    for symbol in tokens:
+        state = automaton.current_state
+        if not any(t.from_state == state and t.symbol == symbol for t in automaton.transitions):
+            break
+        outputs.append(automaton.process_symbol(symbol))
+    return _observation(outputs, automaton.current_state)
+
+
+def reference_nfa(automaton, tokens):
+    """Множество текущих состояний; выход подмножества - по политике 'union'"""
+    order = {q: i for i, q in enumerate(automaton.states)}
+    current = [automaton.initial_state]
+    outputs = []
+    for symbol in tokens:
+        following = {t.to_state for t in automaton.transitions
+                     if t.from_state in current and t.symbol == symbol}
+        if not following:
+            break
+        current = sorted(following, key=order.get)
+        distinct = []
+        for q in current:
+            out = automaton.outputs.get(q)
+            if out is not None and out not in distinct:
+                distinct.append(out)
+        outputs.append(distinct[0] if len(distinct) == 1 else
+                       None if not distinct else "{" + ",".join(sorted(distinct)) + "}")
+    name = current[0] if len(current) == 1 else "{" + ",".join(current) + "}"
+    return _observation(outputs, name)
+
+
+def _observation(outputs, final_state):
+    return {'outputs': tuple(outputs), 'processed': len(outputs), 'final_state': final_state,
+            'output_word': "".join("" if out is None else str(out) for out in outputs)}
+
+
+# === Быстрые движки ===
+# Движок получает (automaton, tokens) и возвращает наблюдение - словарь с
+# частью полей эталона (сравниваются общие поля) или None, если неприменим
+
+def engine_run(automaton, tokens):
+    compiled = automaton.compile()
+    state, outputs, _ = compiled.run(tokens)
+    return _observation(outputs, compiled.states[state])
+
+
+def engine_translate(automaton, tokens):
+    compiled = automaton.compile()
+    output, state, processed = compiled.translate(tokens)
+    return {'output_word': output, 'processed': processed, 'final_state': compiled.states[state]}
+
+
+def engine_subset(automaton, tokens):
+    """Ленивая детерминизация и для ДКА (одноэлементные подмножества)"""
+    compiled = SubsetAutomaton.from_automaton(automaton, automaton.output_policy)
+    state, outputs, _ = compiled.run(tokens)
+    translated, _, processed = compiled.translate(tokens)
+    observation = _observation(outputs, compiled.states[state])
+    if translated != observation['output_word'] or processed != observation['processed']:
+        observation['output_word'] = f"run/translate: {observation['output_word']!r} != {translated!r}"
+    return observation
+
+
+def engine_determinize(automaton, tokens):
+    compiled = automaton.determinize().compile()
+    state, outputs, _ = compiled.run(tokens)
+    return _observation(outputs, compiled.states[state])
+
+
+def engine_process_word(automaton, tokens):
+    result = automaton.process_word("".join(tokens))
+    return {'output_word': result['output_word'], 'processed': len(result['steps']),
+            'final_state': result['final_state']}
+
+
+def engine_background_job(automaton, tokens):
+    job = WordProcessingJob(automaton.compile(), "".join(tokens)).start()
+    job.wait()
+    result = job.result
+    return {'output_word': result['output_word'], 'processed': len(result['steps']),
+            'final_state': result['final_state']}
+
+
+def engine_batch(automaton, tokens):
+    line = process_word_line(automaton.compile(), "".join(tokens), with_state=True)
+    sink = io.StringIO()
+    run_batch(automaton.compile(), io.StringIO("".join(tokens) + "\n"), sink, with_state=True)
+    if sink.getvalue() != line + "\n":
+        return {'output_word': f"run_batch: {sink.getvalue()!r} != {line!r}"}
+    if line.startswith("ERROR\t"):
+        position = int(line.split("позиция ")[1].split(":")[0])
+        return {'processed': position}
+    output, state = line.split("\t")
+    return {'output_word': output, 'processed': len(tokens), 'final_state': state}
+
+
+def engine_live(automaton, tokens):
+    """Live-режим кусками по несколько шагов (слово должно быть в алфавите)"""
+    # Live-режим заранее отклоняет слова с символами вне алфавита автомата
+    if not tokens or not set(tokens) <= set(automaton.get_input_alphabet()):
+        return None
+    processor = LiveEditProcessor(automaton)
+    status = processor.start("".join(tokens))
+    chunk = 1 + len(tokens) % 3
+    while processor.is_active:
+        status = processor.run(max_steps=chunk)
+    return {'output_word': processor.get_output_word(), 'processed': status['pointer'],
+            'final_state': status['current_state']}
+
+
+def engine_word_power(automaton, tokens):
+    """f(q0) = δ*(q0, слово) композицией столбцов (только если слово дочитано)"""
+    if not tokens:
+        return None
+    compiled = automaton.compile()
+    state = WordPower(compiled, tokens).apply(compiled.initial)
+    if state == MISSING:
+        return {'halted': True}
+    return {'halted': False, 'final_state': compiled.states[state]}
+
+
+ENGINES = {
+    'compiled.run': engine_run,
+    'compiled.translate': engine_translate,
+    'SubsetAutomaton': engine_subset,
+    'determinize': engine_determinize,
+    'process_word': engine_process_word,
+    'WordProcessingJob': engine_background_job,
+    'batch_runner': engine_batch,
+    'live': engine_live,
+    'WordPower': engine_word_power,
+}
+
+
+# === Сравнение и сокращение ===
+
+def compare(case, tokens, engine):
+    """Описание расхождения движка с эталоном или None"""
+    automaton = build(case)
+    reference = (reference_dfa if is_deterministic(case) else reference_nfa)(automaton, tokens)
+    reference['halted'] = reference['processed'] < len(tokens)
+    try:
+        observed = ENGINES[engine](build(case), tokens)
+    except Exception as e:  # любое исключение быстрого пути - тоже расхождение
+        return f"исключение {type(e).__name__}: {e}"
+    if observed is None:
+        return None
+    if observed.get('halted') is False and reference['halted']:
+        return f"halted: эталон {reference['processed']} из {len(tokens)}, движок дочитал"
+    if observed.get('halted'):
+        observed = {'halted': True}  # состояние остановки движок не сообщает
+    differences = [f"{key}: эталон {reference[key]!r}, движок {observed[key]!r}"
+                   for key in observed if reference[key] != observed[key]]
+    return "; ".join(differences) or None
+
+
+def shrink(case, tokens, engine):
+    """
+    Сократить случай, сохраняя расхождение: удалить куски слова, переходы,
+    состояния, выходы - пока что-то удаляется
+    """
+    def fails(candidate_case, candidate_tokens):
+        if candidate_case['initial'] not in candidate_case['states']:
+            return False
+        return compare(candidate_case, candidate_tokens, engine) is not None
+
+    progress = True
+    while progress:
+        progress = False
+        # Слово: куски длины n/2, n/4, ..., 1
+        size = max(1, len(tokens) // 2)
+        while size >= 1:
+            start = 0
+            while start < len(tokens):
+                candidate = tokens[:start] + tokens[start + size:]
+                if fails(case, candidate):
+                    tokens = candidate
+                    progress = True
+                else:
+                    start += size
+            size //= 2
+        # Переходы
+        for i in reversed(range(len(case['transitions']))):
+            candidate = dict(case, transitions=case['transitions'][:i] + case['transitions'][i + 1:])
+            if fails(candidate, tokens):
+                case = candidate
+                progress = True
+        # Состояния вместе с их переходами
+        for q in list(case['states']):
+            if q == case['initial']:
+                continue
+            candidate = dict(
+                case,
+                states=[s for s in case['states'] if s != q],
+                outputs={s: out for s, out in case['outputs'].items() if s != q},
+                transitions=[t for t in case['transitions'] if q not in (t[0], t[2])]
+            )
+            if fails(candidate, tokens):
+                case = candidate
+                progress = True
+        # Выходы
+        for q in list(case['outputs']):
+            candidate = dict(case, outputs={s: out for s, out in case['outputs'].items() if s != q})
+            if fails(candidate, tokens):
+                case = candidate
+                progress = True
+    return case, tokens
+
+
+def format_case(case, tokens):
+    lines = [f"initial {case['initial']}"]
+    for q in case['states']:
+        lines.append(f"  {q}: выход {case['outputs'].get(q)!r}")
+    lines.extend(f"  δ({q}, {symbol}) = {target}" for q, symbol, target in case['transitions'])
+    lines.append(f"слово: {' '.join(tokens) or 'ε'}")
+    return "\n".join(lines)
+
+
+# === Пропускная способность ===
+
+def throughput(rng, states=300, symbols=4, length=20000, reference_length=2000):
+    """
+    Символов в секунду для эталона и каждого движка на одном большом
+    полном ДКА (эталон - на коротком префиксе: он линеен по |δ| на шаг)
+
+    Returns:
+        list: (движок, символов/с)
+    """
+    alphabet = [chr(ord("a") + i) for i in range(symbols)]
+    case = {
+        'states': [f"q{i}" for i in range(states)],
+        'outputs': {f"q{i}": rng.choice(OUTPUTS[:3]) for i in range(states)},
+        'transitions': [(f"q{i}", a, f"q{rng.randrange(states)}")
+                        for i in range(states) for a in alphabet],
+        'initial': "q0", 'nfa': False,
+    }
+    tokens = [rng.choice(alphabet) for _ in range(length)]
+    automaton = build(case)
+    automaton.compile()
+
+    started = time.perf_counter()
+    reference_dfa(automaton, tokens[:reference_length])
+    rates = [("эталон process_symbol", reference_length / (time.perf_counter() - started))]
+    for name, engine in ENGINES.items():
+        started = time.perf_counter()
+        engine(automaton, tokens)
+        rates.append((name, length / (time.perf_counter() - started)))
+    return rates
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=500, help="число случайных случаев")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генератора")
+    parser.add_argument("--max-states", type=int, default=6, help="наибольшее число состояний")
+    parser.add_argument("--max-length", type=int, default=30, help="наибольшая длина слова")
+    parser.add_argument("--nfa-share", type=float, default=0.2, help="доля недетерминированных")
+    parser.add_argument("--no-throughput", action="store_true", help="не измерять скорость")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    failures = {}
+    started = time.perf_counter()
+    for _ in range(args.cases):
+        case, tokens = random_case(rng, args.max_states, args.max_length,
+                                   nfa=rng.random() < args.nfa_share)
+        for engine in ENGINES:
+            if engine in failures or compare(case, tokens, engine) is None:
+                continue
+            case_min, tokens_min = shrink(case, tokens, engine)
+            failures[engine] = (case_min, tokens_min, compare(case_min, tokens_min, engine))
+    print(f"Случаев: {args.cases} × {len(ENGINES)} движков, "
+          f"{time.perf_counter() - started:.1f} с, расхождений: {len(failures)}")
+
+    for engine, (case, tokens, difference) in failures.items():
+        print(f"\n=== {engine}: {difference}")
+        print(format_case(case, tokens))
+
+    if not args.no_throughput:
+        rates = throughput(random.Random(args.seed))
+        base = rates[0][1]
+        print(f"\n{'движок':<24}{'символов/с':>14}{'× эталон':>10}")
+        for name, rate in rates:
+            print(f"{name:<24}{rate:>14,.0f}{rate / base:>10.1f}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
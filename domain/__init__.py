@@ -8,5 +8,12 @@ Domain Layer (Бизнес-логика)
 
 from .transition import Transition
 from .finite_automaton import MooreAutomaton
+from .mealy_automaton import MealyAutomaton, moore_to_mealy, mealy_to_moore
+from .compiled_automaton import CompiledAutomaton
+from .aho_corasick import AhoCorasickBuilder, build_pattern_automaton
+from .tokenizer import Tokenizer
+from .interning import InternTable
 
-__all__ = ['Transition', 'MooreAutomaton']
+__all__ = ['Transition', 'MooreAutomaton', 'MealyAutomaton', 'moore_to_mealy', 'mealy_to_moore',
+           'CompiledAutomaton', 'AhoCorasickBuilder', 'build_pattern_automaton',
+           'Tokenizer', 'InternTable']
@@ -0,0 +1,169 @@
+# Построение автомата поиска образцов (Ахо-Корасик)
+"""
+Модуль: aho_corasick.py
+Назначение: Строит полный детерминированный автомат Мура, который при
+чтении потока символов сообщает, какие образцы заканчиваются на текущей
+позиции.
+
+Образцы вставляются в префиксное дерево (goto), затем обходом в ширину
+вычисляются ссылки неудач, и строки δ заполняются копированием строки
+состояния неудачи - без обхода цепочки ссылок для каждой клетки.
+Время O(L·|Σ|), где L - суммарная длина образцов.
+"""
+
+from .finite_automaton import MooreAutomaton
+
+# Выход состояния, в котором не заканчивается ни один образец
+NO_MATCH = "-"
+
+# Разделитель номеров образцов в выходе состояния ("0|3")
+MATCH_SEPARATOR = "|"
+
+
+class AhoCorasickBuilder:
+    """
+    Построитель автомата Ахо-Корасик.
+
+    Состояние i называется "i" (0 - корень, пустой префикс). Выход
+    состояния - номера образцов (в порядке добавления, с нуля),
+    являющихся суффиксами прочитанного префикса, через MATCH_SEPARATOR,
+    либо NO_MATCH. Образец - строка (символ = буква) или
+    последовательность многобуквенных символов.
+    """
+
+    def __init__(self, alphabet=(), no_match=NO_MATCH):
+        """
+        Args:
+            alphabet: Дополнительные входные символы (по ним автомат
+                возвращается в корень, а не останавливается)
+            no_match: Выход состояний без совпадения
+        """
+        self.no_match = no_match
+        self._goto = [{}]         # узел trie -> {символ: узел}
+        self._matches = [()]      # узел -> номера образцов, оканчивающихся в нём
+        self._symbols = set(alphabet)
+        self._count = 0
+
+    def __len__(self):
+        """Число добавленных образцов"""
+        return self._count
+
+    def add(self, pattern):
+        """
+        Добавить образец
+
+        Returns:
+            int: Номер образца
+
+        Raises:
+            ValueError: для пустого образца
+        """
+        if not pattern:
+            raise ValueError("Образец не должен быть пустым")
+        goto = self._goto
+        node = 0
+        for symbol in pattern:
+            child = goto[node].get(symbol)
+            if child is None:
+                child = len(goto)
+                goto[node][symbol] = child
+                goto.append({})
+                self._matches.append(())
+            node = child
+        index = self._count
+        self._matches[node] += (index,)
+        self._symbols.update(pattern)
+        self._count += 1
+        return index
+
+    def add_many(self, patterns):
+        """
+        Добавить пачку образцов
+
+        Returns:
+            int: Число добавленных образцов
+        """
+        added = 0
+        for pattern in patterns:
+            self.add(pattern)
+            added += 1
+        return added
+
+    def build_table(self):
+        """
+        Плотная таблица переходов
+
+        Returns:
+            tuple: (states, symbols, delta, outputs) в формате
+                MooreAutomaton.load_table(); начальное состояние - 0
+        """
+        symbols = sorted(self._symbols)
+        symbol_ids = {symbol: a for a, symbol in enumerate(symbols)}
+        goto = self._goto
+        size = len(goto)
+
+        delta = [None] * size
+        fail = [0] * size
+        matches = list(self._matches)
+
+        root = [0] * len(symbols)
+        queue = []
+        for symbol, child in goto[0].items():
+            root[symbol_ids[symbol]] = child
+            queue.append(child)
+        delta[0] = root
+
+        # Обход в ширину: ссылка неудачи ведёт в менее глубокий узел,
+        # поэтому его строка δ и список совпадений уже готовы
+        for node in queue:
+            fail_row = delta[fail[node]]
+            row = list(fail_row)
+            for symbol, child in goto[node].items():
+                a = symbol_ids[symbol]
+                row[a] = child
+                fail[child] = fail_row[a]
+                matches[child] += matches[fail[child]]
+                queue.append(child)
+            delta[node] = row
+
+        separator = MATCH_SEPARATOR
+        outputs = [
+            separator.join(map(str, sorted(found))) if found else self.no_match
+            for found in matches
+        ]
+        states = [str(node) for node in range(size)]
+        return states, symbols, delta, outputs
+
+    def build(self, automaton=None):
+        """
+        Построить автомат
+
+        Args:
+            automaton: MooreAutomaton, содержимое которого заменяется
+                (по умолчанию создаётся новый)
+
+        Returns:
+            MooreAutomaton: Полный автомат с начальным состоянием "0"
+        """
+        if automaton is None:
+            automaton = MooreAutomaton()
+        states, symbols, delta, outputs = self.build_table()
+        automaton.load_table(states, symbols, delta, outputs, initial=0)
+        return automaton
+
+
+def build_pattern_automaton(patterns, alphabet=(), no_match=NO_MATCH):
+    """
+    Автомат Ахо-Корасик для набора образцов
+
+    Args:
+        patterns: Образцы (номер образца - позиция в наборе)
+        alphabet: Дополнительные входные символы
+        no_match: Выход состояний без совпадения
+
+    Returns:
+        MooreAutomaton
+    """
+    builder = AhoCorasickBuilder(alphabet, no_match)
+    builder.add_many(patterns)
+    return builder.build()
@@ -0,0 +1,210 @@
+# Табличное представление автомата
+"""
+Модуль: compiled_automaton.py
+Назначение: Неизменяемый снимок автомата Мура в виде плотной таблицы
+переходов δ[состояние][символ] с целочисленными номерами.
+"""
+
+from array import array
+
+from .tokenizer import Tokenizer
+
+# Значение в таблице δ для отсутствующего перехода
+MISSING = -1
+
+# Переход ещё не вычислен (только в SubsetAutomaton; см. expand())
+UNKNOWN = -2
+
+
+class CompiledAutomaton:
+    """
+    Табличный снимок MooreAutomaton.
+
+    Состояния и символы пронумерованы (0..n-1) в порядке появления.
+    Для каждой пары (состояние, символ) берётся первый подходящий
+    переход - так же, как в MooreAutomaton.find_transition.
+    """
+
+    deterministic = True
+
+    def __init__(self, states, symbols, delta, outputs, initial,
+                 state_name_ids=None, output_name_ids=None):
+        self.states = tuple(states)            # номер -> имя состояния
+        self.symbols = tuple(symbols)          # номер -> входной символ
+        self.state_ids = {name: i for i, name in enumerate(self.states)}
+        self.symbol_ids = {sym: i for i, sym in enumerate(self.symbols)}
+        self.delta = tuple(tuple(row) for row in delta)
+        self.outputs = tuple(outputs)          # номер состояния -> выход или None
+        self.initial = initial                 # номер начального состояния или None
+        # Номера в реестре имён автомата (MooreAutomaton.names) - они, в отличие
+        # от номеров таблицы, не меняются между снимками; MISSING - нет выхода
+        self.state_name_ids = tuple(state_name_ids or ())
+        self.output_name_ids = tuple(output_name_ids or ())
+        # Для translate(): столбцы δ по символам и выходы в виде строк
+        self._columns = {
+            symbol: [row[a] for row in self.delta]
+            for symbol, a in self.symbol_ids.items()
+        }
+        self._output_text = ["" if out is None else str(out) for out in self.outputs]
+        # Разбиение слов на (возможно многобуквенные) входные символы
+        self.tokenizer = Tokenizer(self.symbols)
+
+    @classmethod
+    def from_automaton(cls, automaton):
+        states = list(automaton.states)
+        state_ids = {name: i for i, name in enumerate(states)}
+        symbols = []
+        symbol_ids = {}
+        for t in automaton.transitions:
+            if t.symbol not in symbol_ids:
+                symbol_ids[t.symbol] = len(symbols)
+                symbols.append(t.symbol)
+
+        delta = [[MISSING] * len(symbols) for _ in states]
+        for t in automaton.transitions:
+            row = delta[state_ids[t.from_state]]
+            a = symbol_ids[t.symbol]
+            if row[a] == MISSING:
+                row[a] = state_ids[t.to_state]
+
+        outputs = [automaton.outputs.get(name) for name in states]
+        initial = state_ids.get(automaton.initial_state)
+        names = automaton.names
+        state_name_ids = [names.get(name) for name in states]
+        output_name_ids = [MISSING if out is None else names.get(out) for out in outputs]
+        return cls(states, symbols, delta, outputs, initial, state_name_ids, output_name_ids)
+
+    def tokenize(self, word):
+        """
+        Разбить слово на входные символы (самое длинное совпадение)
+
+        Returns:
+            Sequence[str]: Токены; для односимвольного алфавита - само слово
+        """
+        return self.tokenizer.split(word)
+
+    def next_state(self, state: int, symbol) -> int:
+        """Номер следующего состояния или MISSING"""
+        a = self.symbol_ids.get(symbol)
+        if a is None:
+            return MISSING
+        nxt = self.delta[state][a]
+        if nxt == UNKNOWN:
+            nxt = self.expand(state, a)
+        return nxt
+
+    def expand(self, state: int, a: int) -> int:
+        """
+        Переход, отмеченный в таблице как UNKNOWN
+
+        Полная таблица UNKNOWN не содержит; ленивые снимки
+        (SubsetAutomaton) вычисляют и запоминают здесь новые строки.
+        """
+        return self.delta[state][a]
+
+    def run(self, word, state=None):
+        """
+        Прогнать слово по таблице
+
+        Args:
+            word: Последовательность входных символов
+            state: Номер стартового состояния (по умолчанию начальное)
+
+        Returns:
+            tuple: (номер конечного состояния, список выходов,
+                    число обработанных символов)
+        """
+        if state is None:
+            state = self.initial
+        delta, outputs, symbol_ids = self.delta, self.outputs, self.symbol_ids
+        result = []
+        processed = 0
+        for symbol in word:
+            a = symbol_ids.get(symbol)
+            if a is None:
+                break
+            nxt = delta[state][a]
+            if nxt == UNKNOWN:
+                nxt = self.expand(state, a)
+            if nxt == MISSING:
+                break
+            state = nxt
+            result.append(outputs[state])
+            processed += 1
+        return state, result, processed
+
+    def translate(self, word, state=None):
+        """
+        Быстрый перевод слова в выходное слово (без трассы)
+
+        Args:
+            word: Последовательность входных символов
+            state: Номер стартового состояния (по умолчанию начальное)
+
+        Returns:
+            tuple: (выходное слово, номер конечного состояния,
+                    число обработанных символов; меньше len(word) при ошибке)
+        """
+        if state is None:
+            state = self.initial
+        columns = self._columns
+        output_text = self._output_text
+        parts = []
+        processed = 0
+        for symbol in word:
+            column = columns.get(symbol)
+            if column is None:
+                break
+            nxt = column[state]
+            if nxt == MISSING:
+                break
+            state = nxt
+            parts.append(output_text[state])
+            processed += 1
+        return "".join(parts), state, processed
+
+    def __repr__(self):
+        return f"<CompiledAutomaton states={len(self.states)} symbols={len(self.symbols)}>"
+
+
+class StepTrace:
+    """
+    Компактная трасса обработки слова.
+
+    Хранит только номера состояний (array('i'): состояние до первого шага
+    и после каждого шага); словари шагов создаются при обращении, в формате
+    MooreAutomaton.process_word()['steps'].
+    """
+
+    def __init__(self, compiled: CompiledAutomaton, word, states=None):
+        self.compiled = compiled
+        self.word = word
+        self.states = states if states is not None else array('i')
+
+    def __len__(self):
+        return max(0, len(self.states) - 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        names = self.compiled.states
+        current, nxt = self.states[index], self.states[index + 1]
+        return {
+            'step_number': index + 1,
+            'current_state': names[current],
+            'input_symbol': self.word[index],
+            'output_symbol': self.compiled.outputs[nxt],
+            'next_state': names[nxt]
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def step_key(self, index):
+        """Ключ шага без номера (для поиска повторов)"""
+        return (self.states[index], self.word[index], self.states[index + 1])
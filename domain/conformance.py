@@ -0,0 +1,591 @@
+# Генерация тестовых наборов для проверки реализаций автомата
+"""
+Модуль: conformance.py
+Назначение: Наборы входных слов для проверки соответствия реализации
+(например, аппаратной) автомату из редактора. Каждое слово подаётся с
+начального состояния, ожидаемый выход даёт пакетный режим.
+
+    transition_tour   - обход всех переходов: для сильно связного автомата
+                        одно слово (задача китайского почтальона),
+                        иначе жадные слова со сбросом;
+    w_method_suite    - W-метод: P · Σ^{≤m} · W;
+    wp_method_suite   - Wp-метод: S · Σ^{≤m} · W и (P \\ S) · Σ^{≤m} ⊗ W_q.
+
+Наборы порождаются лениво (генераторами), поэтому их можно писать в
+файл, не собирая в памяти; estimate_suite() считает их размер заранее.
+Слова - списки входных символов.
+"""
+
+import heapq
+import time
+from collections import deque
+from itertools import product
+
+from .compiled_automaton import MISSING
+
+SUITE_METHODS = ('tour', 'w', 'wp')
+
+_INFINITY = float('inf')
+
+
+# === Обход переходов ===
+
+def transition_tour(compiled):
+    """
+    Слова, вместе проходящие каждый достижимый переход хотя бы раз
+
+    Если достижимая часть сильно связна, строится один замкнутый обход
+    минимальной длины: переходы повторяются по потоку минимальной
+    стоимости от вершин с избытком входящих рёбер к вершинам с избытком
+    исходящих, затем берётся эйлеров цикл.
+    Иначе - жадно: из текущего состояния к ближайшему непройденному
+    переходу, при тупике - новое слово (сброс).
+
+    Yields:
+        list: Слово (входные символы)
+    """
+    graph = _Graph(compiled)
+    if not graph.edges:
+        return
+    if graph.strongly_connected():
+        yield graph.symbols_of(graph.postman_tour())
+    else:
+        for word in graph.greedy_tour():
+            yield graph.symbols_of(word)
+
+
+# === W / Wp ===
+
+def state_cover(compiled):
+    """Кратчайшие слова доступа к каждому достижимому состоянию (номер -> слово)"""
+    return _Graph(compiled).access_words()
+
+
+def characterization_set(compiled):
+    """
+    Характеризующее множество W: для каждой пары различимых состояний в
+    W есть слово, на котором их выходы различаются
+
+    Returns:
+        list: Слова (кортежи номеров символов)
+    """
+    graph = _Graph(compiled, complete=True)
+    return graph.characterization()
+
+
+def w_method_suite(compiled, extra_states=0):
+    """
+    Набор W-метода: P · Σ^{≤m} · W, m = extra_states
+
+    Обнаруживает любую реализацию, у которой не более |Q| + m состояний
+    и которая не эквивалентна автомату. Гарантия опирается на число
+    различимых классов, поэтому недостижимые и эквивалентные состояния
+    автомата добавляются к m (estimate_suite сообщает, сколько добавлено).
+
+    Yields:
+        list: Слово
+    """
+    graph = _Graph(compiled, complete=True)
+    return _w_words(graph, extra_states + graph.redundant_states())
+
+
+def wp_method_suite(compiled, extra_states=0):
+    """
+    Набор Wp-метода: S · Σ^{≤m} · W и (P \\ S) · Σ^{≤m} ⊗ W_q
+
+    Во второй фазе после слова проверяются только слова W_q, отличающие
+    достигнутое состояние q от остальных, поэтому набор меньше W-метода
+    при той же обнаруживающей способности (m так же увеличивается на
+    число лишних состояний автомата).
+
+    Yields:
+        list: Слово
+    """
+    graph = _Graph(compiled, complete=True)
+    return _wp_words(graph, extra_states + graph.redundant_states())
+
+
+def suite_words(compiled, method, extra_states=0):
+    """Генератор набора по имени метода (SUITE_METHODS)"""
+    if method == 'tour':
+        return transition_tour(compiled)
+    if method == 'w':
+        return w_method_suite(compiled, extra_states)
+    if method == 'wp':
+        return wp_method_suite(compiled, extra_states)
+    raise ValueError(f"Неизвестный метод: {method} (ожидалось {', '.join(SUITE_METHODS)})")
+
+
+def estimate_suite(compiled, method, extra_states=0, sample_seconds=0.2):
+    """
+    Размер набора до генерации и оценка времени записи
+
+    Для W-метода размер считается по формуле, для Wp - перебором
+    префиксов без суффиксов, для обхода - построением самого обхода
+    (он линеен по числу переходов). Время - подготовка (разделяющие
+    слова) плюс генерация всех слов со скоростью, измеренной на первых
+    словах в течение sample_seconds.
+
+    Returns:
+        dict: words, symbols, seconds; added_states - на сколько увеличено
+            extra_states из-за недостижимых и эквивалентных состояний
+            (0 для обхода переходов)
+    """
+    started = time.perf_counter()
+    if method == 'tour':
+        words = symbols = 0
+        for word in transition_tour(compiled):
+            words += 1
+            symbols += len(word)
+        return {'words': words, 'symbols': symbols,
+                'seconds': time.perf_counter() - started, 'added_states': 0}
+    if method not in SUITE_METHODS:
+        suite_words(compiled, method)  # ValueError с перечнем методов
+
+    graph = _Graph(compiled, complete=True)
+    added_states = graph.redundant_states()
+    extra_states += added_states
+    characterization = graph.characterization() or [()]
+    if method == 'wp':
+        identification = graph.identification_sets()
+    prepared = time.perf_counter() - started
+
+    middle_count = sum(len(graph.symbols) ** k for k in range(extra_states + 1))
+    middle_length = sum(k * len(graph.symbols) ** k for k in range(extra_states + 1))
+    suffix_length = sum(map(len, characterization))
+    prefixes = graph.transition_cover() if method == 'w' else list(graph.access_words().values())
+    words = len(prefixes) * middle_count * len(characterization)
+    symbols = (sum(map(len, prefixes)) * middle_count * len(characterization)
+               + len(prefixes) * middle_length * len(characterization)
+               + len(prefixes) * middle_count * suffix_length)
+    if method == 'wp':
+        cover = set(prefixes)
+        for prefix in graph.transition_cover():
+            if prefix in cover:
+                continue
+            for middle in _all_words(len(graph.symbols), extra_states):
+                suffixes = identification[graph.run(prefix + middle)] or [()]
+                words += len(suffixes)
+                symbols += (len(prefix) + len(middle)) * len(suffixes) + sum(map(len, suffixes))
+
+    # Скорость генерации по первым словам
+    sample = _w_words(graph, extra_states) if method == 'w' else _wp_words(graph, extra_states)
+    generated = 0
+    sample_started = time.perf_counter()
+    for word in sample:
+        generated += len(word) + 1
+        if time.perf_counter() - sample_started > sample_seconds:
+            break
+    elapsed = time.perf_counter() - sample_started
+    seconds = prepared + ((symbols + words) * elapsed / generated if generated else 0.0)
+    return {'words': words, 'symbols': symbols, 'seconds': seconds,
+            'added_states': added_states}
+
+
+# === Внутренние функции ===
+
+def _all_words(symbol_count, max_length):
+    """Все слова длины 0..max_length (кортежи номеров символов)"""
+    for length in range(max_length + 1):
+        yield from product(range(symbol_count), repeat=length)
+
+
+def _w_words(graph, extra_states):
+    suffixes = graph.characterization() or [()]
+    for prefix in graph.transition_cover():
+        for middle in _all_words(len(graph.symbols), extra_states):
+            for suffix in suffixes:
+                yield graph.symbols_of(prefix + middle + suffix)
+
+
+def _wp_words(graph, extra_states):
+    characterization = graph.characterization() or [()]
+    identification = graph.identification_sets()
+    access = graph.access_words()
+    for prefix in access.values():
+        for middle in _all_words(len(graph.symbols), extra_states):
+            for suffix in characterization:
+                yield graph.symbols_of(prefix + middle + suffix)
+    cover = set(access.values())
+    for prefix in graph.transition_cover():
+        if prefix in cover:
+            continue
+        for middle in _all_words(len(graph.symbols), extra_states):
+            state = graph.run(prefix + middle)
+            for suffix in identification[state] or [()]:
+                yield graph.symbols_of(prefix + middle + suffix)
+
+
+class _Graph:
+    """Детерминированная таблица снимка с номерами символов"""
+
+    def __init__(self, compiled, complete=False):
+        if not compiled.deterministic:
+            raise ValueError("Нужен детерминированный автомат (сначала детерминизируйте)")
+        if compiled.initial is None:
+            raise ValueError("Начальное состояние не задано")
+        self.compiled = compiled
+        self.symbols = compiled.symbols
+        self.delta = compiled.delta
+        self.initial = compiled.initial
+        self.reachable = self._reachable()
+        if complete and any(MISSING in self.delta[q] for q in self.reachable):
+            raise ValueError("Нужен полный автомат (дополните его стоком)")
+        # Достижимые переходы (состояние, символ)
+        self.edges = [(q, a) for q in self.reachable
+                      for a, target in enumerate(self.delta[q]) if target != MISSING]
+        self._levels = None
+        self._characterization = None
+        self._identification = None
+
+    def symbols_of(self, word):
+        return [self.symbols[a] for a in word]
+
+    def run(self, word):
+        state = self.initial
+        for a in word:
+            state = self.delta[state][a]
+        return state
+
+    def _reachable(self):
+        seen = {self.initial}
+        order = [self.initial]
+        for q in order:
+            for target in self.delta[q]:
+                if target != MISSING and target not in seen:
+                    seen.add(target)
+                    order.append(target)
+        return order
+
+    def strongly_connected(self):
+        """Достижимая часть сильно связна: из каждого состояния можно вернуться в q0"""
+        reverse = {q: [] for q in self.reachable}
+        for q, a in self.edges:
+            reverse[self.delta[q][a]].append(q)
+        seen = {self.initial}
+        stack = [self.initial]
+        while stack:
+            for p in reverse[stack.pop()]:
+                if p not in seen:
+                    seen.add(p)
+                    stack.append(p)
+        return len(seen) == len(self.reachable)
+
+    def shortest_paths_from(self, source):
+        """Кратчайшие пути (поиск в ширину): состояние -> (предыдущее, символ)"""
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            q = queue.popleft()
+            for a, target in enumerate(self.delta[q]):
+                if target != MISSING and target not in parent:
+                    parent[target] = (q, a)
+                    queue.append(target)
+        return parent
+
+    @staticmethod
+    def path_to(parent, target):
+        """Символы пути до target по дереву shortest_paths_from"""
+        word = []
+        while parent[target] is not None:
+            target, a = parent[target]
+            word.append(a)
+        word.reverse()
+        return word
+
+    # --- Обход переходов ---
+
+    def postman_tour(self):
+        """Замкнутый обход минимальной длины (граф сильно связен)"""
+        delta = self.delta
+        balance = {q: 0 for q in self.reachable}
+        for q, a in self.edges:
+            balance[q] -= 1
+            balance[delta[q][a]] += 1
+        # Избыток входящих: нужны дополнительные выходы (и наоборот)
+        surplus = {q: b for q, b in balance.items() if b > 0}
+        deficit = {q: -b for q, b in balance.items() if b < 0}
+
+        edges = list(self.edges)
+        for edge, repeats in self.balancing_flow(surplus, deficit).items():
+            edges.extend([edge] * repeats)
+
+        # Эйлеров цикл (алгоритм Хирхольцера, итеративно)
+        outgoing = {q: [] for q in self.reachable}
+        for q, a in edges:
+            outgoing[q].append(a)
+        stack = [(self.initial, None)]
+        circuit = []
+        while stack:
+            q, a = stack[-1]
+            if outgoing[q]:
+                b = outgoing[q].pop()
+                stack.append((delta[q][b], b))
+            else:
+                stack.pop()
+                if a is not None:
+                    circuit.append(a)
+        circuit.reverse()
+        return circuit
+
+    def balancing_flow(self, surplus, deficit):
+        """
+        Сколько раз повторить каждый переход, чтобы уравнять степени
+
+        Поток минимальной стоимости от вершин surplus к вершинам deficit
+        (стоимость ребра - 1, пропускная способность не ограничена):
+        последовательные кратчайшие пути, Дейкстра с потенциалами по
+        остаточной сети, где обратное ребро потока стоит -1.
+
+        Returns:
+            dict: (состояние, номер символа) -> число повторов
+        """
+        delta = self.delta
+        edges = self.edges
+        outgoing = {q: [] for q in self.reachable}
+        incoming = {q: [] for q in self.reachable}
+        for e, (q, a) in enumerate(edges):
+            outgoing[q].append(e)
+            incoming[delta[q][a]].append(e)
+        flow = [0] * len(edges)
+        left = dict(surplus)
+        need = dict(deficit)
+        potential = dict.fromkeys(self.reachable, 0)
+
+        while any(need.values()):
+            # Фиктивный исток соединён с вершинами, у которых остался избыток
+            distance = {q: -potential[q] for q, rest in left.items() if rest}
+            previous = {q: None for q in distance}
+            heap = [(d, q) for q, d in distance.items()]
+            heapq.heapify(heap)
+            done = set()
+            while heap:
+                d, q = heapq.heappop(heap)
+                if q in done:
+                    continue
+                done.add(q)
+                for e in outgoing[q]:
+                    target = delta[q][edges[e][1]]
+                    nd = d + 1 + potential[q] - potential[target]
+                    if nd < distance.get(target, _INFINITY):
+                        distance[target] = nd
+                        previous[target] = (e, 1)
+                        heapq.heappush(heap, (nd, target))
+                for e in incoming[q]:
+                    if flow[e]:
+                        source = edges[e][0]
+                        nd = d - 1 + potential[q] - potential[source]
+                        if nd < distance.get(source, _INFINITY):
+                            distance[source] = nd
+                            previous[source] = (e, -1)
+                            heapq.heappush(heap, (nd, source))
+            for q, d in distance.items():
+                potential[q] += d
+
+            # Ближайшая вершина с недостатком: потенциал - расстояние от истока
+            target = min((q for q, rest in need.items() if rest), key=potential.__getitem__)
+            path = []
+            q = target
+            amount = need[target]
+            while previous[q] is not None:
+                e, direction = previous[q]
+                path.append((e, direction))
+                if direction < 0:
+                    amount = min(amount, flow[e])
+                    q = delta[edges[e][0]][edges[e][1]]
+                else:
+                    q = edges[e][0]
+            amount = min(amount, left[q])
+            left[q] -= amount
+            need[target] -= amount
+            for e, direction in path:
+                flow[e] += direction * amount
+
+        return {edges[e]: count for e, count in enumerate(flow) if count}
+
+    def greedy_tour(self):
+        """Слова со сбросом: к ближайшему непройденному переходу"""
+        delta = self.delta
+        uncovered = {q: [] for q in self.reachable}
+        remaining = 0
+        for q, a in self.edges:
+            uncovered[q].append(a)
+            remaining += 1
+        while remaining:
+            word = []
+            state = self.initial
+            while True:
+                if uncovered[state]:
+                    a = uncovered[state].pop()
+                    remaining -= 1
+                    word.append(a)
+                    state = delta[state][a]
+                    continue
+                # Ближайшее состояние с непройденным переходом
+                parent = {state: None}
+                queue = deque([state])
+                target = None
+                while queue and target is None:
+                    q = queue.popleft()
+                    for a, nxt in enumerate(delta[q]):
+                        if nxt != MISSING and nxt not in parent:
+                            parent[nxt] = (q, a)
+                            if uncovered[nxt]:
+                                target = nxt
+                                break
+                            queue.append(nxt)
+                if target is None:
+                    break
+                word.extend(self.path_to(parent, target))
+                state = target
+            if word:
+                yield word
+
+    # --- Разделяющие слова ---
+
+    def access_words(self):
+        """Состояние -> кратчайшее слово доступа из q0 (кортеж номеров символов)"""
+        parent = self.shortest_paths_from(self.initial)
+        return {q: tuple(self.path_to(parent, q)) for q in self.reachable}
+
+    def transition_cover(self):
+        """P = S ∪ S·Σ в порядке состояний и символов"""
+        access = self.access_words()
+        cover = []
+        for q in self.reachable:
+            cover.append(access[q])
+            for a in range(len(self.symbols)):
+                cover.append(access[q] + (a,))
+        return cover
+
+    def refinement_levels(self):
+        """
+        Разбиения Мура: levels[k][q] - номер блока q, если различать
+        состояния по выходам на словах длины не больше k + 1
+
+        Последний уровень - классы эквивалентности состояний.
+        """
+        if self._levels is None:
+            outputs = self.compiled.outputs
+            delta = self.delta
+            symbols = range(len(self.symbols))
+            ids = {}
+            current = {q: ids.setdefault(tuple(outputs[delta[q][a]] for a in symbols), len(ids))
+                       for q in self.reachable}
+            levels = [current]
+            count = len(ids)
+            while True:
+                ids = {}
+                following = {q: ids.setdefault((current[q],) + tuple(current[delta[q][a]] for a in symbols),
+                                               len(ids))
+                             for q in self.reachable}
+                if len(ids) == count:
+                    break
+                count = len(ids)
+                levels.append(following)
+                current = following
+            self._levels = levels
+        return self._levels
+
+    def redundant_states(self):
+        """Все состояния снимка минус число классов эквивалентности достижимых"""
+        classes = len(set(self.refinement_levels()[-1].values()))
+        return len(self.compiled.states) - classes
+
+    def separating_word(self, p, q):
+        """
+        Кратчайшее слово, на котором выходы p и q различаются
+
+        Returns:
+            tuple | None: Номера символов или None для эквивалентных состояний
+        """
+        levels = self.refinement_levels()
+        if levels[-1][p] == levels[-1][q]:
+            return None
+        word = []
+        while True:
+            # Первый уровень, на котором p и q в разных блоках
+            k = next(k for k, blocks in enumerate(levels) if blocks[p] != blocks[q])
+            if k == 0:
+                outputs = self.compiled.outputs
+                word.append(next(a for a in range(len(self.symbols))
+                                 if outputs[self.delta[p][a]] != outputs[self.delta[q][a]]))
+                return tuple(word)
+            previous = levels[k - 1]
+            a = next(a for a in range(len(self.symbols))
+                     if previous[self.delta[p][a]] != previous[self.delta[q][a]])
+            word.append(a)
+            p, q = self.delta[p][a], self.delta[q][a]
+
+    def characterization(self):
+        """W: разделяющие слова, добавляемые, пока блоки не станут одиночными"""
+        if self._characterization is None:
+            self._characterization = self._build_characterization()
+        return self._characterization
+
+    def _build_characterization(self):
+        classes = self.refinement_levels()[-1]
+        blocks = [list(self.reachable)]
+        words = []
+        while True:
+            # Пара ещё не разделённых различимых состояний
+            pair = None
+            for block in blocks:
+                q = next((q for q in block[1:] if classes[q] != classes[block[0]]), None)
+                if q is not None:
+                    pair = (block[0], q)
+                    break
+            if pair is None:
+                return words  # в блоках остались только эквивалентные состояния
+            word = self.separating_word(*pair)
+            words.append(word)
+            refined = []
+            for block in blocks:
+                groups = {}
+                for q in block:
+                    groups.setdefault(self.outputs_along(q, word), []).append(q)
+                refined.extend(groups.values())
+            blocks = [block for block in refined
+                      if any(classes[q] != classes[block[0]] for q in block)]
+
+    def outputs_along(self, state, word):
+        outputs = self.compiled.outputs
+        result = []
+        for a in word:
+            state = self.delta[state][a]
+            result.append(outputs[state])
+        return tuple(result)
+
+    def identification_sets(self):
+        """
+        W_q для каждого состояния: слова из W, отличающие q от всех
+        различимых с ним состояний (жадное покрытие)
+        """
+        if self._identification is None:
+            self._identification = self._build_identification()
+        return self._identification
+
+    def _build_identification(self):
+        characterization = self.characterization()
+        signatures = {q: tuple(self.outputs_along(q, w) for w in characterization)
+                      for q in self.reachable}
+        # Состояния с тем же выходом на i-м слове W и с той же подписью целиком
+        same_output = [{} for _ in characterization]
+        same_signature = {}
+        for q, signature in signatures.items():
+            for i, out in enumerate(signature):
+                same_output[i].setdefault(out, set()).add(q)
+            same_signature.setdefault(signature, set()).add(q)
+
+        result = {}
+        for q, signature in signatures.items():
+            # Ещё не отличённые от q различимые состояния
+            others = set(self.reachable) - same_signature[signature]
+            chosen = []
+            while others:
+                best = min(range(len(characterization)),
+                           key=lambda i: len(others & same_output[i][signature[i]]))
+                chosen.append(characterization[best])
+                others &= same_output[best][signature[best]]
+            result[q] = chosen
+        return result
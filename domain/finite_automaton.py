@@ -4,7 +4,13 @@
 Назначение: Определяет класс MooreAutomaton (конечный автомат Мура)
 """
 
+import gc
+
 from .transition import Transition
+from .compiled_automaton import CompiledAutomaton, MISSING
+from .subset_automaton import SubsetAutomaton, OUTPUT_POLICIES
+from .interning import InternTable
+from .tokenizer import Tokenizer
 
 class MooreAutomaton:
     """
@@ -14,31 +20,103 @@ class MooreAutomaton:
 
     def __init__(self):
         self.states = []          # Список состояний
+        self._state_set = set()   # Те же состояния - для проверки за O(1)
         self.transitions = []     # Список переходов (Transition)
         self.current_state = None
         self.initial_state = None 
         self.outputs = {}         # Выходы (state -> value)
+        self._version = 0         # Счётчик изменений (для кэшей)
+        # Общая нумерация имён состояний и символов (не сбрасывается)
+        self.names = InternTable()
+        # (номер from_state, номер symbol) -> переходы в порядке добавления
+        # (больше одного - недетерминированный автомат)
+        self._successors = {}
+        self._symbol_use = {}       # номер входного символа -> число переходов с ним
+        self._compiled = None
+        self._compiled_version = -1
+        # Производные данные (алфавиты, свойства), посчитанные для _derived_version
+        self._derived = {}
+        self._derived_version = -1
+        # Выход подмножества состояний с разными выходами (см. OUTPUT_POLICIES)
+        self._output_policy = 'union'
+        # (входной алфавит, результат ambiguity()) для последнего проверенного алфавита
+        self._ambiguity = ((), None)
 
     def add_state(self, name, output=None):
         """Добавляет новое состояние (ИСПРАВЛЕНО)"""
-        if name not in self.states:
+        if name not in self._state_set:
+            self.names.intern(name)
             self.states.append(name)
+            self._state_set.add(name)
+            self._version += 1
         
         # Всегда обновляем выход, если он предоставлен
-        if output is not None:
+        if output is not None and self.outputs.get(name) != output:
+            self.names.intern(output)
             self.outputs[name] = output
+            self._version += 1
 
     def add_transition(self, from_state, to_state, symbol):
         """Добавляет переход между состояниями"""
-        if from_state in self.states and to_state in self.states:
-            self.transitions.append(Transition(from_state, to_state, symbol))
+        if from_state in self._state_set and to_state in self._state_set:
+            names = self.names
+            ids = (names.intern(from_state), names.intern(symbol), names.intern(to_state))
+            transition = Transition(from_state, to_state, symbol, ids)
+            self.transitions.append(transition)
+            self._index_transition(transition)
+            self._version += 1
+            return transition
         else:
             raise ValueError("Переход содержит неизвестное состояние")
 
+    @property
+    def version(self):
+        """Номер версии; увеличивается при каждом изменении автомата"""
+        return self._version
+
+    def cached(self, key, compute):
+        """
+        Значение compute(), посчитанное один раз на версию автомата
+
+        Кэш производных данных (алфавиты, свойства, графовые индексы);
+        сбрасывается при любом изменении автомата.
+        """
+        if self._derived_version != self._version:
+            self._derived = {}
+            self._derived_version = self._version
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+    def compile(self):
+        """
+        Табличный снимок автомата для быстрой симуляции
+
+        Снимок неизменяем, поэтому его можно передавать в рабочий поток.
+        Кэшируется до следующего изменения автомата. Для недетерминированного
+        автомата возвращается SubsetAutomaton: подмножества состояний
+        строятся по мере того, как симуляция до них доходит.
+        """
+        if self._compiled_version != self._version:
+            if self.is_deterministic():
+                self._compiled = CompiledAutomaton.from_automaton(self)
+            else:
+                self._compiled = SubsetAutomaton.from_automaton(self, self._output_policy)
+            self._compiled_version = self._version
+        return self._compiled
+
     def get_transitions(self):
         """Возвращает список всех переходов"""
         return [(t.from_state, t.symbol, t.to_state) for t in self.transitions]
 
+    def get_transition_count(self):
+        """Количество переходов (без копирования списка)"""
+        return len(self.transitions)
+
+    def get_transitions_slice(self, start, stop):
+        """Переходы с индексами [start, stop) в виде (from, symbol, to)"""
+        return [(t.from_state, t.symbol, t.to_state) for t in self.transitions[start:stop]]
+
     def get_states(self):
         """Возвращает список всех состояний"""
         return list(self.states)
@@ -47,9 +125,13 @@ class MooreAutomaton:
         """Возвращает словарь выходных значений"""
         return dict(self.outputs)
 
+    def get_output(self, state, default=None):
+        """Выходное значение одного состояния"""
+        return self.outputs.get(state, default)
+
     def set_start_state(self, state_name):
         """Устанавливает начальное состояние"""
-        if state_name in self.states:
+        if state_name in self._state_set:
             self.current_state = state_name
         else:
             raise ValueError(f"Состояние {state_name} не найдено")
@@ -62,6 +144,165 @@ class MooreAutomaton:
                 return self.outputs.get(self.current_state, None)
         return None
 
+    def process_word(self, word):
+        """
+        Обработать слово, начиная с начального состояния
+
+        Не изменяет current_state. Результат совместим с
+        AutomatonService.format_process_result().
+
+        Returns:
+            dict: success, error, steps, output_word, final_state
+        """
+        result = {'success': True, 'error': None, 'steps': [],
+                  'output_word': "", 'final_state': None}
+        compiled = self.compile()
+        state = compiled.initial
+        if state is None:
+            result.update(success=False, error="Начальное состояние не задано")
+            return result
+
+        # Таблица общая и для ДКА, и для НКА (там состояния - подмножества)
+        names, outputs = compiled.states, compiled.outputs
+        output_chars = []
+        for number, symbol in enumerate(compiled.tokenize(word), 1):
+            try:
+                nxt = compiled.next_state(state, symbol)
+            except ValueError as e:  # конфликт выходов (политика 'error')
+                result.update(success=False, error=str(e))
+                break
+            if nxt == MISSING:
+                result['success'] = False
+                result['error'] = f"Не найден переход δ({names[state]}, {symbol})"
+                break
+            output_symbol = outputs[nxt]
+            result['steps'].append({
+                'step_number': number,
+                'current_state': names[state],
+                'input_symbol': symbol,
+                'output_symbol': output_symbol,
+                'next_state': names[nxt]
+            })
+            if output_symbol is not None:
+                output_chars.append(str(output_symbol))
+            state = nxt
+
+        result['output_word'] = "".join(output_chars)
+        result['final_state'] = names[state]
+        return result
+
+    def copy_from(self, other):
+        """
+        Заменить состояния, выходы и переходы содержимым автомата other
+
+        Объект (и его реестр имён) сохраняется - на него ссылаются сервисы и UI.
+        """
+        self.clear_transitions()
+        self._output_policy = other.output_policy
+        for state in other.states:
+            self.add_state(state, output=other.outputs.get(state))
+        for t in other.transitions:
+            self.add_transition(t.from_state, t.to_state, t.symbol)
+        if other.initial_state is not None:
+            self.set_initial_state(other.initial_state)
+
+    def load_table(self, states, symbols, delta, outputs, initial=None):
+        """
+        Заменить содержимое автомата плотной таблицей переходов (пакетно)
+
+        Переходы создаются одним проходом по таблице, версия увеличивается
+        один раз, а сама таблица сразу становится кэшем compile().
+
+        Args:
+            states: Имена состояний (номер -> имя)
+            symbols: Входные символы (номер -> символ)
+            delta: delta[состояние][символ] - номер состояния или MISSING
+            outputs: Выходы состояний (номер -> выход или None)
+            initial: Номер начального состояния или None
+        """
+        self.clear_transitions()
+        names = self.names
+        state_ids = [names.intern(state) for state in states]
+        symbol_ids = [names.intern(symbol) for symbol in symbols]
+        output_ids = [MISSING if out is None else names.intern(out) for out in outputs]
+        self.states = states = list(states)
+        self._state_set = set(states)
+        self.outputs = {state: out for state, out in zip(states, outputs) if out is not None}
+
+        append = self.transitions.append
+        successors = self._successors
+        # Миллионы новых объектов: без промежуточных проходов сборщика циклов
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for source, row in enumerate(delta):
+                from_state, from_id = states[source], state_ids[source]
+                for a, target in enumerate(row):
+                    if target == MISSING:
+                        continue
+                    symbol_id = symbol_ids[a]
+                    transition = Transition(from_state, states[target], symbols[a],
+                                            (from_id, symbol_id, state_ids[target]))
+                    append(transition)
+                    # Таблица детерминирована: по одному переходу на пару (q, a)
+                    successors[(from_id, symbol_id)] = [transition]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        for symbol_id, column in zip(symbol_ids, zip(*delta)):
+            count = len(column) - column.count(MISSING)
+            if count:
+                self._symbol_use[symbol_id] = count
+
+        if initial is not None:
+            self.initial_state = self.current_state = self.states[initial]
+        self._version += 1
+        self._compiled = CompiledAutomaton(self.states, symbols, delta, outputs, initial,
+                                           state_ids, output_ids)
+        self._compiled_version = self._version
+
+    @property
+    def output_policy(self):
+        """Выход подмножества состояний с разными выходами (OUTPUT_POLICIES)"""
+        return self._output_policy
+
+    def set_output_policy(self, policy):
+        """Задать политику выходов для недетерминированного автомата"""
+        if policy not in OUTPUT_POLICIES:
+            raise ValueError(f"Неизвестная политика выходов: {policy}")
+        if policy != self._output_policy:
+            self._output_policy = policy
+            self._version += 1
+
+    def determinize(self):
+        """
+        Полная детерминизация (построение подмножеств)
+
+        Строятся только подмножества, достижимые из начального состояния.
+
+        Returns:
+            MooreAutomaton: Новый детерминированный автомат
+
+        Raises:
+            ValueError: если не задано начальное состояние или политика
+                'error' встретила конфликт выходов
+        """
+        if self.initial_state is None:
+            raise ValueError("Сначала задайте начальное состояние")
+        table = SubsetAutomaton.from_automaton(self, self._output_policy)
+        table.expand_all()
+
+        result = MooreAutomaton()
+        result.set_output_policy(self._output_policy)
+        for state, name in enumerate(table.states):
+            result.add_state(name, output=table.outputs[state])
+        for state, row in enumerate(table.delta):
+            for a, nxt in enumerate(row):
+                if nxt != MISSING:
+                    result.add_transition(table.states[state], table.states[nxt], table.symbols[a])
+        result.set_initial_state(table.states[table.initial])
+        return result
+
     def reset(self):
         """Сбрасывает автомат в начальное состояние"""
         self.current_state = self.states[0] if self.states else None
@@ -70,86 +311,210 @@ class MooreAutomaton:
         return f"<MooreAutomaton states={len(self.states)} transitions={len(self.transitions)}>"
 
     def find_transition(self, from_state, symbol):
-        """(ДОБАВЛЕНО) Ищет переход по состоянию и символу"""
-        for t in self.transitions:
-            if t.from_state == from_state and t.symbol == symbol:
-                return t
-        return None
+        """(ДОБАВЛЕНО) Ищет переход по состоянию и символу (O(1) по индексу)"""
+        found = self._successors.get((self.names.get(from_state), self.names.get(symbol)))
+        return found[0] if found else None
+
+    def find_transitions(self, from_state, symbol):
+        """Все переходы из from_state по symbol (для недетерминированного автомата)"""
+        return list(self._successors.get((self.names.get(from_state), self.names.get(symbol)), ()))
+
+    def has_transition(self, from_state, symbol, to_state=None):
+        """Есть ли переход из from_state по symbol (в to_state, если он задан)"""
+        found = self._successors.get((self.names.get(from_state), self.names.get(symbol)), ())
+        if to_state is None:
+            return bool(found)
+        return any(t.to_state == to_state for t in found)
 
     def remove_transition(self, index):
         """(ДОБАВЛЕНО) Удаляет переход по индексу"""
         if 0 <= index < len(self.transitions):
-            return self.transitions.pop(index)
+            self._version += 1
+            removed = self.transitions.pop(index)
+            key = removed.ids[:2]
+            count = self._symbol_use[key[1]] - 1
+            if count:
+                self._symbol_use[key[1]] = count
+            else:
+                del self._symbol_use[key[1]]
+            successors = self._successors[key]
+            successors.remove(removed)
+            if not successors:
+                del self._successors[key]
+            return removed
         return None
 
     def clear_transitions(self):
         """(ДОБАВЛЕНО) Очищает все переходы и состояния"""
         self.states = []
+        self._state_set = set()
         self.transitions = []
+        self._successors = {}
+        self._symbol_use = {}
         self.outputs = {}
         self.initial_state = None
+        self._version += 1
 
     def get_input_alphabet(self):
         """(ДОБАВЛЕНО) Возвращает входной алфавит"""
-        return sorted(list(set(t.symbol for t in self.transitions)))
+        alphabet = self.cached('input_alphabet', lambda: sorted(
+            self.names.decode(self._symbol_use)
+        ))
+        return list(alphabet)
 
     def get_output_alphabet(self):
         """(ДОБАВЛЕНО) Возвращает выходной алфавит"""
-        return sorted(list(set(self.outputs.values())))
+        alphabet = self.cached('output_alphabet', lambda: sorted(set(self.outputs.values())))
+        return list(alphabet)
+
+    def get_symbol_ambiguity(self):
+        """
+        Неоднозначность разбиения слов по входному алфавиту
+
+        Зависит только от алфавита, поэтому δ не компилируется, а проверка
+        повторяется лишь при изменении алфавита, а не при каждой правке.
+
+        Returns:
+            tuple | None: См. Tokenizer.ambiguity()
+        """
+        def compute():
+            alphabet = tuple(self.get_input_alphabet())
+            if self._ambiguity[0] != alphabet:
+                self._ambiguity = (alphabet, Tokenizer(alphabet).ambiguity())
+            return self._ambiguity[1]
+        return self.cached('symbol_ambiguity', compute)
+
+    def get_sorted_states(self):
+        """Состояния в порядке сортировки (для отображения)"""
+        return list(self.cached('sorted_states', lambda: sorted(self.states)))
 
     def get_initial_state(self):
         return self.initial_state
 
     def is_deterministic(self):
         """(ДОБАВЛЕНО-ЗАГЛУШКА) Проверяет детерминированность"""
-        seen = set()
-        for t in self.transitions:
-            key = (t.from_state, t.symbol)
-            if key in seen:
-                return False
-            seen.add(key)
-        return True
+        # По одному переходу на каждую пару (q, a)
+        return len(self._successors) == len(self.transitions)
 
     def is_complete(self):
         """(ДОБАВЛЕНО-ЗАГЛУШКА) Проверяет полноту"""
-        # Упрощенная проверка
-        if not self.states or not self.get_input_alphabet():
-            return True # Пустой граф считаем полным
-            
-        input_alphabet = self.get_input_alphabet()
-        for state in self.states:
-            for symbol in input_alphabet:
-                if self.find_transition(state, symbol) is None:
-                    return False
-        return True
+        return self.cached('is_complete', self._check_complete)
+
+    def _check_complete(self):
+        # Пустой граф считаем полным
+        symbols, masks = self._completeness_masks()
+        full = (1 << len(symbols)) - 1
+        return all(mask == full for mask in masks)
+
+    def get_completeness(self):
+        """
+        Сводка полноты таблицы переходов (кэшируется до изменения автомата)
+
+        Returns:
+            dict: defined - число заданных клеток (q, a), total - |Q|·|A|,
+                percentage - доля заданных (0.0 для пустого автомата),
+                missing - число незаданных клеток
+        """
+        def compute():
+            symbols, masks = self._completeness_masks()
+            defined = sum(bin(mask).count("1") for mask in masks)
+            total = len(masks) * len(symbols)
+            return {
+                'defined': defined,
+                'total': total,
+                'percentage': defined / total * 100 if total else 0.0,
+                'missing': total - defined
+            }
+        return dict(self.cached('completeness', compute))
+
+    def get_missing_transitions(self, limit=None):
+        """
+        Незаданные клетки таблицы переходов
+
+        Args:
+            limit: Максимальное число клеток (None - все)
+
+        Returns:
+            list: Пары (состояние, символ) в порядке состояний и символов алфавита
+        """
+        symbols, masks = self._completeness_masks()
+        full = (1 << len(symbols)) - 1
+        missing = []
+        for state, mask in zip(self.states, masks):
+            absent = full & ~mask
+            while absent:
+                if limit is not None and len(missing) >= limit:
+                    return missing
+                low = absent & -absent
+                missing.append((state, symbols[low.bit_length() - 1]))
+                absent ^= low
+        return missing
+
+    def unused_state_name(self, base):
+        """Имя base или base', base'', ... - первое, которого нет среди состояний"""
+        name = base
+        while name in self._state_set:
+            name += "'"
+        return name
+
+    def _completeness_masks(self):
+        """
+        Битовые маски заданных символов по состояниям (один проход по индексу)
+
+        Returns:
+            tuple: (входной алфавит по возрастанию, маска для каждого состояния
+                в порядке self.states; бит i - символ alphabet[i])
+        """
+        def compute():
+            symbols = self.get_input_alphabet()
+            names = self.names
+            bits = {names.get(symbol): 1 << i for i, symbol in enumerate(symbols)}
+            by_id = {}
+            for from_id, symbol_id in self._successors:
+                by_id[from_id] = by_id.get(from_id, 0) | bits[symbol_id]
+            return symbols, [by_id.get(names.get(state), 0) for state in self.states]
+        return self.cached('completeness_masks', compute)
 
     def get_available_inputs_for_state(self, state):
         """(ДОБАВЛЕНО) Получить доступные входы для состояния"""
-        if state not in self.states:
+        if state not in self._state_set:
             return []
         symbols = {t.symbol for t in self.transitions if t.from_state == state}
         return sorted(list(symbols))
 
     def set_initial_state(self, state):
         """(служебно) Установить только вершину начального состояния q0"""
-        if state not in self.states:
+        if state not in self._state_set:
             raise ValueError(f"Состояние {state} отсутствует в автомате")
         
         self.initial_state = state
         self.current_state = state
+        self._version += 1
 
     def remove_state(self, state):
         """Удаляет состояние и все связанные с ним переходы."""
-        if state not in self.states:
+        if state not in self._state_set:
             return False
         self.states.remove(state)
+        self._state_set.discard(state)
         self.outputs.pop(state, None)
         self.transitions = [
             t for t in self.transitions
             if t.from_state != state and t.to_state != state
         ]
+        self._successors = {}
+        self._symbol_use = {}
+        for t in self.transitions:
+            self._index_transition(t)
         if self.initial_state == state:
             self.initial_state = None
         if self.current_state == state:
             self.current_state = None
+        self._version += 1
         return True
+
+    def _index_transition(self, transition):
+        """Учесть переход в индексе ключей и счётчике символов"""
+        key = transition.ids[:2]
+        self._successors.setdefault(key, []).append(transition)
+        self._symbol_use[key[1]] = self._symbol_use.get(key[1], 0) + 1
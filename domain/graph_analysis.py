@@ -0,0 +1,229 @@
+# Анализ графа переходов
+"""
+Модуль: graph_analysis.py
+Назначение: Достижимость, сильно связные компоненты (итеративный алгоритм
+Тарьяна), ловушки и состояния с неизменным выходом для MooreAutomaton.
+
+Все обходы итеративные (без рекурсии и sys.setrecursionlimit) и линейные
+по |Q| + |δ|. Результаты кэшируются автоматом до следующего изменения.
+"""
+
+# Выход "не постоянен" при свёртке по графу компонент (None - тоже выход)
+_MIXED = object()
+
+
+def reachable_states(automaton, start=None):
+    """
+    Состояния, достижимые из start (по умолчанию - из начального)
+
+    Returns:
+        list: Имена в порядке обхода в ширину (пустой, если старт не задан)
+    """
+    if start is None:
+        start = automaton.initial_state
+    states, index, successors = _graph(automaton)
+    if start not in index:
+        return []
+    order = automaton.cached(('graph_reachable', start), lambda: _bfs(successors, index[start]))
+    return [states[i] for i in order]
+
+
+def unreachable_states(automaton):
+    """Состояния, недостижимые из начального (все, если оно не задано)"""
+    reachable = set(reachable_states(automaton))
+    return [state for state in automaton.states if state not in reachable]
+
+
+def strongly_connected_components(automaton):
+    """
+    Сильно связные компоненты
+
+    Returns:
+        list: Списки имён состояний; компоненты идут в обратном
+            топологическом порядке (компонента - раньше всех, из которых
+            в неё можно попасть)
+    """
+    states, _, _ = _graph(automaton)
+    return [[states[i] for i in component] for component in _components(automaton)]
+
+
+def trap_states(automaton):
+    """
+    Поглощающие состояния: все переходы из них ведут в них же
+
+    Сюда попадают и тупики (состояния без исходящих переходов).
+    """
+    states, _, successors = _graph(automaton)
+    return [states[i] for i, targets in enumerate(successors)
+            if all(target == i for target in targets)]
+
+
+def trap_components(automaton):
+    """
+    Замкнутые компоненты: из них нет переходов в другие компоненты
+
+    Returns:
+        list: Списки имён состояний (поглощающее состояние - компонента из одного)
+    """
+    states, _, successors = _graph(automaton)
+    components = _components(automaton)
+    component_of = _component_index(components, len(states))
+    return [
+        [states[i] for i in component]
+        for number, component in enumerate(components)
+        if all(component_of[t] == number for i in component for t in successors[i])
+    ]
+
+
+def constant_output_states(automaton):
+    """
+    Состояния, выход которых больше никогда не изменится
+
+    Состояние q подходит, если у q и у всех достижимых из q состояний
+    один и тот же выход. Считается одним проходом по компонентам в
+    порядке Тарьяна: компоненты-преемники к этому моменту уже обработаны.
+
+    Returns:
+        dict: Имя состояния -> его постоянный выход
+    """
+    states, _, successors = _graph(automaton)
+    outputs = [automaton.outputs.get(state) for state in states]
+    components = _components(automaton)
+    component_of = _component_index(components, len(states))
+
+    values = []
+    for number, component in enumerate(components):
+        value = outputs[component[0]]
+        for i in component:
+            if value is _MIXED:
+                break
+            if outputs[i] != value:
+                value = _MIXED
+                break
+            for t in successors[i]:
+                other = component_of[t]
+                # _MIXED не равен никакому выходу
+                if other != number and values[other] != value:
+                    value = _MIXED
+                    break
+        values.append(value)
+
+    return {states[i]: values[component_of[i]] for i in range(len(states))
+            if values[component_of[i]] is not _MIXED}
+
+
+def prune_unreachable(automaton):
+    """
+    Копия автомата без состояний, недостижимых из начального
+
+    Returns:
+        MooreAutomaton: Новый автомат (та же политика выходов)
+
+    Raises:
+        ValueError: если не задано начальное состояние
+    """
+    from .finite_automaton import MooreAutomaton
+
+    if automaton.initial_state is None:
+        raise ValueError("Сначала задайте начальное состояние")
+    keep = set(reachable_states(automaton))
+    result = MooreAutomaton()
+    result.set_output_policy(automaton.output_policy)
+    for state in automaton.states:
+        if state in keep:
+            result.add_state(state, output=automaton.outputs.get(state))
+    for t in automaton.transitions:
+        if t.from_state in keep:
+            result.add_transition(t.from_state, t.to_state, t.symbol)
+    result.set_initial_state(automaton.initial_state)
+    return result
+
+
+# === Внутренние функции ===
+
+def _graph(automaton):
+    """(состояния, имя -> номер, номера преемников без повторов) - на версию автомата"""
+    def compute():
+        states = list(automaton.states)
+        index = {state: i for i, state in enumerate(states)}
+        successors = [set() for _ in states]
+        for t in automaton.transitions:
+            successors[index[t.from_state]].add(index[t.to_state])
+        return states, index, [tuple(targets) for targets in successors]
+    return automaton.cached('graph', compute)
+
+
+def _bfs(successors, start):
+    seen = [False] * len(successors)
+    seen[start] = True
+    order = [start]
+    for i in order:
+        for t in successors[i]:
+            if not seen[t]:
+                seen[t] = True
+                order.append(t)
+    return order
+
+
+def _components(automaton):
+    return automaton.cached('graph_components', lambda: _tarjan(_graph(automaton)[2]))
+
+
+def _tarjan(successors):
+    """Итеративный алгоритм Тарьяна: список компонент (списки номеров)"""
+    n = len(successors)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        # Кадр обхода: (вершина, позиция следующего преемника)
+        work = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, position = work[-1]
+            targets = successors[v]
+            if position < len(targets):
+                work[-1] = (v, position + 1)
+                w = targets[position]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[v] < low[parent]:
+                    low[parent] = low[v]
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+    return components
+
+
+def _component_index(components, size):
+    component_of = [0] * size
+    for number, component in enumerate(components):
+        for i in component:
+            component_of[i] = number
+    return component_of
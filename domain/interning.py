@@ -0,0 +1,65 @@
+# Реестр интернированных имён
+"""
+Модуль: interning.py
+Назначение: Общая нумерация имён автомата (состояния, входные и выходные
+символы) маленькими целыми числами.
+
+Номера только добавляются и не переиспользуются, поэтому их можно хранить
+в кэшах и историях (live-режим, таблицы переходов) между изменениями
+автомата; обратно в имена они переводятся только при отображении.
+"""
+
+import threading
+
+
+class InternTable:
+    """Двусторонее отображение имя <-> номер (только дописывается)"""
+
+    def __init__(self):
+        self._names = []
+        self._ids = {}
+        # Имена подмножеств добавляются и из рабочего потока (SubsetAutomaton)
+        self._lock = threading.Lock()
+
+    def intern(self, name):
+        """Номер имени; новое имя получает следующий номер"""
+        index = self._ids.get(name)
+        if index is None:
+            with self._lock:
+                index = self._ids.get(name)
+                if index is None:
+                    index = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = index
+        return index
+
+    def get(self, name, default=None):
+        """Номер имени без добавления (default, если имя не встречалось)"""
+        return self._ids.get(name, default)
+
+    def name(self, index):
+        """Имя по номеру"""
+        return self._names[index]
+
+    def decode(self, indices):
+        """Имена для последовательности номеров"""
+        names = self._names
+        return [names[i] for i in indices]
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<InternTable names={len(self._names)}>"
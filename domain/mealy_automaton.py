@@ -0,0 +1,209 @@
+# Класс конечного автомата Мили и преобразования Мура <-> Мили
+"""
+Модуль: mealy_automaton.py
+Назначение: Определяет класс MealyAutomaton (выход записан на ребре) и
+преобразования moore_to_mealy() / mealy_to_moore().
+
+Симуляция автомата Мура в этом проекте выдаёт выход состояния, в которое
+ведёт переход, поэтому автомат Мили с тем же поведением получается
+переносом выхода конечного состояния на ребро. Обратно состояние
+расщепляется на копии по различным выходам входящих в него рёбер.
+"""
+
+from .finite_automaton import MooreAutomaton
+
+
+class MealyAutomaton:
+    """
+    Автомат Мили: переход (q, a) -> (q', b) несёт собственный выход b.
+
+    Переходы хранятся строками (q(t), A, B, q(t+1)) - в том же порядке
+    полей, что и в EdgePanel и в файлах переходов.
+    """
+
+    def __init__(self):
+        self.states = []          # Список состояний
+        self._state_set = set()
+        self.transitions = []     # Строки (from_state, symbol, output, to_state)
+        self._rows = set()        # Те же строки - для отбрасывания повторов
+        self._edges = {}          # (from_state, symbol) -> [(to_state, output), ...]
+        self.initial_state = None
+
+    @classmethod
+    def from_rows(cls, rows, initial_state=None):
+        """
+        Построить автомат из строк (q(t), A, B, q(t+1))
+
+        Если начальное состояние не задано, им становится начало первой строки.
+        """
+        automaton = cls()
+        for from_state, symbol, output, to_state in rows:
+            automaton.add_state(from_state)
+            automaton.add_state(to_state)
+            automaton.add_transition(from_state, to_state, symbol, output)
+            if initial_state is None:
+                initial_state = from_state
+        if initial_state is not None:
+            automaton.set_initial_state(initial_state)
+        return automaton
+
+    def add_state(self, name):
+        """Добавляет новое состояние"""
+        if name not in self._state_set:
+            self.states.append(name)
+            self._state_set.add(name)
+
+    def add_transition(self, from_state, to_state, symbol, output):
+        """Добавляет переход с выходом output (повтор той же строки игнорируется)"""
+        if from_state not in self._state_set or to_state not in self._state_set:
+            raise ValueError("Переход содержит неизвестное состояние")
+        row = (from_state, symbol, output, to_state)
+        if row not in self._rows:
+            self._rows.add(row)
+            self.transitions.append(row)
+            self._edges.setdefault((from_state, symbol), []).append((to_state, output))
+        return row
+
+    def set_initial_state(self, state):
+        """Установить начальное состояние"""
+        if state not in self._state_set:
+            raise ValueError(f"Состояние {state} отсутствует в автомате")
+        self.initial_state = state
+
+    def get_initial_state(self):
+        return self.initial_state
+
+    def get_states(self):
+        """Возвращает список всех состояний"""
+        return list(self.states)
+
+    def get_transitions(self):
+        """Переходы в виде (q(t), A, B, q(t+1))"""
+        return list(self.transitions)
+
+    def is_deterministic(self):
+        """По одному переходу на каждую пару (q, a)"""
+        return len(self._edges) == len(self.transitions)
+
+    def process_word(self, word):
+        """
+        Обработать слово, начиная с начального состояния
+
+        Формат результата тот же, что у MooreAutomaton.process_word().
+        Для многобуквенных символов и недетерминированных автоматов
+        используйте mealy_to_moore(...).process_word().
+
+        Returns:
+            dict: success, error, steps, output_word, final_state
+        """
+        result = {'success': True, 'error': None, 'steps': [],
+                  'output_word': "", 'final_state': None}
+        state = self.initial_state
+        if state is None:
+            result.update(success=False, error="Начальное состояние не задано")
+            return result
+
+        output_chars = []
+        for number, symbol in enumerate(word, 1):
+            edges = self._edges.get((state, symbol))
+            if not edges:
+                result.update(success=False, error=f"Не найден переход δ({state}, {symbol})")
+                break
+            if len(edges) > 1:
+                result.update(success=False,
+                              error=f"Несколько переходов δ({state}, {symbol}): автомат недетерминирован")
+                break
+            nxt, output = edges[0]
+            result['steps'].append({
+                'step_number': number,
+                'current_state': state,
+                'input_symbol': symbol,
+                'output_symbol': output,
+                'next_state': nxt
+            })
+            if output is not None:
+                output_chars.append(str(output))
+            state = nxt
+
+        result['output_word'] = "".join(output_chars)
+        result['final_state'] = state
+        return result
+
+    def __repr__(self):
+        return f"<MealyAutomaton states={len(self.states)} transitions={len(self.transitions)}>"
+
+
+def moore_to_mealy(moore):
+    """
+    Автомат Мили с тем же поведением, что у автомата Мура
+
+    Выход конечного состояния переносится на каждое входящее ребро;
+    состояния и переходы сохраняются один к одному. Время O(|Q| + |δ|).
+
+    Args:
+        moore: Экземпляр MooreAutomaton
+
+    Returns:
+        MealyAutomaton
+    """
+    mealy = MealyAutomaton()
+    for state in moore.states:
+        mealy.add_state(state)
+    outputs = moore.outputs
+    for t in moore.transitions:
+        mealy.add_transition(t.from_state, t.to_state, t.symbol, outputs.get(t.to_state))
+    if moore.initial_state is not None:
+        mealy.set_initial_state(moore.initial_state)
+    return mealy
+
+
+def mealy_to_moore(mealy):
+    """
+    Автомат Мура с тем же поведением, что у автомата Мили
+
+    Состояние q, в которое входят рёбра с выходами b1..bk, расщепляется на
+    копии (q, b1)..(q, bk), найденные по словарю; копия с единственным
+    выходом сохраняет имя q, остальные называются "q/b". Каждый переход
+    (q, a, b, q') копируется для всех копий q и ведёт в копию (q', b).
+    Время пропорционально размеру результата: O(|Q'| + |δ'|).
+
+    Args:
+        mealy: Экземпляр MealyAutomaton
+
+    Returns:
+        MooreAutomaton
+    """
+    # Различные выходы входящих рёбер в порядке первого появления
+    incoming = {}
+    for _, _, output, to_state in mealy.transitions:
+        incoming.setdefault(to_state, {})[output] = None
+
+    moore = MooreAutomaton()
+    taken = set(mealy.states)
+    copies = {}          # (состояние, выход) -> имя копии
+    state_copies = {}    # состояние -> имена всех его копий
+    for state in mealy.states:
+        outputs = list(incoming.get(state, (None,)))
+        names = []
+        for output in outputs:
+            if len(outputs) == 1:
+                name = state
+            else:
+                name = f"{state}/{output}"
+                while name in taken:
+                    name += "'"
+                taken.add(name)
+            copies[(state, output)] = name
+            names.append(name)
+            moore.add_state(name, output=output)
+        state_copies[state] = names
+
+    for from_state, symbol, output, to_state in mealy.transitions:
+        target = copies[(to_state, output)]
+        for source in state_copies[from_state]:
+            moore.add_transition(source, target, symbol)
+
+    # Выход начального состояния не выдаётся, подходит любая его копия
+    if mealy.initial_state is not None:
+        moore.set_initial_state(state_copies[mealy.initial_state][0])
+    return moore
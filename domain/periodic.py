@@ -0,0 +1,167 @@
+# Поведение автомата на периодических входах
+"""
+Модуль: periodic.py
+Назначение: Анализ входа u·v^∞ (слово u, затем бесконечно повторяемое
+слово v) по табличному снимку автомата без пошаговой симуляции.
+
+Отображение состояний f(q) = δ*(q, v) строится один раз композицией
+столбцов δ по символам v. Цикл ищется на орбите q_u, f(q_u), f²(q_u), ...
+(не длиннее |Q|), а состояние после u·v^k для огромных k находится
+двоичным подъёмом по степеням f: f, f², f⁴, ...
+"""
+
+from .compiled_automaton import MISSING
+
+
+class WordPower:
+    """
+    Отображение f(q) = δ*(q, v) для слова v и его степени.
+
+    Таблицы отображений хранят в конце лишний элемент MISSING, поэтому
+    индекс MISSING (-1) переходит сам в себя без проверок в цикле.
+    """
+
+    def __init__(self, compiled, word):
+        """
+        Args:
+            compiled: CompiledAutomaton (SubsetAutomaton достраивается целиком)
+            word: Слово v (строка или последовательность символов)
+
+        Raises:
+            ValueError: для пустого слова
+        """
+        if not compiled.deterministic:
+            compiled.expand_all()
+        self.compiled = compiled
+        self.word = list(compiled.tokenize(word)) if isinstance(word, str) else list(word)
+        if not self.word:
+            raise ValueError("Повторяемое слово v не должно быть пустым")
+
+        size = len(compiled.states)
+        mapping = list(range(size)) + [MISSING]
+        for symbol in self.word:
+            a = compiled.symbol_ids.get(symbol)
+            if a is None:
+                mapping = [MISSING] * (size + 1)
+                break
+            column = [row[a] for row in compiled.delta] + [MISSING]
+            mapping = [column[state] for state in mapping]
+        # _levels[j] - отображение f^(2^j)
+        self._levels = [mapping]
+        self._outputs = {}
+
+    def apply(self, state: int) -> int:
+        """f(state) или MISSING, если v нельзя дочитать"""
+        return self._levels[0][state]
+
+    def power(self, state: int, k: int) -> int:
+        """
+        f^k(state) двоичным подъёмом: O(log k) после построения уровней
+
+        Уровни строятся по мере надобности, каждый - за O(|Q|).
+        """
+        if k < 0:
+            raise ValueError("Число повторений не может быть отрицательным")
+        level = 0
+        while k and state != MISSING:
+            while level >= len(self._levels):
+                previous = self._levels[-1]
+                self._levels.append([previous[s] for s in previous])
+            if k & 1:
+                state = self._levels[level][state]
+            k >>= 1
+            level += 1
+        return state
+
+    def output(self, state: int) -> str:
+        """Выходное слово при чтении v из state (кэшируется)"""
+        text = self._outputs.get(state)
+        if text is None:
+            _, outputs, _ = self.compiled.run(self.word, state)
+            text = self._outputs[state] = "".join("" if out is None else str(out) for out in outputs)
+        return text
+
+
+def eventual_behavior(compiled, prefix, word):
+    """
+    Предельное поведение на входе u·v^∞
+
+    Args:
+        compiled: CompiledAutomaton с начальным состоянием
+        prefix: Слово u (может быть пустым)
+        word: Повторяемое слово v
+
+    Returns:
+        dict:
+            halted - автомат остановился (нет перехода или символа в алфавите);
+            halt_step - номер символа входа, на котором это случилось;
+            prefix_blocks - число повторов v до входа в цикл (μ);
+            period_blocks - длина цикла в повторах v (λ);
+            cycle_states - состояния в начале каждого повтора v цикла;
+            prefix_output - выход на u·v^μ (при остановке - весь выход);
+            periodic_output - выход на одном обходе цикла (повторяется бесконечно)
+
+    Raises:
+        ValueError: нет начального состояния, пустое v или конфликт
+            выходов НКА при политике 'error'
+    """
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    power = WordPower(compiled, word)
+    prefix = compiled.tokenize(prefix) if isinstance(prefix, str) else prefix
+
+    state, outputs, processed = compiled.run(prefix)
+    prefix_output = "".join("" if out is None else str(out) for out in outputs)
+    result = {'halted': False, 'halt_step': None, 'prefix_blocks': 0, 'period_blocks': 0,
+              'cycle_states': [], 'prefix_output': prefix_output, 'periodic_output': ""}
+    if processed < len(prefix):
+        result.update(halted=True, halt_step=processed + 1)
+        return result
+
+    # Орбита состояний на границах повторов v
+    seen = {}
+    orbit = []
+    while state != MISSING and state not in seen:
+        seen[state] = len(orbit)
+        orbit.append(state)
+        state = power.apply(state)
+
+    if state == MISSING:
+        # v не дочитывается из последнего состояния орбиты
+        last = orbit[-1]
+        _, tail, steps = compiled.run(power.word, last)
+        result.update(
+            halted=True,
+            halt_step=len(prefix) + (len(orbit) - 1) * len(power.word) + steps + 1,
+            prefix_blocks=len(orbit) - 1,
+            prefix_output=prefix_output + "".join(power.output(s) for s in orbit[:-1])
+            + "".join("" if out is None else str(out) for out in tail)
+        )
+        return result
+
+    start = seen[state]
+    result.update(
+        prefix_blocks=start,
+        period_blocks=len(orbit) - start,
+        cycle_states=[compiled.states[s] for s in orbit[start:]],
+        prefix_output=prefix_output + "".join(power.output(s) for s in orbit[:start]),
+        periodic_output="".join(power.output(s) for s in orbit[start:])
+    )
+    return result
+
+
+def state_after(compiled, prefix, word, repeats):
+    """
+    Состояние после u·v^k (k может быть очень большим)
+
+    Returns:
+        int: Номер состояния снимка или MISSING, если автомат остановился
+    """
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    power = WordPower(compiled, word)
+    prefix = compiled.tokenize(prefix) if isinstance(prefix, str) else prefix
+    state, _, processed = compiled.run(prefix)
+    if processed < len(prefix):
+        return MISSING
+    return power.power(state, repeats)
@@ -0,0 +1,188 @@
+# Моделирование случайных блужданий методом Монте-Карло
+"""
+Модуль: random_walk.py
+Назначение: Много независимых "блуждающих" копий автомата, каждая читает
+случайный вход (символы выпадают с заданными вероятностями). Считаются
+посещаемость состояний, частоты выходов и время первого попадания в
+целевые состояния.
+
+С NumPy все копии продвигаются на шаг одной выборкой из плоской таблицы
+δ (номер состояния · |A| + номер символа), символы генерируются блоками
+шагов. Лишняя строка таблицы - состояние "остановился" (нет перехода),
+оно переходит само в себя, поэтому остановки не требуют проверок в
+цикле. Без NumPy работает тот же алгоритм на чистом Python (другой
+генератор случайных чисел - результаты совпадают статистически).
+
+Выход Мура выдаётся при входе в состояние, поэтому частоты выходов -
+посещаемость шагов 1..n, сгруппированная по выходу.
+"""
+
+import random
+
+from .compiled_automaton import MISSING
+from .word_counting import symbol_probabilities
+
+# Сколько случайных символов генерируется за раз (шаги · копии)
+_BLOCK_SIZE = 1 << 20
+
+
+def simulate_walks(compiled, walkers, steps, weights=None, targets=(), seed=None):
+    """
+    Прогнать walkers случайных блужданий по steps шагов
+
+    Args:
+        compiled: CompiledAutomaton с начальным состоянием
+            (SubsetAutomaton достраивается целиком)
+        walkers: Число независимых копий
+        steps: Число шагов каждой копии
+        weights: Веса входных символов {символ: вес} (None - равновероятно)
+        targets: Номера состояний снимка, время попадания в которые считается
+        seed: Начальное значение генератора (None - случайное)
+
+    Returns:
+        dict:
+            occupancy - число посещений по номерам состояний (шаги 1..n, все копии);
+            final     - распределение копий по состояниям после последнего шага;
+            halted    - сколько копий остановилось (нет перехода по символу);
+            outputs   - {выход: число выдач};
+            hitting   - {'hit': сколько копий попало в цель, 'times': число копий
+                        по шагу первого попадания (0 - начальное состояние)}
+                        или None, если targets пусто
+
+    Raises:
+        ValueError: нет начального состояния, неверные числа или веса
+    """
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    if walkers <= 0 or steps < 0:
+        raise ValueError("Нужны положительное число копий и неотрицательное число шагов")
+    if not compiled.deterministic:
+        compiled.expand_all()
+    probabilities = symbol_probabilities(compiled, weights)
+    if not probabilities:
+        raise ValueError("Входной алфавит пуст")
+    targets = set(targets)
+
+    numpy = _numpy()
+    run = _run_numpy if numpy is not None else _run_python
+    occupancy, final, first_hits = run(numpy, compiled, probabilities, walkers,
+                                       steps, targets, seed)
+
+    size = len(compiled.states)
+    outputs = {}
+    for state in range(size):
+        if occupancy[state]:
+            out = compiled.outputs[state]
+            outputs[out] = outputs.get(out, 0) + occupancy[state]
+    return {
+        'occupancy': occupancy[:size],
+        'final': final[:size],
+        'halted': final[size],
+        'outputs': outputs,
+        'hitting': {'hit': sum(first_hits), 'times': first_hits} if targets else None,
+    }
+
+
+def hitting_time_summary(times):
+    """
+    Среднее и медиана времени попадания по гистограмме 'times'
+
+    Returns:
+        dict: mean, median (None, если попаданий не было)
+    """
+    hit = sum(times)
+    if not hit:
+        return {'mean': None, 'median': None}
+    mean = sum(step * count for step, count in enumerate(times)) / hit
+    seen = 0
+    for step, count in enumerate(times):
+        seen += count
+        if 2 * seen >= hit:
+            return {'mean': mean, 'median': step}
+
+
+# === Внутренние функции ===
+
+def _numpy():
+    """Модуль numpy или None (необязательная зависимость)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _flat_table(compiled):
+    """Плоская δ с лишней строкой "остановился" (номер len(states))"""
+    size = len(compiled.states)
+    width = len(compiled.symbols)
+    table = []
+    for row in compiled.delta:
+        table.extend(size if target == MISSING else target for target in row)
+    table.extend([size] * width)
+    return table
+
+
+def _run_numpy(numpy, compiled, probabilities, walkers, steps, targets, seed):
+    size = len(compiled.states)
+    width = len(compiled.symbols)
+    table = numpy.array(_flat_table(compiled), dtype=numpy.intp)
+    rng = numpy.random.default_rng(seed)
+    # Символ - индекс в накопленных вероятностях (быстрее rng.choice с p)
+    cumulative = numpy.cumsum(probabilities)
+    cumulative[-1] = 1.0
+
+    state = numpy.full(walkers, compiled.initial, dtype=numpy.intp)
+    occupancy = numpy.zeros(size + 1, dtype=numpy.int64)
+    is_target = numpy.zeros(size + 1, dtype=bool)
+    is_target[list(targets)] = True
+    first_hit = numpy.full(walkers, -1, dtype=numpy.int64)
+    if targets:
+        first_hit[is_target[state]] = 0
+
+    block = max(1, _BLOCK_SIZE // walkers)
+    step = 0
+    while step < steps:
+        count = min(block, steps - step)
+        # u < 1 = cumulative[-1], поэтому номер символа всегда меньше width;
+        # символы с нулевой вероятностью не выпадают
+        symbols = numpy.searchsorted(cumulative, rng.random((count, walkers)), side='right')
+        for row in symbols:
+            step += 1
+            state = table[state * width + row]
+            # Строка символов больше не нужна - в ней остаются состояния шага,
+            # посещаемость считается одним bincount на блок, а не O(|Q|) на шаг
+            row[:] = state
+            if targets:
+                fresh = (first_hit < 0) & is_target[state]
+                first_hit[fresh] = step
+        occupancy += numpy.bincount(symbols.ravel(), minlength=size + 1)
+
+    final = numpy.bincount(state, minlength=size + 1)
+    hits = numpy.bincount(first_hit[first_hit >= 0], minlength=steps + 1) if targets else []
+    return occupancy.tolist(), final.tolist(), [int(h) for h in hits]
+
+
+def _run_python(numpy, compiled, probabilities, walkers, steps, targets, seed):
+    size = len(compiled.states)
+    width = len(compiled.symbols)
+    table = _flat_table(compiled)
+    rng = random.Random(seed)
+    symbols = range(width)
+
+    occupancy = [0] * (size + 1)
+    final = [0] * (size + 1)
+    hits = [0] * (steps + 1)
+    for _ in range(walkers):
+        state = compiled.initial
+        hit = state in targets
+        if hit:
+            hits[0] += 1
+        for step, a in enumerate(rng.choices(symbols, probabilities, k=steps), 1):
+            state = table[state * width + a]
+            occupancy[state] += 1
+            if not hit and state in targets:
+                hit = True
+                hits[step] += 1
+        final[state] += 1
+    return occupancy, final, hits if targets else []
@@ -0,0 +1,361 @@
+# Синхронизирующие, установочные и различающие последовательности
+"""
+Модуль: state_identification.py
+Назначение: Поиск входных слов, которые приводят автомат в известное
+состояние, по табличному снимку полного детерминированного автомата.
+
+    синхронизирующее слово - переводит любое состояние в одно и то же;
+    установочное (homing) - конечное состояние определяется по выходу;
+    различающее (preset) - начальное состояние определяется по выходу.
+
+Выход наблюдается после каждого шага (выход начального состояния не
+выдаётся, как в MooreAutomaton.process_word).
+
+Множества состояний - битовые маски int. Образ маски по символу
+собирается из таблиц по байтам маски, а не по одному биту. Точные
+поиски в ширину ограничены бюджетом (число узлов и время); при его
+исчерпании синхронизирующее слово строится жадным алгоритмом Эпштейна
+по парам состояний.
+
+Результат каждого поиска - словарь:
+    word     - список входных символов или None
+    status   - 'found', 'impossible' (слова не существует) или 'budget'
+    shortest - найдено заведомо кратчайшее слово
+"""
+
+import time
+from collections import deque
+
+from .compiled_automaton import MISSING
+
+# Бюджет точного поиска по умолчанию
+DEFAULT_MAX_NODES = 200000
+DEFAULT_TIME_LIMIT = 5.0
+
+# Разрядность куска маски в таблицах образов
+_CHUNK_BITS = 8
+
+
+def synchronizing_word(compiled, max_nodes=DEFAULT_MAX_NODES, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Синхронизирующее слово: кратчайшее (поиск по подмножествам), а если
+    бюджет исчерпан - жадное (алгоритм Эпштейна)
+
+    Существование проверяется заранее по графу пар: автомат
+    синхронизируем тогда и только тогда, когда сливается каждая пара.
+
+    Raises:
+        ValueError: если автомат не полный детерминированный
+    """
+    table = _Table(compiled)
+    merge = table.pair_merge_words()
+    if any(merge[p * table.size + q] is None
+           for p in range(table.size) for q in range(p + 1, table.size)):
+        return _result(None, 'impossible')
+
+    deadline = time.monotonic() + time_limit
+    full = (1 << table.size) - 1
+    # Кратчайшее слово: поиск в ширину от множества всех состояний
+    parent = {full: None}
+    queue = deque([full])
+    while queue:
+        mask = queue.popleft()
+        if mask & (mask - 1) == 0:
+            return _result(_unwind(parent, mask, table.symbols), 'found', shortest=True)
+        if len(parent) > max_nodes or time.monotonic() > deadline:
+            break
+        for a in range(len(table.symbols)):
+            image = table.image(mask, a)
+            if image not in parent:
+                parent[image] = (mask, a)
+                queue.append(image)
+
+    return _result(table.greedy_synchronizing(merge), 'found')
+
+
+def homing_sequence(compiled, max_nodes=DEFAULT_MAX_NODES, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Установочная последовательность (preset homing sequence)
+
+    Сначала точный поиск в ширину по разбиениям "текущие состояния при
+    одинаковом выходе"; при исчерпании бюджета - жадное построение:
+    пара состояний одного блока разделяется выходом или сливается
+    кратчайшим словом, пока все блоки не станут одноэлементными.
+
+    Raises:
+        ValueError: если автомат не полный детерминированный
+    """
+    table = _Table(compiled)
+    start = (table.full_mask(),)
+
+    def advance(blocks, a):
+        result = set()
+        for block in blocks:
+            result.update(table.split_image(block, a))
+        return tuple(sorted(result))
+
+    def done(blocks):
+        return all(block & (block - 1) == 0 for block in blocks)
+
+    word, status = _bfs(start, advance, done, len(table.symbols), max_nodes, time_limit)
+    if status == 'found':
+        return _result([table.symbols[a] for a in word], 'found', shortest=True)
+    if status == 'impossible':
+        return _result(None, 'impossible')
+    word = table.greedy_homing()
+    if word is None:
+        # Эквивалентные несливающиеся состояния: начав из них, автомат
+        # выдаёт одно и то же и не узнаёт, где оказался, - слова нет
+        return _result(None, 'impossible')
+    return _result(word, 'found')
+
+
+def distinguishing_sequence(compiled, max_nodes=DEFAULT_MAX_NODES, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Различающая последовательность (preset distinguishing sequence)
+
+    Поиск в ширину по разбиениям начальных состояний; узел - блоки
+    текущих состояний, в каждом блоке начальные состояния ещё не
+    различены. Ветвь отбрасывается, если два неразличённых состояния
+    сливаются. Задача PSPACE-полная, поэтому поиск ограничен бюджетом.
+
+    Raises:
+        ValueError: если автомат не полный детерминированный
+    """
+    table = _Table(compiled)
+    start = (table.full_mask(),)
+
+    def advance(blocks, a):
+        result = []
+        for block in blocks:
+            for image in table.split_image(block, a, injective=True):
+                if image is None:
+                    return None  # неразличённые состояния слились
+                result.append(image)
+        return tuple(sorted(result))
+
+    def done(blocks):
+        return all(block & (block - 1) == 0 for block in blocks)
+
+    word, status = _bfs(start, advance, done, len(table.symbols), max_nodes, time_limit)
+    if status == 'found':
+        return _result([table.symbols[a] for a in word], 'found', shortest=True)
+    return _result(None, status)
+
+
+# === Внутренние функции ===
+
+def _result(word, status, shortest=False):
+    return {'word': word, 'status': status, 'shortest': shortest}
+
+
+def _unwind(parent, node, symbols):
+    """Слово по цепочке родителей поиска в ширину"""
+    word = []
+    while parent[node] is not None:
+        node, a = parent[node]
+        word.append(symbols[a])
+    word.reverse()
+    return word
+
+
+def _bfs(start, advance, done, symbol_count, max_nodes, time_limit):
+    """
+    Поиск в ширину по узлам-разбиениям
+
+    Returns:
+        tuple: (номера символов или None, 'found' | 'impossible' | 'budget')
+    """
+    deadline = time.monotonic() + time_limit
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if done(node):
+            word = []
+            while parent[node] is not None:
+                node, a = parent[node]
+                word.append(a)
+            word.reverse()
+            return word, 'found'
+        if len(parent) > max_nodes or time.monotonic() > deadline:
+            return None, 'budget'
+        for a in range(symbol_count):
+            following = advance(node, a)
+            if following is not None and following not in parent:
+                parent[following] = (node, a)
+                queue.append(following)
+    return None, 'impossible'
+
+
+class _Table:
+    """Полная детерминированная таблица с битовыми образами множеств"""
+
+    def __init__(self, compiled):
+        if not compiled.deterministic:
+            raise ValueError("Нужен детерминированный автомат (сначала детерминизируйте)")
+        if any(MISSING in row for row in compiled.delta):
+            raise ValueError("Нужен полный автомат (дополните его стоком)")
+        if not compiled.states or not compiled.symbols:
+            raise ValueError("Автомат пуст")
+        self.size = len(compiled.states)
+        self.symbols = compiled.symbols
+        self.delta = compiled.delta
+        # Номер выхода каждого состояния (None - тоже выход)
+        output_ids = {}
+        self.output = [output_ids.setdefault(out, len(output_ids)) for out in compiled.outputs]
+        self.output_masks = [0] * len(output_ids)
+        for state, out in enumerate(self.output):
+            self.output_masks[out] |= 1 << state
+
+        self._chunks = None
+
+    @property
+    def chunks(self):
+        """chunks[a][k][b] - образ по символу a состояний 8k..8k+7 из байта b"""
+        if self._chunks is None:
+            self._chunks = self._build_chunks()
+        return self._chunks
+
+    def _build_chunks(self):
+        chunks = []
+        for a in range(len(self.symbols)):
+            per_symbol = []
+            for base in range(0, self.size, _CHUNK_BITS):
+                width = min(_CHUNK_BITS, self.size - base)
+                images = [0] * (1 << width)
+                for bits in range(1, 1 << width):
+                    low = bits & -bits
+                    images[bits] = images[bits ^ low] | (1 << self.delta[base + low.bit_length() - 1][a])
+                per_symbol.append(images)
+            chunks.append(per_symbol)
+        return chunks
+
+    def full_mask(self):
+        return (1 << self.size) - 1
+
+    def image(self, mask, a):
+        """Образ множества mask по символу a"""
+        result = 0
+        chunk = (1 << _CHUNK_BITS) - 1
+        for images in self.chunks[a]:
+            if mask & chunk:
+                result |= images[mask & chunk]
+            mask >>= _CHUNK_BITS
+            if not mask:
+                break
+        return result
+
+    def split_image(self, block, a, injective=False):
+        """
+        Образ блока по символу a, разбитый по выходу
+
+        При injective=True вместо блока, в котором два состояния слились,
+        возвращается None (для различающей последовательности).
+        """
+        image = self.image(block, a)
+        parts = [image & mask for mask in self.output_masks if image & mask]
+        if injective and bin(image).count("1") < bin(block).count("1"):
+            return [None]
+        return parts
+
+    def pair_merge_words(self):
+        """
+        Кратчайшие сливающие слова для всех пар (обратный поиск по графу пар)
+
+        Память O(|Q|²); длины слов сохраняются в self.distance.
+
+        Returns:
+            list: merge[p * size + q] = (a, следующая пара) для p != q,
+                (p, p) - конец слова, None - пара не сливается
+        """
+        size, delta = self.size, self.delta
+        inverse = [[[] for _ in range(size)] for _ in self.symbols]
+        for p in range(size):
+            for a, q in enumerate(delta[p]):
+                inverse[a][q].append(p)
+
+        merge = [None] * (size * size)
+        distance = [0] * (size * size)
+        queue = deque()
+        for p in range(size):
+            merge[p * size + p] = ()
+            queue.append((p, p))
+        while queue:
+            p, q = queue.popleft()
+            length = distance[p * size + q] + 1
+            for a, predecessors in enumerate(inverse):
+                for p0 in predecessors[p]:
+                    for q0 in predecessors[q]:
+                        key = p0 * size + q0
+                        if merge[key] is None:
+                            merge[key] = (a, p, q)
+                            merge[q0 * size + p0] = (a, q, p)
+                            distance[key] = distance[q0 * size + p0] = length
+                            queue.append((p0, q0))
+        self.distance = distance
+        return merge
+
+    def merge_word(self, merge, p, q):
+        word = []
+        while p != q:
+            a, p, q = merge[p * self.size + q]
+            word.append(a)
+        return word
+
+    def greedy_synchronizing(self, merge):
+        """Алгоритм Эпштейна: сливать ближайшую пару текущего множества"""
+        current = set(range(self.size))
+        word = []
+        while len(current) > 1:
+            states = sorted(current)
+            best = None
+            distance = self.distance
+            for i, p in enumerate(states):
+                row = p * self.size
+                for q in states[i + 1:]:
+                    if best is None or distance[row + q] < best[0]:
+                        best = (distance[row + q], p, q)
+            for a in self.merge_word(merge, best[1], best[2]):
+                word.append(a)
+                current = {self.delta[s][a] for s in current}
+        return [self.symbols[a] for a in word]
+
+    def separating_or_merging_word(self, p, q):
+        """Кратчайшее слово, после которого p и q дают разный выход или сливаются"""
+        parent = {(p, q): None}
+        queue = deque([(p, q)])
+        while queue:
+            pair = queue.popleft()
+            for a in range(len(self.symbols)):
+                p1, q1 = self.delta[pair[0]][a], self.delta[pair[1]][a]
+                if p1 == q1 or self.output[p1] != self.output[q1]:
+                    word = [a]
+                    while parent[pair] is not None:
+                        pair, b = parent[pair]
+                        word.append(b)
+                    word.reverse()
+                    return word
+                if (p1, q1) not in parent:
+                    parent[(p1, q1)] = (pair, a)
+                    queue.append((p1, q1))
+        return None
+
+    def greedy_homing(self):
+        """Жадная установочная последовательность или None"""
+        blocks = [self.full_mask()]
+        word = []
+        while True:
+            block = next((b for b in blocks if b & (b - 1)), None)
+            if block is None:
+                return [self.symbols[a] for a in word]
+            low = block & -block
+            rest = block ^ low
+            p = low.bit_length() - 1
+            q = (rest & -rest).bit_length() - 1
+            extension = self.separating_or_merging_word(p, q)
+            if extension is None:
+                return None  # эквивалентные состояния, которые не сливаются
+            for a in extension:
+                word.append(a)
+                blocks = list({part for b in blocks for part in self.split_image(b, a)})
@@ -0,0 +1,197 @@
+# Ленивая детерминизация
+"""
+Модуль: subset_automaton.py
+Назначение: Табличный снимок недетерминированного автомата Мура.
+Состояния таблицы - подмножества состояний исходного автомата (битовые
+маски int); они создаются только тогда, когда симуляция в них приходит.
+"""
+
+import threading
+
+from .compiled_automaton import CompiledAutomaton, MISSING, UNKNOWN
+from .tokenizer import Tokenizer
+
+# Как выбрать выход подмножества, если у его состояний разные выходы:
+#   'union' - все различные выходы в виде "{0,1}"
+#   'first' - выход первого (в порядке добавления) состояния подмножества
+#   'error' - ValueError при попадании в такое подмножество
+OUTPUT_POLICIES = ('union', 'first', 'error')
+
+
+class SubsetAutomaton(CompiledAutomaton):
+    """
+    Снимок НКА с построением подмножеств по требованию.
+
+    Интерфейс тот же, что у CompiledAutomaton, но таблица растёт: новая
+    строка δ заполняется значением UNKNOWN, а expand() вычисляет переход при
+    первом обращении и запоминает его. Одноэлементное подмножество называется
+    как исходное состояние, остальные - "{q1,q2}".
+    """
+
+    deterministic = False
+
+    def __init__(self, nfa_states, symbols, successors, nfa_outputs, initial_mask,
+                 output_policy='union', names=None):
+        """
+        Args:
+            nfa_states: Состояния исходного автомата (номер бита -> имя)
+            symbols: Входные символы (номер -> символ)
+            successors: successors[q][a] - маска состояний δ(q, a)
+            nfa_outputs: Выходы исходных состояний (или None)
+            initial_mask: Маска начального подмножества или None
+            output_policy: Одно из OUTPUT_POLICIES
+            names: Реестр имён автомата (InternTable) для state_name_ids
+        """
+        if output_policy not in OUTPUT_POLICIES:
+            raise ValueError(f"Неизвестная политика выходов: {output_policy}")
+        self._nfa_states = tuple(nfa_states)
+        self._successors = successors
+        self._nfa_outputs = tuple(nfa_outputs)
+        self._policy = output_policy
+        self._names = names
+        self._lock = threading.Lock()
+
+        self.symbols = tuple(symbols)
+        self.symbol_ids = {sym: i for i, sym in enumerate(self.symbols)}
+        self.tokenizer = Tokenizer(self.symbols)
+        # Таблица растёт в expand(); списки, а не кортежи
+        self.states = []
+        self.state_ids = {}
+        self.delta = []
+        self.outputs = []
+        self.state_name_ids = []
+        self.output_name_ids = []
+        self._masks = []
+        self._subset_ids = {}
+        self.initial = None if initial_mask is None else self._subset(initial_mask)
+
+    @classmethod
+    def from_automaton(cls, automaton, output_policy='union'):
+        states = list(automaton.states)
+        state_ids = {name: i for i, name in enumerate(states)}
+        symbols = []
+        symbol_ids = {}
+        for t in automaton.transitions:
+            if t.symbol not in symbol_ids:
+                symbol_ids[t.symbol] = len(symbols)
+                symbols.append(t.symbol)
+
+        successors = [[0] * len(symbols) for _ in states]
+        for t in automaton.transitions:
+            successors[state_ids[t.from_state]][symbol_ids[t.symbol]] |= 1 << state_ids[t.to_state]
+
+        outputs = [automaton.outputs.get(name) for name in states]
+        initial = state_ids.get(automaton.initial_state)
+        initial_mask = None if initial is None else 1 << initial
+        return cls(states, symbols, successors, outputs, initial_mask,
+                   output_policy, automaton.names)
+
+    # === Построение по требованию ===
+
+    def expand(self, state: int, a: int) -> int:
+        """Вычислить и запомнить δ(state, a) для подмножества state"""
+        with self._lock:
+            nxt = self.delta[state][a]
+            if nxt != UNKNOWN:
+                return nxt
+            target = 0
+            mask = self._masks[state]
+            successors = self._successors
+            while mask:
+                low = mask & -mask
+                target |= successors[low.bit_length() - 1][a]
+                mask ^= low
+            nxt = self._subset(target) if target else MISSING
+            self.delta[state][a] = nxt
+            return nxt
+
+    def expand_all(self) -> int:
+        """Построить все достижимые из начального подмножества; вернуть их число"""
+        state = 0
+        while state < len(self.states):
+            for a in range(len(self.symbols)):
+                if self.delta[state][a] == UNKNOWN:
+                    self.expand(state, a)
+            state += 1
+        return len(self.states)
+
+    def members(self, state: int):
+        """Исходные состояния подмножества"""
+        mask = self._masks[state]
+        return [name for i, name in enumerate(self._nfa_states) if mask >> i & 1]
+
+    def _subset(self, mask: int) -> int:
+        index = self._subset_ids.get(mask)
+        if index is not None:
+            return index
+
+        members = [i for i in range(mask.bit_length()) if mask >> i & 1]
+        if len(members) == 1:
+            name = self._nfa_states[members[0]]
+        else:
+            name = "{" + ",".join(str(self._nfa_states[i]) for i in members) + "}"
+        output = self._subset_output(name, [self._nfa_outputs[i] for i in members])
+
+        index = len(self.states)
+        self._subset_ids[mask] = index
+        self._masks.append(mask)
+        self.states.append(name)
+        self.state_ids[name] = index
+        self.delta.append([UNKNOWN] * len(self.symbols))
+        self.outputs.append(output)
+        if self._names is not None:
+            self.state_name_ids.append(self._names.intern(name))
+            self.output_name_ids.append(MISSING if output is None else self._names.intern(output))
+        return index
+
+    def _subset_output(self, name, outputs):
+        distinct = []
+        for output in outputs:
+            if output is not None and output not in distinct:
+                distinct.append(output)
+        if len(distinct) <= 1 or self._policy == 'first':
+            return distinct[0] if distinct else None
+        if self._policy == 'error':
+            raise ValueError(
+                f"Конфликт выходов в подмножестве {name}: {', '.join(map(str, distinct))}"
+            )
+        return "{" + ",".join(sorted(map(str, distinct))) + "}"
+
+    def __getstate__(self):
+        # Блокировка не переносится в рабочие процессы пакетного режима
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # === Симуляция ===
+
+    def translate(self, word, state=None):
+        if state is None:
+            state = self.initial
+        delta, symbol_ids = self.delta, self.symbol_ids
+        outputs = self.outputs
+        parts = []
+        processed = 0
+        for symbol in word:
+            a = symbol_ids.get(symbol)
+            if a is None:
+                break
+            nxt = delta[state][a]
+            if nxt == UNKNOWN:
+                nxt = self.expand(state, a)
+            if nxt == MISSING:
+                break
+            state = nxt
+            output = outputs[state]
+            if output is not None:
+                parts.append(str(output))
+            processed += 1
+        return "".join(parts), state, processed
+
+    def __repr__(self):
+        return (f"<SubsetAutomaton subsets={len(self.states)} of {len(self._nfa_states)} "
+                f"states, symbols={len(self.symbols)}>")
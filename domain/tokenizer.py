@@ -0,0 +1,189 @@
+# Разбиение входного слова на символы алфавита
+"""
+Модуль: tokenizer.py
+Назначение: Токенизатор входных слов для алфавитов с многосимвольными
+входными символами ("10", "start", ...).
+
+Символы алфавита хранятся в префиксном дереве (trie). По нему строится
+регулярное выражение той же формы, поэтому поиск самого длинного символа
+(longest match) выполняется внутри модуля re, а не циклом по буквам.
+"""
+
+# Ключ в узле trie, отмечающий конец символа алфавита
+_END = ""
+
+
+class Tokenizer:
+    """
+    Разбиение слова на символы алфавита по правилу самого длинного совпадения.
+
+    Если все символы односимвольные, слово не копируется: строка уже
+    является последовательностью своих символов.
+    Буква, с которой не начинается ни один символ алфавита, становится
+    отдельным токеном - симуляция сообщит о ней как о символе вне алфавита.
+    """
+
+    def __init__(self, symbols):
+        """
+        Args:
+            symbols: Входной алфавит (непустые строки)
+        """
+        self.symbols = tuple(sorted({str(s) for s in symbols if s}))
+        self.max_length = max(map(len, self.symbols), default=1)
+        self.single_char = self.max_length == 1
+        self._trie = self._build_trie(self.symbols)
+        self._pattern = None if self.single_char else self._compile_pattern(self._trie)
+
+    # === Разбиение ===
+
+    def split(self, word):
+        """
+        Разбить слово на токены
+
+        Returns:
+            Sequence[str]: Токены (для односимвольного алфавита - сама строка)
+        """
+        if self.single_char:
+            return word
+        return self._pattern.findall(word)
+
+    def iter_tokens(self, chunks):
+        """
+        Потоковое разбиение: слово поступает частями (например, блоками файла)
+
+        Токен, который может продолжиться в следующей части, задерживается
+        до её прихода, поэтому результат совпадает с split("".join(chunks)).
+        """
+        if self.single_char:
+            for chunk in chunks:
+                yield from chunk
+            return
+
+        match = self._pattern.match
+        # Токен, начатый не дальше чем за max_length до конца буфера, окончателен
+        reserve = self.max_length - 1
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            safe = len(buffer) - reserve
+            position = 0
+            while position < safe:
+                token = match(buffer, position).group()
+                yield token
+                position += len(token)
+            buffer = buffer[position:]
+        yield from self._pattern.findall(buffer)
+
+    def tokenize(self, word):
+        """
+        Строгое разбиение
+
+        Returns:
+            Tuple[List[str], Optional[int]]: (токены до ошибки, позиция буквы,
+                с которой не начинается ни один символ алфавита, или None)
+        """
+        known = set(self.symbols)
+        tokens = []
+        position = 0
+        for token in self.split(word):
+            if token not in known:
+                return tokens, position
+            tokens.append(token)
+            position += len(token)
+        return tokens, None
+
+    # === Однозначность ===
+
+    def prefix_free(self):
+        """
+        Ни один символ не является началом другого
+
+        Только для такого алфавита split() восстанавливает любое слово,
+        записанное слитно: однозначной декодируемости (ambiguity() is None)
+        мало - самое длинное совпадение может увести не в ту ветку.
+        """
+        # В отсортированном алфавите префикс стоит прямо перед продолжением
+        return not any(b.startswith(a) for a, b in zip(self.symbols, self.symbols[1:]))
+
+    def ambiguity(self):
+        """
+        Проверить однозначность разбиения (алгоритм Сардинаса-Паттерсона)
+
+        Returns:
+            tuple | None: Пара различных разбиений одной и той же строки или None, если
+            алфавит - однозначно декодируемый код. При неоднозначности
+            split() выбирает самое длинное совпадение, и слово, записанное
+            другим разбиением, может быть прочитано иначе.
+        """
+        if self.single_char:
+            return None
+
+        # Висячий суффикс d: "".join(top) == "".join(bottom) + d
+        queue = []
+        seen = {}
+        for u in self.symbols:
+            for v in self.symbols:
+                if u != v and u.startswith(v):
+                    dangling = u[len(v):]
+                    if dangling not in seen:
+                        seen[dangling] = ((u,), (v,))
+                        queue.append(dangling)
+
+        for dangling in queue:
+            top, bottom = seen[dangling]
+            for w in self.symbols:
+                if w == dangling:
+                    return top, bottom + (w,)
+                if w.startswith(dangling):
+                    # Нижняя строка обгоняет верхнюю: меняем их местами
+                    state = (w[len(dangling):], bottom + (w,), top)
+                elif dangling.startswith(w):
+                    state = (dangling[len(w):], top, bottom + (w,))
+                else:
+                    continue
+                if state[0] not in seen:
+                    seen[state[0]] = state[1:]
+                    queue.append(state[0])
+        return None
+
+    # === Внутренние методы ===
+
+    @staticmethod
+    def _build_trie(symbols):
+        root = {}
+        for symbol in symbols:
+            node = root
+            for char in symbol:
+                node = node.setdefault(char, {})
+            node[_END] = True
+        return root
+
+    @classmethod
+    def _compile_pattern(cls, trie):
+        # re нужен только многобуквенным алфавитам - не замедляем импорт domain
+        import re
+
+        # Любая буква после альтернативы из trie: неизвестный символ - отдельный токен
+        return re.compile(f"(?:{cls._trie_regex(trie)})|.", re.DOTALL)
+
+    @classmethod
+    def _trie_regex(cls, node):
+        """
+        Регулярное выражение по узлу trie
+
+        Продолжение символа записано жадным необязательным блоком, поэтому
+        при откате re сначала пробует самый длинный символ.
+        """
+        from re import escape
+
+        branches = []
+        for char in sorted(c for c in node if c != _END):
+            child = node[char]
+            rest = cls._trie_regex(child) if len(child) > (_END in child) else ""
+            if not rest:
+                branches.append(escape(char))
+            elif _END in child:
+                branches.append(f"{escape(char)}(?:{rest})?")
+            else:
+                branches.append(f"{escape(char)}(?:{rest})")
+        return "|".join(branches)
@@ -5,10 +5,15 @@
 """
 
 class Transition:
-    def __init__(self, from_state, to_state, symbol):
+    # Переходов бывают миллионы (AhoCorasickBuilder) - без __dict__
+    __slots__ = ('from_state', 'to_state', 'symbol', 'ids')
+
+    def __init__(self, from_state, to_state, symbol, ids=None):
         self.from_state = from_state
         self.to_state = to_state
         self.symbol = symbol
+        # Номера (from_state, symbol, to_state) в реестре имён автомата
+        self.ids = ids
 
     def __repr__(self):
         return f"{self.from_state} --{self.symbol}--> {self.to_state}"
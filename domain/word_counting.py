@@ -0,0 +1,264 @@
+# Подсчёт слов и распределения состояний
+"""
+Модуль: word_counting.py
+Назначение: Сколько входных слов длины n приводит в каждое состояние
+(точно, большими целыми или по модулю), распределение состояний при
+случайном входе с заданными весами символов и предельная доля времени
+в каждом состоянии.
+
+Всё считается по матрице переходов M[i][j] = число символов a с
+δ(i, a) = j: строка начального состояния M^n даёт ответ без перебора
+|A|^n слов. При малом n вектор умножается на M n раз (разреженно),
+при большом - возводится в степень квадрированием. NumPy используется,
+если установлен; без него работает чистый Python.
+"""
+
+# Целые числа в int64 без переполнения при умножении матриц
+_INT64_LIMIT = 1 << 62
+
+
+def count_words(compiled, length, modulus=None):
+    """
+    Число входных слов длины length по состоянию, в котором они заканчиваются
+
+    Args:
+        compiled: CompiledAutomaton с начальным состоянием
+            (SubsetAutomaton достраивается целиком)
+        length: Длина слов n >= 0
+        modulus: Считать по модулю (None - точные большие целые)
+
+    Returns:
+        tuple: (counts - список по номерам состояний снимка,
+                halted - число слов, на которых автомат остановился)
+    """
+    if length < 0:
+        raise ValueError("Длина слова не может быть отрицательной")
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    if not compiled.deterministic:
+        compiled.expand_all()
+
+    size = len(compiled.states)
+    rows = _weighted_rows(compiled, [1] * len(compiled.symbols))
+    start = [0] * size
+    start[compiled.initial] = 1
+    counts = _propagate(start, rows, length, modulus, exact=True)
+
+    total = pow(len(compiled.symbols), length, modulus) if modulus else len(compiled.symbols) ** length
+    halted = total - sum(counts)
+    return counts, halted % modulus if modulus else halted
+
+
+def state_distribution(compiled, length, weights=None):
+    """
+    Распределение состояния после length случайных символов
+
+    Args:
+        compiled: CompiledAutomaton с начальным состоянием
+        length: Число шагов
+        weights: Вес входного символа {символ: вес} (None - равновероятно);
+            веса нормируются
+
+    Returns:
+        tuple: (вероятности по номерам состояний снимка,
+                вероятность остановки - нет перехода по выпавшему символу)
+    """
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    if not compiled.deterministic:
+        compiled.expand_all()
+    rows = _weighted_rows(compiled, symbol_probabilities(compiled, weights))
+    start = [0.0] * len(compiled.states)
+    start[compiled.initial] = 1.0
+    distribution = _propagate(start, rows, length, None, exact=False)
+    return distribution, max(0.0, 1.0 - sum(distribution))
+
+
+def steady_state(compiled, weights=None, tolerance=1e-12, max_iterations=100000):
+    """
+    Предельная доля времени в каждом состоянии при случайном входе
+
+    Используется "ленивая" цепь (P + I) / 2: у неё те же стационарные
+    распределения, но она апериодична, поэтому степенной метод сходится
+    и для периодических автоматов (к среднему по Чезаро из начального
+    состояния).
+
+    Returns:
+        dict: distribution - вероятности по номерам состояний снимка,
+            halted - вероятность остановки, iterations, converged
+    """
+    if compiled.initial is None:
+        raise ValueError("Начальное состояние не задано")
+    if not compiled.deterministic:
+        compiled.expand_all()
+    rows = _weighted_rows(compiled, symbol_probabilities(compiled, weights))
+    size = len(compiled.states)
+    numpy = _numpy()
+
+    if numpy is not None:
+        matrix = numpy.zeros((size, size))
+        for i, row in enumerate(rows):
+            for j, weight in row:
+                matrix[i, j] += weight
+        lazy = (matrix + numpy.eye(size)) / 2
+        vector = numpy.zeros(size)
+        vector[compiled.initial] = 1.0
+        iterations, converged = 0, False
+        while iterations < max_iterations:
+            following = vector @ lazy
+            iterations += 1
+            change = float(numpy.abs(following - vector).sum())
+            vector = following
+            if change < tolerance:
+                converged = True
+                break
+        distribution = vector.tolist()
+    else:
+        distribution = [0.0] * size
+        distribution[compiled.initial] = 1.0
+        iterations, converged = 0, False
+        while iterations < max_iterations:
+            moved = _step(distribution, rows, None)
+            following = [(a + b) / 2 for a, b in zip(distribution, moved)]
+            iterations += 1
+            change = sum(abs(a - b) for a, b in zip(following, distribution))
+            distribution = following
+            if change < tolerance:
+                converged = True
+                break
+
+    return {'distribution': distribution, 'halted': max(0.0, 1.0 - sum(distribution)),
+            'iterations': iterations, 'converged': converged}
+
+
+def symbol_probabilities(compiled, weights=None):
+    """
+    Вероятности символов снимка в порядке compiled.symbols
+
+    Args:
+        weights: Вес входного символа {символ: вес} (None - равновероятно);
+            символы вне словаря получают вес 0, веса нормируются
+
+    Raises:
+        ValueError: отрицательный вес или нулевая сумма весов
+    """
+    if weights is None:
+        count = len(compiled.symbols)
+        return [1.0 / count] * count if count else []
+    values = [float(weights.get(symbol, 0.0)) for symbol in compiled.symbols]
+    if any(value < 0 for value in values):
+        raise ValueError("Веса символов не могут быть отрицательными")
+    total = sum(values)
+    if total <= 0:
+        raise ValueError("Сумма весов символов алфавита должна быть положительной")
+    return [value / total for value in values]
+
+
+# === Внутренние функции ===
+
+def _numpy():
+    """Модуль numpy или None (необязательная зависимость)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _weighted_rows(compiled, symbol_weights):
+    """Разреженные строки матрицы: [(j, суммарный вес символов i -> j), ...]"""
+    rows = []
+    for row in compiled.delta:
+        merged = {}
+        for a, target in enumerate(row):
+            if target >= 0 and symbol_weights[a]:
+                merged[target] = merged.get(target, 0) + symbol_weights[a]
+        rows.append(list(merged.items()))
+    return rows
+
+
+def _step(vector, rows, modulus):
+    """Один шаг vector · M по разреженным строкам"""
+    result = [0 * v for v in vector]
+    for i, value in enumerate(vector):
+        if value:
+            for j, weight in rows[i]:
+                result[j] += value * weight
+    if modulus:
+        result = [value % modulus for value in result]
+    return result
+
+
+def _propagate(vector, rows, steps, modulus, exact):
+    """vector · M^steps: n разреженных шагов или возведение в степень"""
+    size = len(vector)
+    edges = sum(len(row) for row in rows)
+    # n шагов стоят n·|δ|, квадрирование - около |Q|^3·log n
+    if steps * max(edges, 1) <= size ** 3 * max(steps.bit_length(), 1):
+        for _ in range(steps):
+            vector = _step(vector, rows, modulus)
+        return vector
+
+    numpy = _numpy()
+    if numpy is not None:
+        return _numpy_power(numpy, vector, rows, steps, modulus, exact)
+
+    matrix = [[0] * size for _ in range(size)]
+    for i, row in enumerate(rows):
+        for j, weight in row:
+            matrix[i][j] = weight
+    while steps:
+        if steps & 1:
+            vector = _vector_matrix(vector, matrix, modulus)
+        steps >>= 1
+        if steps:
+            matrix = _matrix_matrix(matrix, modulus)
+    return vector
+
+
+def _numpy_power(numpy, vector, rows, steps, modulus, exact):
+    size = len(vector)
+    if not exact:
+        dtype = numpy.float64
+    elif modulus:
+        # Сумма size произведений остатков
+        dtype = numpy.int64 if modulus * modulus * size < _INT64_LIMIT else object
+    else:
+        # Элементы M^k не больше (наибольшая сумма строки)^k, k <= steps
+        branching = max(sum(w for _, w in row) for row in rows)
+        bits = steps * (branching - 1).bit_length()
+        dtype = numpy.int64 if bits < _INT64_LIMIT.bit_length() - 1 else object
+    matrix = numpy.zeros((size, size), dtype=dtype)
+    for i, row in enumerate(rows):
+        for j, weight in row:
+            matrix[i, j] = weight
+    result = numpy.array(vector, dtype=dtype)
+    while steps:
+        if steps & 1:
+            result = result @ matrix
+            if modulus:
+                result %= modulus
+        steps >>= 1
+        if steps:
+            matrix = matrix @ matrix
+            if modulus:
+                matrix %= modulus
+    return [int(v) for v in result] if exact else result.tolist()
+
+
+def _vector_matrix(vector, matrix, modulus):
+    size = len(vector)
+    result = [0 * v for v in vector]
+    for i, value in enumerate(vector):
+        if value:
+            row = matrix[i]
+            for j in range(size):
+                if row[j]:
+                    result[j] += value * row[j]
+    if modulus:
+        result = [value % modulus for value in result]
+    return result
+
+
+def _matrix_matrix(matrix, modulus):
+    return [_vector_matrix(row, matrix, modulus) for row in matrix]
@@ -1,15 +1,20 @@
 # ============================================================================
 # main.py - Точка входа в приложение
 # ============================================================================
-import tkinter as tk
-from domain.finite_automaton import MooreAutomaton
-from services.automaton_service import AutomatonService
-from services.state_manager import StateManager
-from ui.main_window import MainWindow
+import argparse
+import sys
+from contextlib import ExitStack
 
 
 def main():
     """Главная функция приложения"""
+    # tkinter и ui импортируются только здесь: пакетный режим работает без дисплея
+    import tkinter as tk
+    from domain.finite_automaton import MooreAutomaton
+    from services.automaton_service import AutomatonService
+    from services.state_manager import StateManager
+    from ui.main_window import MainWindow
+
     # Создаём корневое окно
     root = tk.Tk()
     
@@ -28,7 +33,225 @@ def main():
     root.mainloop()
 
 
+def batch_main(args) -> int:
+    """Пакетный режим: слова из файла/stdin -> по строке результата на слово"""
+    from services.automaton_io import load_automaton
+    from services.batch_runner import run_batch
+
+    try:
+        automaton = load_automaton(args.automaton)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка загрузки автомата: {e}", file=sys.stderr)
+        return 2
+
+    buffer_size = 1 << 20
+    try:
+        with ExitStack() as files:
+            source = (files.enter_context(open(args.input, encoding="utf-8",
+                                               buffering=buffer_size))
+                      if args.input != "-" else sys.stdin)
+            sink = (files.enter_context(open(args.output, "w", encoding="utf-8",
+                                             buffering=buffer_size))
+                    if args.output != "-" else sys.stdout)
+            stats = run_batch(automaton.compile(), source, sink,
+                              workers=args.jobs, with_state=args.final_state)
+    except OSError as e:
+        print(f"Ошибка ввода-вывода: {e}", file=sys.stderr)
+        return 2
+
+    if args.stats:
+        print(stats.summary(), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+def periodic_main(args) -> int:
+    """Предельное поведение на входе u·v^∞ (и состояние после u·v^k)"""
+    from services.automaton_io import load_automaton
+    from services.automaton_service import AutomatonService
+
+    try:
+        service = AutomatonService(load_automaton(args.automaton))
+        result = service.analyze_periodic_input(args.prefix, args.word)
+        state = (service.state_after_repeats(args.prefix, args.word, args.repeats)
+                 if args.repeats is not None else None)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+
+    if result['halted']:
+        print(f"Остановка на символе {result['halt_step']}; выход: {result['prefix_output']}")
+    else:
+        print(f"Предпериод: {result['prefix_blocks']} повт. v, выход: {result['prefix_output']}")
+        print(f"Период: {result['period_blocks']} повт. v, "
+              f"состояния: {' '.join(map(str, result['cycle_states']))}")
+        print(f"Выход периода: {result['periodic_output']}")
+    if args.repeats is not None:
+        print(f"Состояние после u·v^{args.repeats}: {state if state is not None else 'остановка'}")
+    return 1 if result['halted'] else 0
+
+
+def sequences_main(args) -> int:
+    """Синхронизирующее, установочное и различающее слова автомата"""
+    from services.automaton_io import load_automaton
+    from services.automaton_service import AutomatonService
+
+    titles = {'synchronizing': "Синхронизирующее", 'homing': "Установочное",
+              'distinguishing': "Различающее"}
+    kinds = list(titles) if args.kind == "all" else [args.kind]
+    try:
+        service = AutomatonService(load_automaton(args.automaton))
+        for kind in kinds:
+            result = service.find_sequence(kind, time_limit=args.time_limit)
+            if result['word'] is None:
+                text = "не существует" if result['status'] == 'impossible' else "бюджет исчерпан"
+            else:
+                separator = "" if all(len(s) == 1 for s in result['word']) else " "
+                text = (f"{separator.join(result['word']) or 'ε'} (длина {len(result['word'])}"
+                        + (", кратчайшее)" if result['shortest'] else ")"))
+            print(f"{titles[kind]}: {text}")
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def suite_main(args) -> int:
+    """Тестовый набор (обход переходов, W или Wp) и, по желанию, ожидаемые выходы"""
+    from services.automaton_io import load_automaton
+    from services.automaton_service import AutomatonService
+    from services.batch_runner import run_batch
+
+    try:
+        if args.expected and args.output == "-" and not args.estimate:
+            raise ValueError("для --expected набор нужно записать в файл (-o)")
+        service = AutomatonService(load_automaton(args.automaton))
+        estimate = service.estimate_test_suite(args.method, args.extra_states)
+        print(f"Оценка: слов {estimate['words']}, символов {estimate['symbols']}, "
+              f"~{estimate['seconds']:.1f} с", file=sys.stderr)
+        if estimate['added_states']:
+            print(f"Автомат не минимален: к -k добавлено {estimate['added_states']} "
+                  f"(недостижимые и эквивалентные состояния)", file=sys.stderr)
+        if args.estimate:
+            return 0
+        target = sys.stdout if args.output == "-" else args.output
+        words, symbols = service.write_test_suite(target, args.method, args.extra_states)
+        print(f"Записано слов: {words}, символов: {symbols}"
+              + (f" -> {args.output}" if args.output != "-" else ""), file=sys.stderr)
+        if args.expected:
+            # Ожидаемые выходы - быстрым пакетным прогоном записанного набора
+            buffer_size = 1 << 20
+            with open(args.output, encoding="utf-8", buffering=buffer_size) as source, \
+                    open(args.expected, "w", encoding="utf-8", buffering=buffer_size) as sink:
+                stats = run_batch(service.automaton.compile(), source, sink, workers=args.jobs)
+            print(stats.summary(), file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def walk_main(args) -> int:
+    """Монте-Карло: посещаемость состояний, частоты выходов, время попадания"""
+    from services.automaton_io import load_automaton
+    from services.automaton_service import AutomatonService
+
+    try:
+        weights = None
+        if args.weights:
+            weights = {}
+            for item in args.weights.split(","):
+                symbol, _, weight = item.partition("=")
+                weights[symbol.strip()] = float(weight)
+        service = AutomatonService(load_automaton(args.automaton))
+        report = service.random_walks(args.walkers, args.steps, weights,
+                                      args.target, args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 2
+
+    visits = sum(report['by_state'].values()) or 1
+    print(f"Копий: {args.walkers}, шагов: {args.steps}, остановилось: {report['halted']}")
+    print("Посещаемость состояний:")
+    for state, count in sorted(report['by_state'].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {state}: {count / visits:.4f}")
+    print("Частоты выходов:")
+    for output, count in sorted(report['by_output'].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {'-' if output is None else output}: {count / visits:.4f}")
+    hitting = report['hitting']
+    if hitting is not None:
+        share = hitting['hit'] / args.walkers
+        print(f"Попадание в {', '.join(args.target)}: {share:.4f} копий", end="")
+        if hitting['hit']:
+            print(f", среднее время {hitting['mean']:.2f}, медиана {hitting['median']}")
+        else:
+            print()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Автомат Мура: окно или пакетная обработка")
+    commands = parser.add_subparsers(dest="command")
+
+    batch = commands.add_parser("batch", help="обработать слова без GUI")
+    batch.add_argument("automaton", help="файл автомата (.json или таблица 'q A B q2')")
+    batch.add_argument("-i", "--input", default="-", help="файл слов, по одному в строке (- = stdin)")
+    batch.add_argument("-o", "--output", default="-", help="файл результатов (- = stdout)")
+    batch.add_argument("-j", "--jobs", type=int, default=1, help="число процессов")
+    batch.add_argument("--final-state", action="store_true",
+                       help="добавлять конечное состояние через табуляцию")
+    batch.add_argument("--stats", action="store_true",
+                       help="вывести пропускную способность в stderr")
+
+    periodic = commands.add_parser("periodic", help="предельное поведение на входе u·v^∞")
+    periodic.add_argument("automaton", help="файл автомата (.json или таблица 'q A B q2')")
+    periodic.add_argument("word", help="повторяемое слово v")
+    periodic.add_argument("-u", "--prefix", default="", help="начальное слово u")
+    periodic.add_argument("-k", "--repeats", type=int,
+                          help="также вывести состояние после u·v^k")
+
+    sequences = commands.add_parser("sequences", help="синхронизирующее/установочное/различающее слово")
+    sequences.add_argument("automaton", help="файл автомата (.json или таблица 'q A B q2')")
+    sequences.add_argument("--kind", default="all",
+                           choices=["all", "synchronizing", "homing", "distinguishing"])
+    sequences.add_argument("--time-limit", type=float, default=5.0,
+                           help="бюджет точного поиска, с")
+
+    suite = commands.add_parser("suite", help="тестовый набор для проверки реализации")
+    suite.add_argument("automaton", help="файл автомата (.json или таблица 'q A B q2')")
+    suite.add_argument("-m", "--method", default="wp", choices=["tour", "w", "wp"],
+                       help="обход переходов, W- или Wp-метод")
+    suite.add_argument("-k", "--extra-states", type=int, default=0,
+                       help="сколько лишних состояний допускается в реализации (W/Wp)")
+    suite.add_argument("-o", "--output", default="-", help="файл слов, по одному в строке (- = stdout)")
+    suite.add_argument("--expected", help="также записать ожидаемые выходы (пакетный прогон)")
+    suite.add_argument("-j", "--jobs", type=int, default=1, help="число процессов для --expected")
+    suite.add_argument("--estimate", action="store_true",
+                       help="только оценить размер набора, не генерируя его")
+
+    walk = commands.add_parser("walk", help="случайные блуждания (Монте-Карло)")
+    walk.add_argument("automaton", help="файл автомата (.json или таблица 'q A B q2')")
+    walk.add_argument("-n", "--walkers", type=int, default=10000, help="число копий автомата")
+    walk.add_argument("-s", "--steps", type=int, default=100, help="число шагов каждой копии")
+    walk.add_argument("--weights", help="веса символов: 'a=0.7,b=0.3' (по умолчанию равные)")
+    walk.add_argument("-t", "--target", action="append", default=[],
+                      help="целевое состояние для времени попадания (можно несколько)")
+    walk.add_argument("--seed", type=int, help="начальное значение генератора")
+    walk.add_argument("--top", type=int, default=10, help="сколько строк показывать")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.command == "batch":
+        sys.exit(batch_main(arguments))
+    if arguments.command == "periodic":
+        sys.exit(periodic_main(arguments))
+    if arguments.command == "sequences":
+        sys.exit(sequences_main(arguments))
+    if arguments.command == "suite":
+        sys.exit(suite_main(arguments))
+    if arguments.command == "walk":
+        sys.exit(walk_main(arguments))
     main()
 
 # ============================================================================
@@ -37,7 +260,7 @@ if __name__ == "__main__":
 """
 project_avt/
 │
-├── main.py                          # ← Этот файл
+├── main.py                          # ← Этот файл (GUI или `main.py batch`)
 │
 ├── domain/                          # Бизнес-логика (Domain Layer)
 │   ├── __init__.py
@@ -5,10 +5,18 @@
 """
 Сервисный слой (Application Layer)
 Содержит бизнес-логику и управление состоянием приложения
+
+Не зависит от tkinter. Имена импортируются лениво (при первом обращении),
+чтобы короткие пакетные процессы не платили за неиспользуемые модули.
 """
 
-from .automaton_service import AutomatonService
-from .state_manager import StateManager
+from utils import lazy_exports
+
+_LAZY_EXPORTS = {
+    'AutomatonService': 'services.automaton_service',
+    'StateManager': 'services.state_manager',
+}
 
 __all__ = ['AutomatonService', 'StateManager']
 
+__getattr__ = lazy_exports(globals(), _LAZY_EXPORTS)
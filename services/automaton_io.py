@@ -0,0 +1,246 @@
+# ============================================================================
+# services/automaton_io.py
+# ============================================================================
+"""
+Загрузка и сохранение автомата в файлы
+Не зависит от UI: используется и окном, и пакетным режимом (main.py batch)
+
+Форматы:
+    JSON  - {"initial_state": "1", "transitions": [["1", "0", "1", "2"], ...]}
+            и необязательное поле "model": "moore" | "mealy"
+    Текст - по строке на переход "q(t) A B q(t+1)" (разделители: пробелы,
+            запятая, точка с запятой или табуляция); строка "initial q"
+            задаёт начальное состояние, строка "model mealy" - модель;
+            '#' начинает комментарий.
+            CSV читается этим же разборщиком, строка заголовка
+            "q(t),A,B,q(t+1)" пропускается
+
+Модель таблицы: в таблице Мура выход B - выход состояния q(t+1), в таблице
+Мили - выход ребра. Если модель не указана, таблица считается таблицей
+Мили, когда в одно состояние входят рёбра с разными B; такая таблица
+преобразуется в автомат Мура расщеплением состояний (mealy_to_moore).
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from domain.finite_automaton import MooreAutomaton
+from domain.mealy_automaton import MealyAutomaton, mealy_to_moore
+
+# Переход в формате полей EdgePanel: (q(t), A, B, q(t+1))
+TransitionRow = Tuple[str, str, str, str]
+
+_FIELD_SEPARATOR = re.compile(r"[\s,;]+")
+
+# Заголовок таблицы (подписи полей EdgePanel)
+_HEADER = ("q(t)", "a", "b", "q(t+1)")
+
+MODELS = ("moore", "mealy")
+
+
+class TransitionTable(NamedTuple):
+    """Прочитанная таблица переходов"""
+    rows: List[TransitionRow]
+    initial_state: Optional[str]
+    model: str  # 'moore' или 'mealy' (см. detect_model)
+
+
+def detect_model(rows: Iterable[TransitionRow]) -> str:
+    """
+    Модель таблицы без явного указания
+
+    Returns:
+        str: 'mealy', если в одно состояние входят рёбра с разными выходами
+            (как таблицу Мура её не загрузить без потерь), иначе 'moore'
+    """
+    outputs = {}
+    for _, _, output_sym, to_state in rows:
+        if outputs.setdefault(to_state, output_sym) != output_sym:
+            return "mealy"
+    return "moore"
+
+
+def _check_model(model) -> Optional[str]:
+    if model is None:
+        return None
+    model = str(model).lower()
+    if model not in MODELS:
+        raise ValueError(f"Неизвестная модель '{model}': ожидалось {' или '.join(MODELS)}")
+    return model
+
+
+def parse_transition_table(lines: Iterable[str]) -> TransitionTable:
+    """
+    Разобрать текстовую таблицу переходов
+
+    Returns:
+        TransitionTable: (переходы, начальное состояние, модель)
+
+    Raises:
+        ValueError: при строке с неверным числом полей или неизвестной модели
+    """
+    rows = []
+    initial_state = None
+    model = None
+    for line_number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        fields = _FIELD_SEPARATOR.split(line)
+        if len(fields) == 2 and fields[0].lower() == "initial":
+            initial_state = fields[1]
+        elif len(fields) == 2 and fields[0].lower() == "model":
+            model = _check_model(fields[1])
+        elif len(fields) == 4:
+            if not rows and tuple(f.lower() for f in fields) == _HEADER:
+                continue
+            rows.append(tuple(fields))
+        else:
+            raise ValueError(
+                f"Строка {line_number}: ожидалось 4 поля 'q(t) A B q(t+1)', получено {len(fields)}"
+            )
+    return TransitionTable(rows, initial_state, model or detect_model(rows))
+
+
+def build_automaton(rows: Iterable[TransitionRow],
+                    initial_state: Optional[str] = None) -> MooreAutomaton:
+    """
+    Построить автомат из переходов (без уведомлений UI)
+
+    Выход B присваивается конечному состоянию, как в StateManager.add_transition.
+    Если начальное состояние не задано, им становится начало первого перехода.
+    """
+    automaton = MooreAutomaton()
+    first_state = None
+    for from_state, input_sym, output_sym, to_state in rows:
+        automaton.add_state(from_state)
+        automaton.add_state(to_state, output=output_sym)
+        automaton.add_transition(from_state, to_state, input_sym)
+        if first_state is None:
+            first_state = from_state
+
+    initial_state = initial_state or first_state
+    if initial_state is not None:
+        automaton.set_initial_state(initial_state)
+    return automaton
+
+
+def moore_rows(table: TransitionTable) -> TransitionTable:
+    """
+    Таблица Мура с тем же поведением
+
+    Таблица Мили преобразуется расщеплением состояний (выходы рёбер
+    сохраняются), таблица Мура возвращается без изменений.
+    """
+    if table.model != "mealy":
+        return table
+    moore = mealy_to_moore(MealyAutomaton.from_rows(table.rows, table.initial_state))
+    return TransitionTable(list(iter_transition_rows(moore)), moore.get_initial_state(), "moore")
+
+
+def read_transition_rows(path) -> TransitionTable:
+    """
+    Прочитать переходы из файла (.json, .csv или текстовая таблица)
+
+    Returns:
+        TransitionTable: (переходы, начальное состояние, модель)
+
+    Raises:
+        ValueError: при ошибке формата
+        OSError: при ошибке чтения
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix.lower() == ".json":
+            data = json.load(f)
+            rows = [tuple(str(v) for v in row) for row in data.get("transitions", [])]
+            if any(len(row) != 4 for row in rows):
+                raise ValueError("Каждый переход в JSON должен содержать 4 поля")
+            initial_state = data.get("initial_state")
+            model = _check_model(data.get("model")) or detect_model(rows)
+            return TransitionTable(rows, None if initial_state is None else str(initial_state),
+                                   model)
+        return parse_transition_table(f)
+
+
+def load_automaton(path) -> MooreAutomaton:
+    """
+    Загрузить автомат из файла (.json, .csv или текстовая таблица)
+
+    Таблица Мили преобразуется в автомат Мура (см. moore_rows).
+
+    Raises:
+        ValueError: при ошибке формата
+        OSError: при ошибке чтения
+    """
+    rows, initial_state, _ = moore_rows(read_transition_rows(path))
+    return build_automaton(rows, initial_state)
+
+
+def read_patterns(path) -> List[str]:
+    """
+    Прочитать образцы для AhoCorasickBuilder: по одному в строке
+
+    Пустые строки пропускаются, пробелы внутри строки сохраняются.
+
+    Raises:
+        OSError: при ошибке чтения
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f.read().splitlines() if line]
+
+
+def write_words(words: Iterable[Sequence[str]], path) -> Tuple[int, int]:
+    """
+    Записать слова по одному в строке - входной файл для main.py batch
+
+    Символы слова пишутся подряд (пакетный режим разбивает строку по
+    алфавиту); запись потоковая, слова не собираются в памяти.
+
+    Args:
+        words: Слова (последовательности символов)
+        path: Путь к файлу или открытый текстовый поток (например, sys.stdout)
+
+    Returns:
+        Tuple[int, int]: (число слов, число символов)
+
+    Raises:
+        OSError: при ошибке записи
+    """
+    if hasattr(path, "write"):
+        return _write_word_lines(words, path)
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        return _write_word_lines(words, f)
+
+
+def _write_word_lines(words: Iterable[Sequence[str]], sink) -> Tuple[int, int]:
+    count = symbols = 0
+    for word in words:
+        sink.write("".join(word) + "\n")
+        count += 1
+        symbols += len(word)
+    sink.flush()
+    return count, symbols
+
+
+def iter_transition_rows(automaton: MooreAutomaton) -> Iterator[TransitionRow]:
+    """Переходы автомата в формате (q(t), A, B, q(t+1))"""
+    for from_state, input_sym, to_state in automaton.get_transitions():
+        yield from_state, input_sym, automaton.get_output(to_state, ""), to_state
+
+
+def save_automaton(automaton, path) -> None:
+    """Сохранить автомат Мура или Мили в JSON"""
+    if isinstance(automaton, MealyAutomaton):
+        rows, model = automaton.get_transitions(), "mealy"
+    else:
+        rows, model = iter_transition_rows(automaton), "moore"
+    data = {
+        "model": model,
+        "initial_state": automaton.get_initial_state(),
+        "transitions": [list(row) for row in rows]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
@@ -6,8 +6,23 @@
 Содержит валидацию, форматирование и бизнес-операции
 """
 
-from typing import Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+from domain.compiled_automaton import MISSING
 from domain.finite_automaton import MooreAutomaton
+from domain.periodic import eventual_behavior, state_after
+from domain.random_walk import hitting_time_summary, simulate_walks
+from domain.state_identification import (
+    distinguishing_sequence, homing_sequence, synchronizing_word
+)
+from domain.word_counting import count_words, state_distribution, steady_state
+from domain.graph_analysis import (
+    constant_output_states, reachable_states, strongly_connected_components, trap_states
+)
+from utils.validators import validate_edge
+
+
+# Максимальная длина блока шагов, повторы которого сворачиваются
+COMPRESS_MAX_PERIOD = 16
 
 
 class AutomatonService:
@@ -21,7 +36,8 @@ class AutomatonService:
         self.automaton = automaton
     
     def validate_transition(self, from_state: str, input_symbol: str, 
-                          output_symbol: str, to_state: str) -> Tuple[bool, str]:
+                          output_symbol: str, to_state: str,
+                          allow_nondeterministic: bool = False) -> Tuple[bool, str]:
         """
         Валидация перехода перед добавлением
         
@@ -30,6 +46,8 @@ class AutomatonService:
             input_symbol: Входной символ
             output_symbol: Выходной символ
             to_state: Конечное состояние
+            allow_nondeterministic: Разрешить второй переход по тому же (q, a)
+                в другое состояние
             
         Returns:
             Tuple[bool, str]: (is_valid, error_message)
@@ -38,13 +56,72 @@ class AutomatonService:
         if not all([from_state, input_symbol, output_symbol, to_state]):
             return False, "Все поля должны быть заполнены"
         
+        # Формат имён (без пробелов и разделителей таблицы переходов)
+        is_valid, error = validate_edge((from_state, input_symbol, output_symbol, to_state))
+        if not is_valid:
+            return False, error
+        
         # Проверка на дубликаты (для детерминированности)
-        existing = self.automaton.find_transition(from_state, input_symbol)
-        if existing:
+        if allow_nondeterministic:
+            if self.automaton.has_transition(from_state, input_symbol, to_state):
+                return False, (f"Переход из '{from_state}' по символу '{input_symbol}' "
+                               f"в '{to_state}' уже существует")
+        elif self.automaton.has_transition(from_state, input_symbol):
             return False, f"Переход из '{from_state}' по символу '{input_symbol}' уже существует"
         
         return True, ""
     
+    def validate_transitions(self, rows: Iterable[Tuple[str, str, str, str]],
+                             allow_nondeterministic: bool = False) -> List[str]:
+        """
+        Валидация пачки переходов за один проход
+        
+        Дубликаты ищутся по множеству ключей (q(t), A): и среди уже
+        существующих переходов, и внутри самой пачки. Кроме того, одному
+        конечному состоянию нельзя назначить в пачке разные выходы.
+        
+        Args:
+            rows: Переходы (q(t), A, B, q(t+1))
+            allow_nondeterministic: Ключ дубликата - (q(t), A, q(t+1)), а не (q(t), A)
+            
+        Returns:
+            List[str]: Все найденные ошибки (пустой список - пачка корректна)
+        """
+        errors = []
+        seen = set()
+        outputs = {}
+        for number, row in enumerate(rows, 1):
+            if len(row) != 4:
+                errors.append(f"Переход {number}: ожидалось 4 поля, получено {len(row)}")
+                continue
+            from_state, input_symbol, output_symbol, to_state = row
+            is_valid, error = validate_edge(row)
+            if not is_valid:
+                errors.append(f"Переход {number}: {error}")
+                continue
+            
+            if allow_nondeterministic:
+                key = (from_state, input_symbol, to_state)
+                exists = self.automaton.has_transition(from_state, input_symbol, to_state)
+            else:
+                key = (from_state, input_symbol)
+                exists = self.automaton.has_transition(from_state, input_symbol)
+            if key in seen or exists:
+                errors.append(
+                    f"Переход {number}: переход из '{from_state}' по символу "
+                    f"'{input_symbol}'" + (f" в '{to_state}'" if allow_nondeterministic else "")
+                    + " уже существует"
+                )
+            seen.add(key)
+            
+            previous = outputs.setdefault(to_state, output_symbol)
+            if previous != output_symbol:
+                errors.append(
+                    f"Переход {number}: состоянию '{to_state}' уже назначен "
+                    f"выход '{previous}', а не '{output_symbol}'"
+                )
+        return errors
+    
     def get_automaton_info(self) -> dict:
         """
         Получить полную информацию об автомате
@@ -53,56 +130,382 @@ class AutomatonService:
             dict: Словарь с информацией о состояниях, алфавитах и свойствах автомата
         """
         return {
-            'states': sorted(self.automaton.get_states()),
-            'input_alphabet': sorted(self.automaton.get_input_alphabet()),
-            'output_alphabet': sorted(self.automaton.get_output_alphabet()),
-            'transitions_count': len(self.automaton.get_transitions()),
+            # Отсортированные списки кэшируются автоматом до следующего изменения
+            'states': self.automaton.get_sorted_states(),
+            'input_alphabet': self.automaton.get_input_alphabet(),
+            'output_alphabet': self.automaton.get_output_alphabet(),
+            'transitions_count': self.automaton.get_transition_count(),
             'is_deterministic': self.automaton.is_deterministic(),
             'is_complete': self.automaton.is_complete(),
-            'has_initial_state': self.automaton.get_initial_state() is not None
+            'completeness': self.automaton.get_completeness(),
+            'has_initial_state': self.automaton.get_initial_state() is not None,
+            'symbol_ambiguity': self.automaton.get_symbol_ambiguity()
         }
     
-    def format_process_result(self, result: dict) -> str:
+    def analyze_periodic_input(self, prefix: str, word: str) -> dict:
+        """
+        Предельное поведение на входе u·v^∞ без пошаговой симуляции
+        
+        Args:
+            prefix: Слово u
+            word: Повторяемое слово v
+            
+        Returns:
+            dict: См. domain.periodic.eventual_behavior()
+            
+        Raises:
+            ValueError: нет начального состояния или пустое v
+        """
+        return eventual_behavior(self.automaton.compile(), prefix, word)
+    
+    def state_after_repeats(self, prefix: str, word: str, repeats: int) -> Optional[str]:
+        """
+        Состояние после u·v^k (двоичный подъём, k может быть огромным)
+        
+        Returns:
+            Optional[str]: Имя состояния или None, если автомат остановился
+        """
+        compiled = self.automaton.compile()
+        state = state_after(compiled, prefix, word, repeats)
+        return None if state == MISSING else compiled.states[state]
+    
+    # Поиск последовательности по виду (см. find_sequence)
+    SEQUENCE_FINDERS = {
+        'synchronizing': synchronizing_word,
+        'homing': homing_sequence,
+        'distinguishing': distinguishing_sequence,
+    }
+    
+    def find_sequence(self, kind: str, **budget) -> dict:
+        """
+        Синхронизирующее, установочное или различающее слово
+        
+        Args:
+            kind: 'synchronizing', 'homing' или 'distinguishing'
+            **budget: max_nodes, time_limit точного поиска
+            
+        Returns:
+            dict: word, status, shortest (см. domain.state_identification)
+            
+        Raises:
+            ValueError: неизвестный вид или автомат не полный детерминированный
+        """
+        finder = self.SEQUENCE_FINDERS.get(kind)
+        if finder is None:
+            raise ValueError(f"Неизвестный вид последовательности: {kind}")
+        return finder(self.automaton.compile(), **budget)
+    
+    def estimate_test_suite(self, method: str, extra_states: int = 0) -> dict:
+        """
+        Размер тестового набора до генерации
+        
+        Args:
+            method: 'tour', 'w' или 'wp' (см. domain.conformance)
+            extra_states: Сколько лишних состояний допускается в реализации
+            
+        Returns:
+            dict: words, symbols, seconds (оценка времени генерации),
+                added_states (см. domain.conformance.estimate_suite)
+        """
+        # Генераторы наборов нужны редко - не замедляют запуск окна
+        from domain.conformance import estimate_suite
+        return estimate_suite(self.automaton.compile(), method, extra_states)
+    
+    def write_test_suite(self, path, method: str, extra_states: int = 0) -> Tuple[int, int]:
+        """
+        Сгенерировать тестовый набор в файл или поток (слово на строку)
+        
+        Ожидаемые выходы для набора даёт пакетный режим:
+        main.py batch автомат -i набор -o ожидаемое
+        
+        Returns:
+            Tuple[int, int]: (число слов, число символов)
+            
+        Raises:
+            ValueError: автомат не подходит для метода или один символ
+                алфавита - начало другого (слитную запись пакетный режим
+                разобьёт по самому длинному совпадению иначе)
+            OSError: при ошибке записи
+        """
+        from domain.conformance import suite_words
+        from services.automaton_io import write_words
+
+        compiled = self.automaton.compile()
+        if not compiled.tokenizer.prefix_free():
+            raise ValueError("Один символ алфавита - начало другого: "
+                             "слитная запись слов набора будет прочитана иначе")
+        return write_words(suite_words(compiled, method, extra_states), path)
+    
+    def count_words(self, length: int, modulus: Optional[int] = None) -> dict:
+        """
+        Сколько входных слов длины n заканчивается в каждом состоянии
+        и с каким выходом (степень матрицы переходов, без перебора слов)
+        
+        Args:
+            length: Длина слов n
+            modulus: Считать по модулю (None - точно)
+            
+        Returns:
+            dict: by_state {состояние: число}, by_output {выход: число},
+                halted - слова, на которых автомат остановился
+        """
+        compiled = self.automaton.compile()
+        counts, halted = count_words(compiled, length, modulus)
+        return self._by_state_and_output(compiled, counts, modulus, halted=halted)
+    
+    def occupancy(self, weights: Optional[dict] = None,
+                  length: Optional[int] = None) -> dict:
+        """
+        Вероятности состояний и выходов при случайном входе
+        
+        Args:
+            weights: Веса входных символов {символ: вес} (None - равновероятно)
+            length: Число шагов; None - предельная доля времени (steady state)
+            
+        Returns:
+            dict: by_state, by_output, halted (+ iterations, converged для предела)
+        """
+        compiled = self.automaton.compile()
+        if length is None:
+            result = steady_state(compiled, weights)
+            report = self._by_state_and_output(compiled, result['distribution'])
+            report.update(halted=result['halted'], iterations=result['iterations'],
+                          converged=result['converged'])
+            return report
+        distribution, halted = state_distribution(compiled, length, weights)
+        return self._by_state_and_output(compiled, distribution, halted=halted)
+    
+    def random_walks(self, walkers: int, steps: int, weights: Optional[dict] = None,
+                     targets: Iterable[str] = (), seed: Optional[int] = None) -> dict:
+        """
+        Монте-Карло: много случайных блужданий сразу (векторно при NumPy)
+        
+        Args:
+            walkers: Число копий автомата
+            steps: Число шагов каждой копии
+            weights: Веса входных символов {символ: вес} (None - равновероятно)
+            targets: Состояния, время первого попадания в которые считается
+            seed: Начальное значение генератора случайных чисел
+            
+        Returns:
+            dict: by_state, by_output - число посещений (шаги 1..n, все копии),
+                final {состояние: копий в конце}, halted,
+                hitting - None или {hit, mean, median, times}
+                
+        Raises:
+            ValueError: неизвестное целевое состояние, неверные числа или веса
+        """
+        compiled = self.automaton.compile()
+        target_ids = []
+        for name in targets:
+            if name not in compiled.state_ids:
+                raise ValueError(f"Состояние '{name}' не существует")
+            target_ids.append(compiled.state_ids[name])
+        result = simulate_walks(compiled, walkers, steps, weights, target_ids, seed)
+        
+        hitting = result['hitting']
+        if hitting is not None:
+            hitting = dict(hitting, **hitting_time_summary(hitting['times']))
+        return self._by_state_and_output(
+            compiled, result['occupancy'],
+            final={compiled.states[i]: n for i, n in enumerate(result['final']) if n},
+            halted=result['halted'], hitting=hitting
+        )
+    
+    @staticmethod
+    def _by_state_and_output(compiled, values, modulus=None, **extra) -> dict:
+        """Значения по номерам состояний снимка -> по именам и по выходам"""
+        by_state = {}
+        by_output = {}
+        for state, value in enumerate(values):
+            if not value:
+                continue
+            by_state[compiled.states[state]] = value
+            output = compiled.outputs[state]
+            by_output[output] = by_output.get(output, 0) + value
+        if modulus:
+            by_output = {output: value % modulus for output, value in by_output.items()}
+        return {'by_state': by_state, 'by_output': by_output, **extra}
+    
+    def format_process_result(self, result: dict, **options) -> str:
         """
         Форматировать результат обработки слова для отображения
         
         Args:
             result: Результат обработки слова из automaton.process_word()
+            **options: Параметры iter_process_result_lines()
             
         Returns:
             str: Отформатированная строка для отображения пользователю
         """
+        return "".join(self.iter_process_result_lines(result, **options))
+    
+    def iter_process_result_lines(self, result: dict, step_ranges=None,
+                                  compress: bool = False,
+                                  output_limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Потоковое форматирование результата: строки (с '\n') по одной
+        
+        Args:
+            result: Результат обработки слова
+            step_ranges: Диапазоны индексов шагов [(start, stop), ...] для
+                оконного просмотра; пропущенные шаги заменяются одной строкой.
+                None - все шаги
+            compress: Сворачивать повторяющиеся блоки шагов
+            output_limit: Максимальная длина выводимого выходного слова
+                (середина заменяется многоточием); None - без ограничения
+            
+        Yields:
+            str: Очередная строка отчёта
+        """
+        steps = result['steps']
+        output_word = self._clip(result['output_word'], output_limit)
+        
         if not result['success']:
             # Форматирование ошибки
-            output = f"❌ ОШИБКА: {result['error']}\n"
-            output += "=" * 40 + "\n\n"
-            
-            if result['steps']:
-                output += "Выполненные шаги:\n"
-                for step in result['steps']:
-                    output += f"Шаг {step['step_number']}: "
-                    output += f"q={step['current_state']}, вход={step['input_symbol']} "
-                    output += f"→ выход={step['output_symbol']}, "
-                    output += f"q'={step['next_state']}\n"
-                output += f"\nЧастичный результат: {result['output_word']}\n"
-            return output
+            yield f"❌ ОШИБКА: {result['error']}\n"
+            yield "=" * 40 + "\n\n"
+            
+            if steps:
+                yield "Выполненные шаги:\n"
+                yield from self._iter_step_lines(steps, step_ranges, compress)
+                yield f"\nЧастичный результат: {output_word}\n"
+            if result.get('final_state') is not None:
+                yield f"Текущее состояние: {result['final_state']}\n"
+            return
         
         # Форматирование успешного результата
-        output = "✅ УСПЕШНАЯ ОБРАБОТКА\n"
-        output += "=" * 40 + "\n\n"
-        output += "Пошаговая обработка:\n"
+        yield "✅ УСПЕШНАЯ ОБРАБОТКА\n"
+        yield "=" * 40 + "\n\n"
+        yield "Пошаговая обработка:\n"
         
-        for step in result['steps']:
-            output += f"Шаг {step['step_number']}: "
-            output += f"q={step['current_state']}, вход={step['input_symbol']} "
-            output += f"→ выход={step['output_symbol']}, "
-            output += f"q'={step['next_state']}\n"
+        yield from self._iter_step_lines(steps, step_ranges, compress)
         
-        output += "\n" + "=" * 40 + "\n"
-        output += f"Выходное слово: {result['output_word']}\n"
-        output += f"Конечное состояние: {result['final_state']}\n"
+        yield "\n" + "=" * 40 + "\n"
+        yield f"Выходное слово: {output_word}\n"
+        yield f"Конечное состояние: {result['final_state']}\n"
+    
+    def write_process_result(self, result: dict, file, compress: bool = False) -> None:
+        """
+        Записать полную трассу в файл построчно, не собирая её в памяти
         
-        return output
+        Args:
+            result: Результат обработки слова
+            file: Путь или открытый текстовый файл
+            compress: Сворачивать повторяющиеся блоки шагов
+        """
+        lines = self.iter_process_result_lines(result, compress=compress)
+        if hasattr(file, 'write'):
+            file.writelines(lines)
+            return
+        with open(file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(lines)
+    
+    @staticmethod
+    def window_ranges(total: int, head: int = 0, tail: int = 0,
+                      around: Optional[int] = None, radius: int = 0) -> List[Tuple[int, int]]:
+        """
+        Диапазоны шагов для оконного просмотра
+        
+        Args:
+            total: Общее число шагов
+            head: Показать первые head шагов
+            tail: Показать последние tail шагов
+            around: Номер шага k (с 1), вокруг которого показать окно
+            radius: Сколько шагов показать до и после шага k
+            
+        Returns:
+            List[Tuple[int, int]]: Отсортированные непересекающиеся диапазоны
+        """
+        ranges = []
+        if head > 0:
+            ranges.append((0, min(head, total)))
+        if tail > 0:
+            ranges.append((max(0, total - tail), total))
+        if around is not None:
+            k = min(max(around - 1, 0), max(total - 1, 0))
+            ranges.append((max(0, k - radius), min(total, k + radius + 1)))
+        
+        merged = []
+        for start, stop in sorted(r for r in ranges if r[0] < r[1]):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+            else:
+                merged.append((start, stop))
+        return merged
+    
+    def _iter_step_lines(self, steps, step_ranges=None, compress: bool = False) -> Iterator[str]:
+        """Строки шагов с учётом окна и сжатия повторов"""
+        total = len(steps)
+        if step_ranges is None:
+            step_ranges = [(0, total)]
+        
+        position = 0
+        for start, stop in step_ranges:
+            if start > position:
+                yield f"  … пропущено шагов: {start - position} …\n"
+            if compress:
+                yield from self._iter_compressed_lines(steps, start, stop)
+            else:
+                for i in range(start, stop):
+                    yield self._format_step(steps[i])
+            position = stop
+        if position < total:
+            yield f"  … пропущено шагов: {total - position} …\n"
+    
+    def _iter_compressed_lines(self, steps, start: int, stop: int) -> Iterator[str]:
+        """
+        Строки шагов [start, stop) со сжатием повторов (run-length по блокам)
+        
+        Блок из p шагов (p <= COMPRESS_MAX_PERIOD), повторённый подряд r >= 2 раз,
+        выводится один раз и строкой-сводкой о числе повторов.
+        """
+        key = getattr(steps, 'step_key', None)
+        if key is None:
+            def key(index, steps=steps):
+                step = steps[index]
+                return (step['current_state'], step['input_symbol'], step['next_state'])
+        
+        i = start
+        while i < stop:
+            best_period, best_repeats = 0, 1
+            for period in range(1, min(COMPRESS_MAX_PERIOD, (stop - i) // 2) + 1):
+                repeats = 1
+                j = i + period
+                while j + period <= stop and all(
+                        key(j + d) == key(i + d) for d in range(period)):
+                    repeats += 1
+                    j += period
+                if repeats >= 2 and period * repeats > best_period * best_repeats:
+                    best_period, best_repeats = period, repeats
+            
+            if not best_period:
+                yield self._format_step(steps[i])
+                i += 1
+                continue
+            
+            for d in range(best_period):
+                yield self._format_step(steps[i + d])
+            first = i + best_period + 1
+            last = i + best_period * best_repeats
+            yield (f"  ↻ шаги {i + 1}–{i + best_period} повторяются ещё "
+                   f"×{best_repeats - 1} (шаги {first}–{last})\n")
+            i += best_period * best_repeats
+    
+    @staticmethod
+    def _clip(text: str, limit: Optional[int]) -> str:
+        """Сократить длинную строку до limit символов, сохранив начало и конец"""
+        if limit is None or len(text) <= limit:
+            return text
+        half = max(limit // 2, 1)
+        return f"{text[:half]}…({len(text) - 2 * half} симв.)…{text[-half:]}"
+    
+    @staticmethod
+    def _format_step(step: dict) -> str:
+        return (f"Шаг {step['step_number']}: "
+                f"q={step['current_state']}, вход={step['input_symbol']} "
+                f"→ выход={step['output_symbol']}, "
+                f"q'={step['next_state']}\n")
     
     def get_statistics(self) -> dict:
         """
@@ -112,6 +515,9 @@ class AutomatonService:
             dict: Статистические данные
         """
         info = self.get_automaton_info()
+        # Анализ графа: линейные обходы, кэш до следующего изменения автомата
+        components = strongly_connected_components(self.automaton)
+        has_initial = info['has_initial_state']
         
         return {
             'total_states': len(info['states']),
@@ -120,7 +526,15 @@ class AutomatonService:
             'output_alphabet_size': len(info['output_alphabet']),
             'is_deterministic': info['is_deterministic'],
             'is_complete': info['is_complete'],
-            'completeness_percentage': self._calculate_completeness()
+            'completeness_percentage': self._calculate_completeness(),
+            'missing_transitions': info['completeness']['missing'],
+            'reachable_states': len(reachable_states(self.automaton)) if has_initial else None,
+            'unreachable_states': (len(info['states']) - len(reachable_states(self.automaton))
+                                   if has_initial else None),
+            'scc_count': len(components),
+            'largest_scc_size': max(map(len, components), default=0),
+            'trap_states': sorted(trap_states(self.automaton)),
+            'constant_output_states': len(constant_output_states(self.automaton))
         }
     
     def _calculate_completeness(self) -> float:
@@ -130,19 +544,45 @@ class AutomatonService:
         Returns:
             float: Процент полноты (0.0 - 100.0)
         """
-        states = self.automaton.get_states()
-        alphabet = self.automaton.get_input_alphabet()
-        
-        if not states or not alphabet:
-            return 0.0
+        # Битовые маски символов по состояниям, один проход по индексу переходов
+        return self.automaton.get_completeness()['percentage']
+    
+    def format_missing_transitions(self, limit: int = 10) -> str:
+        """
+        Список незаданных клеток δ(q, a) для сообщения пользователю
         
-        total_needed = len(states) * len(alphabet)
-        existing = 0
+        Args:
+            limit: Сколько клеток перечислить
+        """
+        missing = self.automaton.get_completeness()['missing']
+        cells = [f"δ({state}, {symbol})"
+                 for state, symbol in self.automaton.get_missing_transitions(limit)]
+        text = f"Не задано переходов: {missing}\n" + ", ".join(cells)
+        if missing > len(cells):
+            text += ", …"
+        return text
+    
+    def completion_rows(self, sink: str = "sink",
+                        output: str = "-") -> List[Tuple[str, str, str, str]]:
+        """
+        Переходы, дополняющие автомат до полного стоковым состоянием
         
-        for state in states:
-            for symbol in alphabet:
-                if self.automaton.find_transition(state, symbol):
-                    existing += 1
+        Каждая незаданная клетка (q, a) ведёт в сток; сток переходит в себя
+        по всем символам алфавита.
         
-        return (existing / total_needed) * 100 if total_needed > 0 else 0.0
+        Args:
+            sink: Желаемое имя стока (при совпадении с состоянием добавляется ')
+            output: Выход стока
+            
+        Returns:
+            List[Tuple[str, str, str, str]]: Переходы (q(t), A, B, q(t+1));
+                пустой список, если автомат уже полный
+        """
+        missing = self.automaton.get_missing_transitions()
+        if not missing:
+            return []
+        sink = self.automaton.unused_state_name(sink)
+        rows = [(state, symbol, output, sink) for state, symbol in missing]
+        rows.extend((sink, symbol, output, sink) for symbol in self.automaton.get_input_alphabet())
+        return rows
 
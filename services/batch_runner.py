@@ -0,0 +1,131 @@
+# ============================================================================
+# services/batch_runner.py
+# ============================================================================
+"""
+Пакетная обработка слов без GUI
+Потоковое чтение слов (по одному в строке) и запись одной строки результата
+на слово; при workers > 1 - параллельно в нескольких процессах
+"""
+
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from domain.compiled_automaton import CompiledAutomaton
+
+# Сколько слов передаётся рабочему процессу за раз
+DEFAULT_CHUNK_SIZE = 2000
+
+
+@dataclass
+class BatchStats:
+    """Счётчики пакетного прогона"""
+    words: int = 0
+    symbols: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        seconds = self.seconds or 1e-9
+        return (f"слов: {self.words}, символов: {self.symbols}, ошибок: {self.errors}, "
+                f"время: {self.seconds:.3f} с, {self.words / seconds:,.0f} слов/с, "
+                f"{self.symbols / seconds:,.0f} символов/с")
+
+
+def process_word_line(compiled: CompiledAutomaton, word: str,
+                      with_state: bool = False) -> str:
+    """
+    Обработать одно слово и вернуть строку результата (без '\\n')
+
+    Формат: выходное слово [+ '\\t' + конечное состояние];
+    при ошибке - 'ERROR\\t<описание>'.
+    """
+    if compiled.initial is None:
+        return "ERROR\tНачальное состояние не задано"
+    word = compiled.tokenize(word)
+    try:
+        output, state, processed = compiled.translate(word)
+    except ValueError as e:  # конфликт выходов подмножества НКА
+        return f"ERROR\t{e}"
+    if processed < len(word):
+        symbol = word[processed]
+        if symbol not in compiled.symbol_ids:
+            return f"ERROR\tпозиция {processed}: символ '{symbol}' вне входного алфавита"
+        return f"ERROR\tпозиция {processed}: не найден переход δ({compiled.states[state]}, {symbol})"
+    if with_state:
+        return f"{output}\t{compiled.states[state]}"
+    return output
+
+
+def _iter_chunks(words: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(words)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Состояние рабочего процесса (задаётся инициализатором пула)
+_worker_compiled: Optional[CompiledAutomaton] = None
+_worker_with_state = False
+
+
+def _init_worker(compiled: CompiledAutomaton, with_state: bool) -> None:
+    global _worker_compiled, _worker_with_state
+    _worker_compiled = compiled
+    _worker_with_state = with_state
+
+
+def _process_chunk(words: List[str]) -> List[str]:
+    return [process_word_line(_worker_compiled, word, _worker_with_state) + "\n"
+            for word in words]
+
+
+def run_batch(compiled: CompiledAutomaton, source: TextIO, sink: TextIO,
+              workers: int = 1, with_state: bool = False,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchStats:
+    """
+    Обработать все слова из source и записать результаты в sink
+
+    Args:
+        compiled: Снимок автомата (MooreAutomaton.compile())
+        source: Текстовый поток со словами (по одному в строке)
+        sink: Текстовый поток для результатов (строка на слово, порядок сохраняется)
+        workers: Число процессов (1 - в текущем процессе)
+        with_state: Добавлять конечное состояние к результату
+        chunk_size: Размер пачки слов для записи/передачи в процесс
+
+    Returns:
+        BatchStats: Счётчики прогона
+    """
+    stats = BatchStats()
+    started = time.perf_counter()
+
+    def counted(lines):
+        for line in lines:
+            word = line.rstrip("\r\n")
+            stats.words += 1
+            stats.symbols += len(word)
+            yield word
+
+    chunks = _iter_chunks(counted(source), chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            results = [process_word_line(compiled, word, with_state) + "\n" for word in chunk]
+            stats.errors += sum(1 for r in results if r.startswith("ERROR\t"))
+            sink.writelines(results)
+    else:
+        from multiprocessing import Pool
+
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(compiled, with_state)) as pool:
+            for results in pool.imap(_process_chunk, chunks):
+                stats.errors += sum(1 for r in results if r.startswith("ERROR\t"))
+                sink.writelines(results)
+
+    sink.flush()
+    stats.seconds = time.perf_counter() - started
+    return stats
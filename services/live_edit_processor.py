@@ -1,7 +1,13 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set
+from domain.compiled_automaton import MISSING, UNKNOWN
 from domain.finite_automaton import MooreAutomaton
+from utils.validators import InputValidator
+
+# Номер для отсутствующего выхода в истории (совпадает с MISSING)
+NO_OUTPUT = MISSING
 
 @dataclass
 class LiveStep:
@@ -11,14 +17,45 @@ class LiveStep:
     next_state: str
     output_symbol: Optional[str]
 
+@dataclass
+class Breakpoints:
+    """Условия остановки: шаг пришёл в состояние, прочитал вход или выдал выход"""
+    states: Set[str] = field(default_factory=set)
+    input_symbols: Set[str] = field(default_factory=set)
+    output_symbols: Set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.states or self.input_symbols or self.output_symbols)
+
+def _breakpoint_hit(breakpoints: Breakpoints, state: str, symbol: str,
+                    output) -> Optional[str]:
+    """Описание сработавшего условия остановки для шага или None"""
+    if state in breakpoints.states:
+        return f"q = {state}"
+    if symbol in breakpoints.input_symbols:
+        return f"вход = {symbol}"
+    if output is not None and output in breakpoints.output_symbols:
+        return f"выход = {output}"
+    return None
+
 class LiveEditProcessor:
-    def __init__(self, automaton: MooreAutomaton) -> None:
+    def __init__(self, automaton: MooreAutomaton,
+                 validator: Optional[InputValidator] = None) -> None:
         self.automaton = automaton
+        self.validator = validator or InputValidator(automaton)
         self._word: str = ""
+        # Слово, разбитое на входные символы; указатель считает символы
+        self._tokens: Sequence[str] = ""
         self._pointer: int = 0
         self._active: bool = False
-        self._history: List[LiveStep] = []
         self._current_state: Optional[str] = None
+        self._start_state: Optional[str] = None
+        # История хранится в виде номеров реестра имён автомата
+        # (automaton.names): состояние после шага и выход шага
+        self._state_history = array('i')
+        self._output_history = array('i')
+        # Версия автомата, по которой посчитана записанная история
+        self._history_version = -1
 
     def start(self, word: str) -> dict:
         if not word:
@@ -26,13 +63,15 @@ class LiveEditProcessor:
         initial_state = self.automaton.get_initial_state()
         if initial_state is None:
             raise ValueError("Сначала задайте начальное состояние.")
-        alphabet = set(self.automaton.get_input_alphabet())
-        if any(ch not in alphabet for ch in word):
-            raise ValueError("Слово содержит символы вне входного алфавита.")
+        is_valid, error = self.validator.validate_word(word)
+        if not is_valid:
+            raise ValueError(f"{error}.")
         self._word = word
+        self._tokens = self.automaton.compile().tokenize(word)
         self._pointer = 0
-        self._history.clear()
+        self._clear_history()
         self._current_state = initial_state
+        self._start_state = initial_state
         self.automaton.current_state = initial_state
         self._active = True
         return self._build_status()
@@ -40,51 +79,289 @@ class LiveEditProcessor:
     def step(self) -> dict:
         if not self._active:
             raise ValueError("Live-режим не запущен.")
-        if self._pointer >= len(self._word):
+        if self._pointer >= len(self._tokens):
             self._active = False
             return self._build_status(finished=True)
 
-        symbol = self._word[self._pointer]
-        if self._current_state not in self.automaton.get_states():
+        if self._history_version != self.automaton.version:
+            self._discard_future()
+        if self._pointer < len(self._state_history):
+            # Шаг уже записан, автомат с тех пор не менялся - берём из истории
+            step_info = self.get_history(self._pointer, self._pointer + 1)[0]
+            return self._advance(step_info)
+
+        symbol = self._tokens[self._pointer]
+        # Таблица пересобирается только после изменения автомата
+        compiled = self.automaton.compile()
+        state = compiled.state_ids.get(self._current_state)
+        if state is None:
             self._active = False
             raise ValueError("Текущее состояние было удалено из автомата.")
 
-        transition = self.automaton.find_transition(self._current_state, symbol)
-        if transition is None:
+        nxt = compiled.next_state(state, symbol)
+        if nxt == MISSING:
             self._active = False
             raise ValueError(f"Не найден переход δ({self._current_state}, {symbol}).")
 
-        output_symbol = self.automaton.outputs.get(transition.to_state)
         step_info = LiveStep(
             step_number=self._pointer + 1,
             current_state=self._current_state,
             input_symbol=symbol,
-            next_state=transition.to_state,
-            output_symbol=output_symbol
+            next_state=compiled.states[nxt],
+            output_symbol=compiled.outputs[nxt]
         )
-        self._history.append(step_info)
+        self._state_history.append(compiled.state_name_ids[nxt])
+        self._output_history.append(compiled.output_name_ids[nxt])
+        self._history_version = self.automaton.version
+        return self._advance(step_info)
 
-        self._pointer += 1
-        self._current_state = transition.to_state
+    def run(self, max_steps: Optional[int] = None,
+            breakpoints: Optional[Breakpoints] = None) -> dict:
+        """
+        Выполнить несколько шагов в плотном цикле по таблице переходов
+
+        Останавливается после max_steps шагов, в конце слова, после шага,
+        удовлетворяющего точке останова, или на ошибке (тогда в статусе
+        заполнено поле "error", а live-режим завершается).
+
+        Returns:
+            dict: Статус с last_step, delta_output (выходы выполненных шагов),
+                steps_taken и breakpoint_hit
+        """
+        if not self._active:
+            raise ValueError("Live-режим не запущен.")
+
+        if self._history_version != self.automaton.version:
+            self._discard_future()
+        word = self._tokens
+        stop = len(word)
+        if max_steps is not None:
+            stop = min(stop, self._pointer + max_steps)
+        if breakpoints is not None and breakpoints.is_empty():
+            breakpoints = None
+
+        # Записанные шаги (после seek назад) проходятся по истории без симуляции
+        start = self._pointer
+        pointer, new_outputs, hit = self._replay(stop, breakpoints)
+
+        compiled = self.automaton.compile()
+        state = compiled.state_ids.get(self._state_at(pointer))
+        if state is None:
+            self._active = False
+            raise ValueError("Текущее состояние было удалено из автомата.")
+
+        delta, outputs, symbol_ids = compiled.delta, compiled.outputs, compiled.symbol_ids
+        names = compiled.states
+        state_hist, output_hist = compiled.state_name_ids, compiled.output_name_ids
+        state_history, output_history = self._state_history, self._output_history
+        error = None
+
+        while pointer < stop and hit is None:
+            symbol = word[pointer]
+            a = symbol_ids.get(symbol)
+            nxt = delta[state][a] if a is not None else MISSING
+            if nxt == UNKNOWN:
+                try:
+                    nxt = compiled.expand(state, a)
+                except ValueError as e:  # конфликт выходов подмножества
+                    error = f"{e}."
+                    break
+            if nxt == MISSING:
+                error = f"Не найден переход δ({names[state]}, {symbol})."
+                break
+
+            state_history.append(state_hist[nxt])
+            output_history.append(output_hist[nxt])
+            output = outputs[nxt]
+            if output is not None:
+                new_outputs.append(str(output))
+
+            state = nxt
+            pointer += 1
+
+            if breakpoints is not None:
+                hit = _breakpoint_hit(breakpoints, names[nxt], symbol, output)
+
+        last_step = self.get_history(pointer - 1, pointer)[0] if pointer > start else None
+
+        self._history_version = self.automaton.version
+        self._pointer = pointer
+        self._current_state = names[state]
         self.automaton.current_state = self._current_state
-        finished = self._pointer >= len(self._word)
-        if finished:
+        finished = pointer >= len(word)
+        if finished or error:
             self._active = False
-        return self._build_status(last_step=step_info, finished=finished)
+
+        status = self._build_status(last_step=last_step, finished=finished,
+                                    delta_output="".join(new_outputs))
+        status["steps_taken"] = pointer - start
+        status["breakpoint_hit"] = hit
+        status["error"] = error
+        return status
+
+    def seek(self, position: int) -> dict:
+        """
+        Перейти к позиции position (число обработанных входных символов) в обе стороны
+
+        Уже посчитанные шаги не пересчитываются: состояние на любом шаге берётся
+        из истории номеров за O(1). Если автомат изменился после записи истории,
+        шаги после текущей позиции отбрасываются. Переход дальше записанного
+        досчитывается через run().
+
+        Выходное слово меняется только на пройденном участке: при переходе
+        назад в статусе output_trim - сколько знаков убрать с конца, при
+        переходе вперёд delta_output - что дописать.
+
+        Returns:
+            dict: Статус с output_trim (0 при переходе вперёд)
+        """
+        if not self._tokens:
+            raise ValueError("Live-режим не запущен.")
+        position = max(0, min(position, len(self._tokens)))
+
+        if self._history_version != self.automaton.version:
+            self._discard_future()
+        recorded = len(self._state_history)
+
+        previous = self._pointer
+        target = min(position, recorded)
+        self._pointer = target
+        self._current_state = self._state_at(target)
+        self.automaton.current_state = self._current_state
+        self._active = target < len(self._tokens)
+
+        if position > recorded and self._active:
+            status = self.run(position - recorded)
+        else:
+            last_step = self.get_history(target - 1, target)[0] if target else None
+            status = self._build_status(last_step=last_step,
+                                        finished=target >= len(self._tokens))
+        status["output_trim"] = 0
+        if target < previous:
+            status["output_trim"] = len(self._output_between(target, previous))
+        elif target > previous:
+            status["delta_output"] = self._output_between(previous, target) + status["delta_output"]
+        return status
+
+    def step_back(self) -> dict:
+        """Вернуться на один символ назад"""
+        if self._pointer == 0:
+            raise ValueError("Начало слова: шагать назад некуда.")
+        return self.seek(self._pointer - 1)
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
 
     def reset(self) -> None:
         self._word = ""
+        self._tokens = ""
         self._pointer = 0
-        self._history.clear()
+        self._clear_history()
         self._current_state = None
+        self._start_state = None
         self._active = False
 
-    def _build_status(self, last_step: Optional[LiveStep] = None, finished: bool = False) -> dict:
+    def get_history(self, start: int = 0, stop: Optional[int] = None) -> List[LiveStep]:
+        """Шаги истории [start, stop) - восстанавливаются из номеров по запросу"""
+        length = len(self._state_history)
+        stop = self._pointer if stop is None else min(stop, length)
+        names = self.automaton.names
+        steps = []
+        for i in range(start, stop):
+            previous = self._start_state if i == 0 else names.name(self._state_history[i - 1])
+            output = self._output_history[i]
+            steps.append(LiveStep(
+                step_number=i + 1,
+                current_state=previous,
+                input_symbol=self._tokens[i],
+                next_state=names.name(self._state_history[i]),
+                output_symbol=None if output == NO_OUTPUT else names.name(output)
+            ))
+        return steps
+
+    def get_output_word(self) -> str:
+        """Выходное слово, накопленное к текущему шагу"""
+        return self._output_between(0, self._pointer)
+
+    def _output_between(self, start: int, stop: int) -> str:
+        """Выходы записанных шагов [start, stop)"""
+        names = self.automaton.names
+        return "".join(
+            str(names.name(i)) for i in self._output_history[start:stop] if i != NO_OUTPUT
+        )
+
+    def _state_at(self, position: int) -> Optional[str]:
+        """Состояние после position обработанных символов"""
+        if position == 0:
+            return self._start_state
+        return self.automaton.names.name(self._state_history[position - 1])
+
+    def _advance(self, step_info: LiveStep) -> dict:
+        """Сдвинуть указатель на один записанный шаг step_info"""
+        self._pointer += 1
+        self._current_state = step_info.next_state
+        self.automaton.current_state = self._current_state
+        finished = self._pointer >= len(self._tokens)
+        if finished:
+            self._active = False
+        output = step_info.output_symbol
+        return self._build_status(
+            last_step=step_info,
+            finished=finished,
+            delta_output="" if output is None else str(output)
+        )
+
+    def _replay(self, stop: int, breakpoints: Optional[Breakpoints]):
+        """
+        Пройти записанные шаги от указателя до stop (история действительна)
+
+        Returns:
+            tuple: (позиция, выходы пройденных шагов, сработавшая точка останова)
+        """
+        stop = min(stop, len(self._state_history))
+        pointer = self._pointer
+        if pointer >= stop:
+            return pointer, [], None
+        names = self.automaton.names
+        state_history, output_history = self._state_history, self._output_history
+        if breakpoints is None:
+            return stop, [str(names.name(i)) for i in output_history[pointer:stop]
+                          if i != NO_OUTPUT], None
+
+        new_outputs = []
+        hit = None
+        while pointer < stop and hit is None:
+            index = output_history[pointer]
+            output = None if index == NO_OUTPUT else names.name(index)
+            if output is not None:
+                new_outputs.append(str(output))
+            hit = _breakpoint_hit(breakpoints, names.name(state_history[pointer]),
+                                  self._tokens[pointer], output)
+            pointer += 1
+        return pointer, new_outputs, hit
+
+    def _discard_future(self) -> None:
+        """Отбросить записанные шаги после текущей позиции (перед новым проходом)"""
+        if len(self._state_history) > self._pointer:
+            del self._state_history[self._pointer:]
+            del self._output_history[self._pointer:]
+
+    def _clear_history(self) -> None:
+        self._state_history = array('i')
+        self._output_history = array('i')
+        self._history_version = self.automaton.version
+
+    def _build_status(self, last_step: Optional[LiveStep] = None, finished: bool = False,
+                      delta_output: str = "") -> dict:
+        # Только приращение: последний шаг и новые выходы; полная история - get_history()
         return {
             "word": self._word,
+            "length": len(self._tokens),
             "pointer": self._pointer,
             "current_state": self._current_state,
             "finished": finished,
             "last_step": last_step,
-            "history": list(self._history)
+            "delta_output": delta_output,
+            "history_length": self._pointer
         }
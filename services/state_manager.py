@@ -6,9 +6,14 @@
 Реализует паттерн Observer для уведомления UI об изменениях
 """
 
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Tuple
 from domain.finite_automaton import MooreAutomaton
-from services.live_edit_processor import LiveEditProcessor
+from domain.aho_corasick import AhoCorasickBuilder
+from domain.graph_analysis import prune_unreachable
+from services.automaton_service import AutomatonService
+from services.live_edit_processor import LiveEditProcessor, Breakpoints
+from services.transition_index import TransitionIndex
+from utils.validators import InputValidator
 
 
 class StateManager:
@@ -17,6 +22,9 @@ class StateManager:
     Уведомляет подписчиков об изменениях в автомате
     """
     
+    # Сколько ошибок пачки показывать в сообщении add_transitions()
+    MAX_REPORTED_ERRORS = 20
+    
     def __init__(self, automaton: MooreAutomaton):
         """
         Args:
@@ -24,7 +32,14 @@ class StateManager:
         """
         self.automaton = automaton
         self._observers = []
-        self.live_processor = LiveEditProcessor(automaton)
+        # Разрешены ли несколько переходов по одному (q, a) (недетерминированный автомат)
+        self.allow_nondeterministic = False
+        # Алфавит для проверки слов кэшируется по версии автомата
+        self.input_validator = InputValidator(automaton)
+        self.live_processor = LiveEditProcessor(automaton, self.input_validator)
+        # Индексы поиска обновляются первыми, до панелей UI
+        self.transition_index = TransitionIndex(automaton)
+        self.subscribe(self.transition_index)
     
     def subscribe(self, observer: Any) -> None:
         """
@@ -78,7 +93,7 @@ class StateManager:
         
         # 2. Добавляем сам переход (3 аргумента)
         try:
-            self.automaton.add_transition(from_state, to_state, input_symbol)
+            transition = self.automaton.add_transition(from_state, to_state, input_symbol)
         except ValueError as e:
             print(f"Ошибка при добавлении перехода: {e}")
             return # Не уведомлять, если переход не удался
@@ -88,9 +103,48 @@ class StateManager:
             'from_state': from_state,
             'input_symbol': input_symbol,
             'output_symbol': output_symbol,
-            'to_state': to_state
+            'to_state': to_state,
+            'transition': transition
         })
     
+    def add_transitions(self, rows: Iterable[Tuple[str, str, str, str]]) -> int:
+        """
+        Добавить пачку переходов атомарно с одним уведомлением
+        
+        Сначала вся пачка проверяется за один проход
+        (AutomatonService.validate_transitions); при любой ошибке автомат
+        не изменяется. Выход B, как и в add_transition, присваивается q(t+1).
+        
+        Args:
+            rows: Переходы (q(t), A, B, q(t+1))
+            
+        Returns:
+            int: Число добавленных переходов
+            
+        Raises:
+            ValueError: со списком всех ошибок пачки
+        """
+        rows = [tuple(row) for row in rows]
+        errors = AutomatonService(self.automaton).validate_transitions(
+            rows, self.allow_nondeterministic
+        )
+        if errors:
+            shown = errors[:self.MAX_REPORTED_ERRORS]
+            if len(errors) > len(shown):
+                shown.append(f"… и ещё ошибок: {len(errors) - len(shown)}")
+            raise ValueError(f"Найдено ошибок: {len(errors)}\n" + "\n".join(shown))
+        if not rows:
+            return 0
+        
+        transitions = []
+        for from_state, input_symbol, output_symbol, to_state in rows:
+            self.automaton.add_state(from_state)
+            self.automaton.add_state(to_state, output=output_symbol)
+            transitions.append(self.automaton.add_transition(from_state, to_state, input_symbol))
+        
+        self.notify('transitions_added', {'rows': rows, 'transitions': transitions})
+        return len(transitions)
+    
     def remove_transition(self, index: int) -> Any:
         """
         Удалить переход с уведомлением
@@ -137,6 +191,86 @@ class StateManager:
         self.automaton.set_initial_state(state)
         self.notify('initial_state_changed', state)
 
+    def set_output_policy(self, policy: str) -> None:
+        """
+        Задать выход подмножества состояний НКА с разными выходами
+
+        Raises:
+            ValueError: при неизвестной политике
+        """
+        self.automaton.set_output_policy(policy)
+        self.notify('output_policy_changed', policy)
+
+    def determinize(self) -> None:
+        """
+        Заменить автомат его детерминизацией (достижимые подмножества)
+
+        Raises:
+            ValueError: нет начального состояния или конфликт выходов
+                при политике 'error'
+        """
+        result = self.automaton.determinize()
+        self.live_processor.reset()
+        self.automaton.copy_from(result)
+        self.notify('state_restored', {'initial_state': result.get_initial_state()})
+
+    def prune_unreachable(self) -> int:
+        """
+        Удалить состояния, недостижимые из начального
+        
+        Returns:
+            int: Число удалённых состояний
+            
+        Raises:
+            ValueError: если не задано начальное состояние
+        """
+        result = prune_unreachable(self.automaton)
+        removed = len(self.automaton.states) - len(result.states)
+        if removed:
+            self.live_processor.reset()
+            self.automaton.copy_from(result)
+            self.notify('state_restored', {'initial_state': result.get_initial_state()})
+        return removed
+
+    def complete_with_sink(self, sink: str = "sink", output: str = "-") -> int:
+        """
+        Дополнить автомат до полного стоковым состоянием (одна пачка)
+        
+        Args:
+            sink: Имя стока
+            output: Выход стока
+            
+        Returns:
+            int: Число добавленных переходов (0 - автомат уже полный)
+        """
+        rows = AutomatonService(self.automaton).completion_rows(sink, output)
+        return self.add_transitions(rows)
+
+    def load_patterns(self, patterns: Iterable[str], alphabet: Iterable[str] = ()) -> int:
+        """
+        Заменить автомат автоматом поиска образцов (Ахо-Корасик)
+
+        Таблица строится целиком и загружается одной пачкой
+        (MooreAutomaton.load_table) с одним уведомлением.
+
+        Args:
+            patterns: Образцы; выход состояния - номера найденных образцов
+            alphabet: Дополнительные входные символы
+
+        Returns:
+            int: Число состояний построенного автомата
+
+        Raises:
+            ValueError: при пустом образце или пустом наборе
+        """
+        builder = AhoCorasickBuilder(alphabet)
+        if not builder.add_many(patterns):
+            raise ValueError("Не задано ни одного образца")
+        self.live_processor.reset()
+        builder.build(self.automaton)
+        self.notify('state_restored', {'initial_state': self.automaton.get_initial_state()})
+        return len(self.automaton.states)
+
     def get_state_snapshot(self) -> dict:
         """
         Получить снимок текущего состояния автомата
@@ -187,8 +321,7 @@ class StateManager:
             ("3", "1", "1", "1"),
             ("3", "0", "1", "3")
         ]
-        for from_state, input_sym, output_sym, to_state in default_edges:
-            self.add_transition(from_state, input_sym, output_sym, to_state)
+        self.add_transitions(default_edges)
         try:
             self.set_initial_state("1")
         except ValueError:
@@ -204,6 +337,30 @@ class StateManager:
         self.notify('live_edit_step', status)
         return status
 
+    def run_live_edit(self, max_steps: int = None, breakpoints: Breakpoints = None) -> dict:
+        """
+        Выполнить серию шагов live-режима с одним уведомлением
+
+        Args:
+            max_steps: Максимум шагов (None - до конца слова)
+            breakpoints: Точки останова
+        """
+        status = self.live_processor.run(max_steps, breakpoints)
+        self.notify('live_edit_step', status)
+        return status
+
+    def seek_live_edit(self, position: int) -> dict:
+        """Перейти к позиции position в live-режиме (вперёд или назад)"""
+        status = self.live_processor.seek(position)
+        self.notify('live_edit_step', status)
+        return status
+
+    def step_back_live_edit(self) -> dict:
+        """Шаг назад в live-режиме"""
+        status = self.live_processor.step_back()
+        self.notify('live_edit_step', status)
+        return status
+
     def reset_live_edit(self) -> None:
         self.live_processor.reset()
         self.notify('live_edit_reset')
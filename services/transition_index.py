@@ -0,0 +1,249 @@
+# ============================================================================
+# services/transition_index.py
+# ============================================================================
+"""
+Индексы переходов для поиска и фильтрации
+Поддерживаются инкрементально по событиям StateManager (Observer)
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set
+
+from domain.finite_automaton import MooreAutomaton
+from domain.transition import Transition
+
+
+# Поля, по которым возможен поиск (совпадают с полями формы EdgePanel)
+FILTER_FIELDS = ('from_state', 'input_symbol', 'output_symbol', 'to_state')
+
+
+class _PrefixIndex:
+    """Отображение ключ -> множество значений с поиском по префиксу ключа"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Set] = {}
+        self._keys: List[str] = []  # Отсортированные различные ключи
+
+    def add(self, key, value) -> None:
+        key = str(key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = set()
+            insort(self._keys, key)
+        bucket.add(value)
+
+    def add_many(self, pairs: Iterable) -> None:
+        """Добавить пары (ключ, значение); список ключей сортируется один раз"""
+        new_keys = []
+        for key, value in pairs:
+            key = str(key)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = set()
+                new_keys.append(key)
+            bucket.add(value)
+        if new_keys:
+            self._keys.extend(new_keys)
+            self._keys.sort()
+
+    def discard(self, key, value) -> None:
+        key = str(key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(value)
+        if not bucket:
+            del self._buckets[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def get(self, key) -> Set:
+        return self._buckets.get(str(key), set())
+
+    def prefix_keys(self, prefix: str) -> Iterable[str]:
+        """Ключи, начинающиеся с prefix (двоичный поиск по отсортированным ключам)"""
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix):
+            yield self._keys[i]
+            i += 1
+
+    def prefix_values(self, prefix: str) -> Set:
+        result = set()
+        for key in self.prefix_keys(prefix):
+            result |= self._buckets[key]
+        return result
+
+
+class _PresenceTree:
+    """
+    Дерево Фенвика над номерами добавления: 1 - переход ещё в автомате
+
+    Число живых переходов с меньшим номером - позиция перехода в
+    automaton.transitions (список сохраняет порядок добавления).
+    """
+
+    def __init__(self):
+        self._tree: List[int] = [0]  # Нумерация с 1
+
+    def extend(self, count: int) -> None:
+        """Добавить count живых номеров в конец за O(count + log n)"""
+        tree = self._tree
+        old = len(tree) - 1
+        new = old + count
+        tree.extend([1] * count)
+        # Узлы старой части, чей родитель попал в новую
+        i = old
+        while i:
+            parent = i + (i & -i)
+            if parent <= new:
+                tree[parent] += tree[i]
+            i -= i & -i
+        for i in range(old + 1, new + 1):
+            parent = i + (i & -i)
+            if parent <= new:
+                tree[parent] += tree[i]
+
+    def remove(self, number: int) -> None:
+        """Отметить номер number (с нуля) удалённым"""
+        tree = self._tree
+        i = number + 1
+        while i < len(tree):
+            tree[i] -= 1
+            i += i & -i
+
+    def count_before(self, number: int) -> int:
+        """Число живых номеров меньше number"""
+        tree = self._tree
+        total = 0
+        i = number
+        while i:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class TransitionIndex:
+    """
+    Индексы переходов по начальному/конечному состоянию, входному и выходному символу.
+
+    Выходной символ в автомате Мура принадлежит конечному состоянию, поэтому
+    для него индексируются состояния, а переходы находятся через индекс to_state.
+    Стоимость запроса пропорциональна числу найденных переходов, а не размеру автомата.
+    """
+
+    def __init__(self, automaton: MooreAutomaton):
+        """
+        Args:
+            automaton: Экземпляр конечного автомата
+        """
+        self.automaton = automaton
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Полностью перестроить индексы по текущему автомату"""
+        self._order: Dict[Transition, int] = {}
+        self._next_order = 0
+        self._present = _PresenceTree()
+        self._from = _PrefixIndex()
+        self._input = _PrefixIndex()
+        self._to = _PrefixIndex()
+        self._states_by_output = _PrefixIndex()
+        self._output_of: Dict[str, str] = {}
+
+        self._add_many(self.automaton.transitions)
+        for state, output in self.automaton.outputs.items():
+            self._set_output(state, output)
+
+    # === Обработчик событий (Observer) ===
+
+    def on_state_changed(self, event_type: str, data=None) -> None:
+        """Поддержать индексы в актуальном состоянии"""
+        if event_type == 'transition_added':
+            self._add(data['transition'])
+            self._set_output(data['to_state'], data['output_symbol'])
+        elif event_type == 'transitions_added':
+            self._add_many(data['transitions'])
+            for _, _, output_symbol, to_state in data['rows']:
+                self._set_output(to_state, output_symbol)
+        elif event_type == 'transition_removed':
+            self._remove(data['transition'])
+        elif event_type in ('cleared', 'state_removed', 'state_restored'):
+            self.rebuild()
+
+    # === Запросы ===
+
+    def search(self, prefix: str, field: str = None) -> List[Transition]:
+        """
+        Найти переходы, у которых значение поля начинается с prefix
+
+        Args:
+            prefix: Искомый префикс
+            field: Одно из FILTER_FIELDS или None (поиск по всем полям)
+
+        Returns:
+            List[Transition]: Найденные переходы в порядке их добавления
+        """
+        fields = FILTER_FIELDS if field is None else (field,)
+        found = set()
+        for name in fields:
+            if name == 'from_state':
+                found |= self._from.prefix_values(prefix)
+            elif name == 'input_symbol':
+                found |= self._input.prefix_values(prefix)
+            elif name == 'to_state':
+                found |= self._to.prefix_values(prefix)
+            elif name == 'output_symbol':
+                for state in self._states_by_output.prefix_values(prefix):
+                    found |= self._to.get(state)
+            else:
+                raise ValueError(f"Неизвестное поле фильтра: {name}")
+        return sorted(found, key=self._order.__getitem__)
+
+    def position(self, transition: Transition) -> int:
+        """
+        Индекс перехода в automaton.transitions за O(log n)
+
+        Raises:
+            KeyError: переход не проиндексирован (удалён)
+        """
+        return self._present.count_before(self._order[transition])
+
+    # === Внутренние методы ===
+
+    def _add(self, transition: Transition) -> None:
+        self._order[transition] = self._next_order
+        self._next_order += 1
+        self._present.extend(1)
+        self._from.add(transition.from_state, transition)
+        self._input.add(transition.symbol, transition)
+        self._to.add(transition.to_state, transition)
+
+    def _add_many(self, transitions: Iterable[Transition]) -> None:
+        # Ключи каждого индекса сортируются один раз на всю пачку
+        transitions = list(transitions)
+        for transition in transitions:
+            self._order[transition] = self._next_order
+            self._next_order += 1
+        self._present.extend(len(transitions))
+        self._from.add_many((t.from_state, t) for t in transitions)
+        self._input.add_many((t.symbol, t) for t in transitions)
+        self._to.add_many((t.to_state, t) for t in transitions)
+
+    def _remove(self, transition: Transition) -> None:
+        order = self._order.pop(transition, None)
+        if order is None:
+            return
+        self._present.remove(order)
+        self._from.discard(transition.from_state, transition)
+        self._input.discard(transition.symbol, transition)
+        self._to.discard(transition.to_state, transition)
+
+    def _set_output(self, state: str, output) -> None:
+        if output is None:
+            return
+        previous = self._output_of.get(state)
+        if previous == output:
+            return
+        if previous is not None:
+            self._states_by_output.discard(previous, state)
+        self._output_of[state] = output
+        self._states_by_output.add(output, state)
@@ -0,0 +1,141 @@
+# ============================================================================
+# services/word_processing.py
+# ============================================================================
+"""
+Фоновая обработка входного слова
+Выполняется в рабочем потоке по неизменяемому снимку автомата;
+UI опрашивает прогресс через after() и может отменить обработку
+"""
+
+import threading
+from typing import Callable, Optional
+
+from domain.compiled_automaton import CompiledAutomaton, StepTrace, MISSING, UNKNOWN
+
+
+class WordProcessingJob:
+    """
+    Обработка слова в отдельном потоке.
+
+    Поток читает только CompiledAutomaton, поэтому изменения автомата в UI
+    во время обработки на результат не влияют. Поля processed/done/result
+    записываются потоком и читаются UI-потоком при опросе.
+    """
+
+    # Как часто (в символах) проверять флаг отмены и обновлять прогресс
+    CHECK_INTERVAL = 4096
+
+    def __init__(self, compiled: CompiledAutomaton, word: str,
+                 formatter: Optional[Callable[[dict], str]] = None):
+        """
+        Args:
+            compiled: Снимок автомата (MooreAutomaton.compile())
+            word: Входное слово (разбивается на символы алфавита в потоке)
+            formatter: Функция форматирования результата, вызывается в потоке
+        """
+        self.compiled = compiled
+        self.word = word
+        self.formatter = formatter
+        # Прогресс считается в символах алфавита; их число известно только
+        # после разбиения слова в потоке (None - разбиение ещё идёт)
+        self.total: Optional[int] = None
+        self.processed = 0
+        self.done = False
+        self.cancelled = False
+        self.result: Optional[dict] = None
+        self.formatted: Optional[str] = None
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "WordProcessingJob":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Запросить остановку; частичный результат будет в result"""
+        self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Дождаться завершения (для пакетного режима); True если завершено"""
+        self._thread.join(timeout)
+        return self.done
+
+    @property
+    def progress(self) -> float:
+        """Доля обработанных символов (0.0 - 1.0)"""
+        if self.total is None:
+            return 0.0
+        return self.processed / self.total if self.total else 1.0
+
+    def _run(self) -> None:
+        try:
+            result = self._process()
+            if self.formatter is not None:
+                self.formatted = self.formatter(result)
+            self.result = result
+        except Exception as e:
+            self.result = {'success': False, 'error': str(e), 'steps': [],
+                           'output_word': "", 'final_state': None}
+            self.formatted = f"❌ ОШИБКА: {e}\n"
+        finally:
+            self.done = True
+
+    def _process(self) -> dict:
+        compiled = self.compiled
+        states, outputs = compiled.states, compiled.outputs
+        delta, symbol_ids = compiled.delta, compiled.symbol_ids
+        cancel_event = self._cancel_event
+        check_interval = self.CHECK_INTERVAL
+
+        # Многобуквенные символы выделяются здесь, а не в UI-потоке
+        word = compiled.tokenize(self.word)
+        self.total = len(word)
+
+        result = {'success': True, 'error': None, 'steps': [],
+                  'output_word': "", 'final_state': None}
+        if compiled.initial is None:
+            result.update(success=False, error="Начальное состояние не задано")
+            return result
+
+        # Трасса хранит только номера состояний, словари шагов создаются по запросу
+        trace = StepTrace(compiled, word)
+        result['steps'] = trace
+        visited = trace.states
+        output_chars = []
+        state = compiled.initial
+        visited.append(state)
+        for number, symbol in enumerate(word, 1):
+            if number % check_interval == 0:
+                self.processed = number - 1
+                if cancel_event.is_set():
+                    self.cancelled = True
+                    result['success'] = False
+                    result['error'] = f"Обработка отменена на шаге {number - 1} из {self.total}"
+                    break
+
+            a = symbol_ids.get(symbol)
+            nxt = delta[state][a] if a is not None else MISSING
+            if nxt == UNKNOWN:
+                # Недетерминированный автомат: подмножество строится при первом заходе
+                try:
+                    nxt = compiled.expand(state, a)
+                except ValueError as e:
+                    result['success'] = False
+                    result['error'] = str(e)
+                    break
+            if nxt == MISSING:
+                result['success'] = False
+                result['error'] = f"Не найден переход δ({states[state]}, {symbol})"
+                break
+
+            visited.append(nxt)
+            output_symbol = outputs[nxt]
+            if output_symbol is not None:
+                output_chars.append(str(output_symbol))
+            state = nxt
+
+        # И при ошибке или отмене - сколько символов действительно прочитано
+        self.processed = len(visited) - 1
+        result['output_word'] = "".join(output_chars)
+        result['final_state'] = states[state]
+        return result
@@ -4,18 +4,21 @@
 """
 UI Layer (Presentation Layer)
 Содержит все компоненты пользовательского интерфейса
+
+Имена импортируются лениво (при первом обращении), чтобы модули без
+tkinter (diagram_scene, diagram_export) можно было использовать без дисплея.
 """
 
-from .main_window import MainWindow
-from .graph_drawing import GraphCanvas
+from utils import lazy_exports
 
-# Импортируем панели
-from .panels import (
-    BasePanel,
-    EdgePanel,
-    AnalysisPanel,
-    VisualizationPanel
-)
+_LAZY_EXPORTS = {
+    'MainWindow': 'ui.main_window',
+    'GraphCanvas': 'ui.graph_drawing',
+    'BasePanel': 'ui.panels',
+    'EdgePanel': 'ui.panels',
+    'AnalysisPanel': 'ui.panels',
+    'VisualizationPanel': 'ui.panels',
+}
 
 __all__ = [
     'MainWindow',
@@ -26,3 +29,4 @@ __all__ = [
     'VisualizationPanel'
 ]
 
+__getattr__ = lazy_exports(globals(), _LAZY_EXPORTS)
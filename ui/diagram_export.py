@@ -0,0 +1,193 @@
+# ============================================================================
+# ui/diagram_export.py - Экспорт диаграммы в SVG/PNG без дисплея
+# ============================================================================
+"""
+Модуль: diagram_export.py
+Назначение: Отрисовка DiagramScene в SVG (чистый Python) и в PNG
+(через Pillow, если он установлен). Не импортирует tkinter и не требует
+дисплея, поэтому подходит для пакетной отрисовки на серверах и в CI.
+"""
+
+import math
+from pathlib import Path
+from html import escape
+
+from ui.diagram_scene import (
+    ArcItem, LineItem, OvalItem, TextItem, DiagramScene,
+    build_automaton_scene, text_lines, font_size, font_is_bold
+)
+
+# Межстрочный интервал многострочных меток (доля от размера шрифта)
+LINE_SPACING = 1.3
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _svg_points(points) -> str:
+    return " ".join(f"{_fmt(x)},{_fmt(y)}" for x, y in points)
+
+
+def _arc_endpoint(item: ArcItem, angle_deg: float):
+    """Точка дуги для угла в системе tk (против часовой, ось Y вниз)"""
+    x0, y0, x1, y1 = item.bbox
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+    rad = math.radians(angle_deg)
+    return cx + rx * math.cos(rad), cy - ry * math.sin(rad)
+
+
+def _svg_item(item) -> str:
+    if isinstance(item, ArcItem):
+        x0, y0, x1, y1 = item.bbox
+        rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+        sx, sy = _arc_endpoint(item, item.start)
+        ex, ey = _arc_endpoint(item, item.start + item.extent)
+        large = 1 if abs(item.extent) > 180 else 0
+        sweep = 1 if item.extent < 0 else 0
+        return (f'<path d="M {_fmt(sx)} {_fmt(sy)} A {_fmt(rx)} {_fmt(ry)} 0 '
+                f'{large} {sweep} {_fmt(ex)} {_fmt(ey)}" fill="none" '
+                f'stroke="{item.outline}" stroke-width="{item.width}"/>')
+
+    if isinstance(item, LineItem):
+        x1, y1, x2, y2 = item.points
+        if item.arrow:
+            # Линия заканчивается у шейки стрелки, как в tkinter
+            x2, y2 = item.arrow_polygon()[2]
+        parts = [f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" '
+                 f'y2="{_fmt(y2)}" stroke="{item.fill}" stroke-width="{item.width}"/>']
+        if item.arrow:
+            parts.append(f'<polygon points="{_svg_points(item.arrow_polygon())}" '
+                         f'fill="{item.fill}"/>')
+        return "".join(parts)
+
+    if isinstance(item, OvalItem):
+        x0, y0, x1, y1 = item.bbox
+        return (f'<ellipse cx="{_fmt((x0 + x1) / 2)}" cy="{_fmt((y0 + y1) / 2)}" '
+                f'rx="{_fmt((x1 - x0) / 2)}" ry="{_fmt((y1 - y0) / 2)}" '
+                f'fill="{item.fill}" stroke="{item.outline}" '
+                f'stroke-width="{item.width}"/>')
+
+    if isinstance(item, TextItem):
+        size = font_size(item)
+        lines = text_lines(item)
+        weight = ' font-weight="bold"' if font_is_bold(item) else ""
+        first_y = item.y - (len(lines) - 1) * size * LINE_SPACING / 2
+        tspans = "".join(
+            f'<tspan x="{_fmt(item.x)}" y="{_fmt(first_y + i * size * LINE_SPACING)}">'
+            f'{escape(line)}</tspan>'
+            for i, line in enumerate(lines)
+        )
+        return (f'<text font-family="{escape(str(item.font[0]))}" '
+                f'font-size="{size}"{weight} fill="{item.fill}" '
+                f'text-anchor="middle" dominant-baseline="central">{tspans}</text>')
+
+    raise TypeError(f"Неизвестный примитив сцены: {item!r}")
+
+
+def scene_to_svg(scene: DiagramScene, background: str = "white") -> str:
+    """
+    Отрисовать сцену в SVG-документ
+
+    Args:
+        scene: Сцена из SceneBuilder.build()
+        background: Цвет фона (None - прозрачный)
+
+    Returns:
+        str: Текст SVG
+    """
+    width, height = _fmt(scene.width), _fmt(scene.height)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}">'
+    ]
+    if background:
+        parts.append(f'<rect width="100%" height="100%" fill="{background}"/>')
+    parts.extend(_svg_item(item) for item in scene.items)
+    parts.append('</svg>')
+    return "\n".join(parts) + "\n"
+
+
+def _load_font(size: int, bold: bool):
+    from PIL import ImageFont
+
+    name = "DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf"
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def scene_to_png(scene: DiagramScene, background: str = "white") -> bytes:
+    """
+    Растеризовать сцену в PNG
+
+    Raises:
+        RuntimeError: если Pillow не установлен
+    """
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError as exc:
+        raise RuntimeError(
+            "Для экспорта в PNG требуется пакет Pillow (pip install pillow)"
+        ) from exc
+    import io
+
+    image = Image.new("RGBA", (int(math.ceil(scene.width)), int(math.ceil(scene.height))),
+                      background or (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    fonts = {}
+
+    for item in scene.items:
+        if isinstance(item, ArcItem):
+            # Pillow отсчитывает углы по часовой стрелке и рисует от start к end
+            first, second = -item.start, -(item.start + item.extent)
+            if item.extent > 0:
+                first, second = second, first
+            draw.arc(item.bbox, first, second, fill=item.outline, width=item.width)
+        elif isinstance(item, LineItem):
+            x1, y1, x2, y2 = item.points
+            if item.arrow:
+                polygon = item.arrow_polygon()
+                draw.line((x1, y1) + polygon[2], fill=item.fill, width=item.width)
+                draw.polygon(polygon, fill=item.fill)
+            else:
+                draw.line(item.points, fill=item.fill, width=item.width)
+        elif isinstance(item, OvalItem):
+            draw.ellipse(item.bbox, fill=item.fill, outline=item.outline,
+                         width=item.width)
+        elif isinstance(item, TextItem):
+            key = (font_size(item), font_is_bold(item))
+            if key not in fonts:
+                fonts[key] = _load_font(*key)
+            draw.multiline_text((item.x, item.y), item.text, fill=item.fill,
+                                font=fonts[key], anchor="mm", align="center")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def export_scene(scene: DiagramScene, path) -> Path:
+    """
+    Сохранить сцену в файл; формат выбирается по расширению (.svg/.png)
+
+    Raises:
+        ValueError: при неподдерживаемом расширении
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".svg":
+        path.write_text(scene_to_svg(scene), encoding="utf-8")
+    elif suffix == ".png":
+        path.write_bytes(scene_to_png(scene))
+    else:
+        raise ValueError(f"Неподдерживаемый формат экспорта: '{path.suffix}'")
+    return path
+
+
+def export_automaton(automaton, path, width=500, height=500) -> Path:
+    """Отрисовать автомат в файл SVG/PNG без создания окна Tk"""
+    return export_scene(build_automaton_scene(automaton, width, height), path)
@@ -0,0 +1,314 @@
+# ============================================================================
+# ui/diagram_scene.py - Геометрия диаграммы без привязки к tkinter
+# ============================================================================
+"""
+Модуль: diagram_scene.py
+Назначение: Строит описание диаграммы Мура (узлы, петли, рёбра, стрелки,
+метки) в виде списка примитивов. Сцену затем отрисовывает любой бэкенд:
+tk.Canvas (GraphCanvas), SVG или PNG (diagram_export).
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# Форма стрелки в терминах tkinter: (d1, d2, d3)
+ARROW_SHAPE = (12, 15, 5)
+
+LOOP_COLOR = "#FF9800"
+EDGE_COLOR = "#2196F3"
+EDGE_LABEL_COLOR = "#1E88E5"
+
+
+@dataclass
+class ArcItem:
+    """Дуга окружности (углы в градусах, как в tk.Canvas.create_arc)"""
+    bbox: Tuple[float, float, float, float]
+    start: float
+    extent: float
+    outline: str
+    width: int
+    tags: str = ""
+
+
+@dataclass
+class LineItem:
+    """Отрезок; при arrow=True в конечной точке рисуется стрелка"""
+    points: Tuple[float, float, float, float]
+    fill: str
+    width: int
+    arrow: bool = False
+    arrow_shape: Tuple[int, int, int] = ARROW_SHAPE
+    tags: str = ""
+
+    def arrow_polygon(self) -> List[Tuple[float, float]]:
+        """Вершины наконечника стрелки (та же геометрия, что у tkinter)"""
+        return arrowhead_polygon(*self.points, self.arrow_shape)
+
+
+@dataclass
+class OvalItem:
+    """Эллипс, вписанный в bbox"""
+    bbox: Tuple[float, float, float, float]
+    fill: str
+    outline: str
+    width: int
+    tags: str = ""
+
+
+@dataclass
+class TextItem:
+    """Текст, центрированный в точке (x, y)"""
+    x: float
+    y: float
+    text: str
+    font: Tuple
+    fill: str
+    tags: str = ""
+
+
+@dataclass
+class DiagramScene:
+    """Набор примитивов в порядке отрисовки (первые оказываются снизу)"""
+    width: float
+    height: float
+    items: list = field(default_factory=list)
+
+
+def arrowhead_polygon(x1, y1, x2, y2, shape=ARROW_SHAPE):
+    """
+    Вычислить наконечник стрелки в точке (x2, y2)
+
+    Args:
+        x1, y1, x2, y2: Начало и конец линии
+        shape: (d1, d2, d3) - как параметр arrowshape у tk.Canvas
+
+    Returns:
+        list: Четыре вершины многоугольника: острие, крыло, шейка, крыло
+    """
+    d1, d2, d3 = shape
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return [(x2, y2)] * 4
+    ux, uy = dx / length, dy / length
+    px, py = -uy, ux
+    return [
+        (x2, y2),
+        (x2 - ux * d2 + px * d3, y2 - uy * d2 + py * d3),
+        (x2 - ux * d1, y2 - uy * d1),
+        (x2 - ux * d2 - px * d3, y2 - uy * d2 - py * d3),
+    ]
+
+
+def edges_from_automaton(automaton, states=None):
+    """
+    Собрать 4-элементные кортежи (from, input, output, to) для отрисовки
+
+    Выход {B} берётся из КОНЕЧНОГО состояния (логика Мура).
+
+    Args:
+        automaton: Экземпляр MooreAutomaton
+        states: Рисуемые состояния (None - все); рёбра из остальных пропускаются
+    """
+    outputs = automaton.get_outputs()
+    keep = None if states is None else set(states)
+    return [
+        (from_state, input_sym, outputs.get(to_state, '?'), to_state)
+        for from_state, input_sym, to_state in automaton.get_transitions()
+        if keep is None or from_state in keep
+    ]
+
+
+class SceneBuilder:
+    """Расчёт геометрии диаграммы Мура/Мили"""
+
+    def __init__(self, width=500, height=400, node_radius=25):
+        self.width = width
+        self.height = height
+        self.node_radius = node_radius
+        self.node_positions = {}
+
+    def calculate_positions(self, nodes):
+        """Рассчитать позиции узлов по кругу"""
+        self.node_positions = {}
+        n = len(nodes)
+
+        if n == 0:
+            return
+
+        # Центр холста
+        center_x = self.width / 2
+        center_y = self.height / 2
+
+        # Радиус круга для размещения узлов
+        radius = min(self.width, self.height) * 0.35
+
+        if n == 1:
+            # Один узел в центре
+            self.node_positions[nodes[0]] = (center_x, center_y)
+        else:
+            # Размещаем узлы по кругу
+            for i, node in enumerate(nodes):
+                angle = 2 * math.pi * i / n - math.pi / 2  # Начинаем сверху
+                x = center_x + radius * math.cos(angle)
+                y = center_y + radius * math.sin(angle)
+                self.node_positions[node] = (x, y)
+
+    def edge_items(self, node1, node2, phi, psi):
+        """Примитивы ребра с меткой (phi/psi) между узлами"""
+        if node1 not in self.node_positions or node2 not in self.node_positions:
+            return []
+
+        x1, y1 = self.node_positions[node1]
+        x2, y2 = self.node_positions[node2]
+        r = self.node_radius
+
+        label_text = f"({phi}, {psi})"
+
+        if node1 == node2:
+            # === ПЕТЛЯ (A -> A): дуга над узлом ===
+            loop_r = r * 1.5
+
+            # Центр Bounding Box, смещенный ВВЕРХ на 1.5R
+            x_center_bbox = x1
+            y_center_bbox = y1 - loop_r
+
+            bbox = (x_center_bbox - loop_r, y_center_bbox - loop_r,
+                    x_center_bbox + loop_r, y_center_bbox + loop_r)
+
+            # Дуга от 225 градусов на 270 градусов по часовой стрелке
+            arc = ArcItem(bbox, start=225, extent=-270,
+                          outline=LOOP_COLOR, width=2, tags="edge")
+
+            # Стрелка в точке входа на окружность узла (135 градусов)
+            entry_angle_rad = 135 * math.pi / 180
+            entry_x = x1 + r * math.cos(entry_angle_rad)
+            entry_y = y1 + r * math.sin(entry_angle_rad)
+
+            # Точка на дуге, предшествующая входу (140 градусов от центра BBox)
+            arc_point_angle_rad = 140 * math.pi / 180
+            arc_x = x_center_bbox + loop_r * math.cos(arc_point_angle_rad)
+            arc_y = y_center_bbox + loop_r * math.sin(arc_point_angle_rad)
+
+            arrow = LineItem((arc_x, arc_y, entry_x, entry_y), fill=LOOP_COLOR,
+                             width=2, arrow=True, tags="edge_arrow")
+
+            # Метка справа от петли, на уровне ее "вершины"
+            label = TextItem(x1 + loop_r * 1.5, y1 - r * 1.5, label_text,
+                             font=("Arial", 9, "bold"), fill=LOOP_COLOR,
+                             tags="edge_label")
+            return [arc, arrow, label]
+
+        # === ОБЫЧНОЕ НАПРАВЛЕННОЕ РЕБРО (A -> B) ===
+        dx = x2 - x1
+        dy = y2 - y1
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist == 0:
+            return []
+
+        # Концы отрезка смещены от центров узлов на радиус
+        x_start = x1 + dx * r / dist
+        y_start = y1 + dy * r / dist
+        x_end = x2 - dx * r / dist
+        y_end = y2 - dy * r / dist
+
+        line = LineItem((x_start, y_start, x_end, y_end), fill=EDGE_COLOR,
+                        width=2, arrow=True, tags="edge")
+
+        # Метка в середине ребра, смещённая перпендикулярно линии
+        mid_x = (x1 + x2) / 2
+        mid_y = (y1 + y2) / 2
+        angle = math.atan2(y2 - y1, x2 - x1)
+        offset = 15
+        label = TextItem(mid_x + offset * math.sin(angle),
+                         mid_y - offset * math.cos(angle),
+                         label_text, font=("Arial", 9, "bold"),
+                         fill=EDGE_LABEL_COLOR, tags="edge_label")
+        return [line, label]
+
+    def node_items(self, node, is_initial=False):
+        """Примитивы узла"""
+        if node not in self.node_positions:
+            return []
+
+        x, y = self.node_positions[node]
+        r = self.node_radius
+        items = []
+
+        if is_initial:
+            # Начальная вершина - двойной круг
+            items.append(OvalItem((x - r - 4, y - r - 4, x + r + 4, y + r + 4),
+                                  fill="#FFD54F", outline="#F57C00", width=3,
+                                  tags="node_outer"))
+            items.append(OvalItem((x - r, y - r, x + r, y + r),
+                                  fill="#FFF176", outline="#F57C00", width=2,
+                                  tags="node"))
+        else:
+            items.append(OvalItem((x - r, y - r, x + r, y + r),
+                                  fill="#4CAF50", outline="#2E7D32", width=3,
+                                  tags="node"))
+
+        text_color = "#333" if is_initial else "white"
+        items.append(TextItem(x, y, str(node), font=("Arial", 12, "bold"),
+                              fill=text_color, tags="node_text"))
+        return items
+
+    def build(self, edges, nodes, initial_state=None) -> DiagramScene:
+        """
+        Построить сцену всего графа
+
+        Args:
+            edges: Кортежи (from, input, output, to)
+            nodes: Список состояний
+            initial_state: Начальная вершина (или кортеж (вершина, символ))
+        """
+        scene = DiagramScene(self.width, self.height)
+
+        if not nodes:
+            scene.items.append(TextItem(
+                self.width / 2, self.height / 2,
+                "Граф пуст\nДобавьте пары для отображения",
+                font=("Arial", 14), fill="#999"
+            ))
+            return scene
+
+        self.calculate_positions(nodes)
+
+        # Сначала рёбра (чтобы они были под узлами)
+        for state_a, phi, psi, state_b in edges:
+            scene.items.extend(self.edge_items(state_a, state_b, phi, psi))
+
+        if isinstance(initial_state, tuple):
+            initial_vertex = initial_state[0]
+        else:
+            initial_vertex = initial_state
+
+        # Затем узлы поверх рёбер
+        for node in nodes:
+            scene.items.extend(self.node_items(node, node == initial_vertex))
+        return scene
+
+
+def build_automaton_scene(automaton, width=500, height=500,
+                          node_radius=25) -> DiagramScene:
+    """Построить сцену для автомата (без создания окна Tk)"""
+    builder = SceneBuilder(width, height, node_radius)
+    return builder.build(edges_from_automaton(automaton),
+                         list(automaton.get_states()),
+                         automaton.get_initial_state())
+
+
+def text_lines(item: TextItem) -> List[str]:
+    """Строки многострочной метки"""
+    return item.text.split("\n")
+
+
+def font_size(item: TextItem) -> int:
+    return int(item.font[1]) if len(item.font) > 1 else 10
+
+
+def font_is_bold(item: TextItem) -> bool:
+    return len(item.font) > 2 and "bold" in str(item.font[2])
+
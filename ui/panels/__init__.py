@@ -2,9 +2,16 @@
 # ui/panels/__init__.py
 # ============================================================================
 
-from ui.panels.base_panel import BasePanel
-from ui.panels.edge_panel import EdgePanel
-from ui.panels.analysis_panel import AnalysisPanel
-from ui.panels.visualization_panel import VisualizationPanel
+from utils import lazy_exports
+
+# Панели импортируются лениво, при первом обращении
+_LAZY_EXPORTS = {
+    "BasePanel": "ui.panels.base_panel",
+    "EdgePanel": "ui.panels.edge_panel",
+    "AnalysisPanel": "ui.panels.analysis_panel",
+    "VisualizationPanel": "ui.panels.visualization_panel",
+}
 
 __all__ = ["BasePanel", "EdgePanel", "AnalysisPanel", "VisualizationPanel"]
+
+__getattr__ = lazy_exports(globals(), _LAZY_EXPORTS)
@@ -2,8 +2,27 @@
 # ui/panels/analysis_panel.py - Панель анализа автомата
 # ============================================================================
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 from ui.panels.base_panel import BasePanel
+from domain.subset_automaton import OUTPUT_POLICIES
+from services.live_edit_processor import Breakpoints
+from services.word_processing import WordProcessingJob
+
+# Период опроса фоновой обработки слова (мс)
+POLL_INTERVAL_MS = 50
+
+# Сколько символов выходного слова показывать в окне результата
+OUTPUT_DISPLAY_LIMIT = 200
+
+# Минимальный период обновления UI в автовоспроизведении (~60 кадров/с)
+FRAME_MS = 16
+
+# Подписи политик выходов подмножеств НКА
+OUTPUT_POLICY_LABELS = {
+    'union': "все выходы {a,b}",
+    'first': "выход первого",
+    'error': "ошибка",
+}
 
 class AnalysisPanel(BasePanel):
     """Панель для анализа автомата и обработки слов"""
@@ -106,6 +125,45 @@ class AnalysisPanel(BasePanel):
             anchor="w", padx=5, pady=5
         )
         self.output_alphabet_label.pack(fill="x")
+
+        # Недетерминированный автомат: выходы подмножеств и детерминизация
+        nfa_row = tk.Frame(frame, bg='#f0f0f0')
+        nfa_row.pack(fill="x", pady=(8, 0))
+
+        self.determinism_label = tk.Label(nfa_row, text="ДКА", bg='#f0f0f0',
+                                          font=("Arial", 9, "bold"))
+        self.determinism_label.pack(side="left")
+
+        self.output_policy_combo = ttk.Combobox(
+            nfa_row,
+            values=[OUTPUT_POLICY_LABELS[p] for p in OUTPUT_POLICIES],
+            width=14,
+            font=("Arial", 8),
+            state='readonly'
+        )
+        self.output_policy_combo.current(
+            OUTPUT_POLICIES.index(self.state_manager.automaton.output_policy)
+        )
+        self.output_policy_combo.pack(side="left", padx=5)
+        self.output_policy_combo.bind('<<ComboboxSelected>>', self._on_output_policy_selected)
+
+        tk.Button(nfa_row, text="Детерминизировать", command=self._determinize,
+                  font=("Arial", 8), cursor="hand2").pack(side="left")
+
+        # Полнота таблицы переходов и дополнение стоком
+        completeness_row = tk.Frame(frame, bg='#f0f0f0')
+        completeness_row.pack(fill="x", pady=(5, 0))
+
+        self.completeness_label = tk.Label(completeness_row, text="Полнота: —",
+                                           bg='#f0f0f0', font=("Arial", 9))
+        self.completeness_label.pack(side="left")
+
+        tk.Button(completeness_row, text="Дополнить стоком", command=self._complete_with_sink,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=5)
+
+        tk.Button(completeness_row, text="Удалить недостижимые",
+                  command=self._prune_unreachable,
+                  font=("Arial", 8), cursor="hand2").pack(side="left")
     
     def _create_word_processing_section(self):
         """Секция обработки слов"""
@@ -164,6 +222,51 @@ class AnalysisPanel(BasePanel):
             pady=4
         ).pack(side="left", expand=True, fill="x", padx=3)
 
+        self._create_autoplay_controls(frame)
+
+        batch_controls = tk.Frame(frame, bg='#f0f0f0')
+        batch_controls.pack(fill="x", pady=(0, 5))
+
+        self.process_button = tk.Button(
+            batch_controls,
+            text="Обработать слово",
+            command=self._process_word,
+            bg='#4CAF50',
+            fg='white',
+            font=("Arial", 10, "bold"),
+            cursor="hand2",
+            padx=10,
+            pady=4
+        )
+        self.process_button.pack(side="left", expand=True, fill="x", padx=3)
+
+        self.cancel_button = tk.Button(
+            batch_controls,
+            text="Отмена",
+            command=self._cancel_word_processing,
+            bg='#f44336',
+            fg='white',
+            font=("Arial", 10, "bold"),
+            cursor="hand2",
+            padx=10,
+            pady=4,
+            state='disabled'
+        )
+        self.cancel_button.pack(side="left", expand=True, fill="x", padx=3)
+
+        self.progress_label = tk.Label(
+            frame,
+            text="",
+            bg='#f0f0f0',
+            font=("Arial", 9),
+            fg='#666',
+            anchor="w"
+        )
+        self.progress_label.pack(fill="x")
+
+        self._word_job = None
+        self._live_output_empty = True
+
         self.live_status_label = tk.Label(
             frame,
             text="Live-Edit: ожидание запуска",
@@ -189,9 +292,11 @@ class AnalysisPanel(BasePanel):
         # )
         # self.result_text.pack(fill="both", expand=True)
 
+        self._create_trace_controls(frame)
+
         self.result_text = tk.Text(
             frame,
-            height=1,
+            height=8,
             font=self.word_entry.cget("font"),
             wrap=tk.NONE,
             state='disabled',
@@ -199,11 +304,93 @@ class AnalysisPanel(BasePanel):
             relief=self.word_entry.cget("relief"),
             highlightthickness=self.word_entry.cget("highlightthickness")
         )
-        self.result_text.pack(fill="x")
+        self.result_text.pack(fill="both", expand=True)
 
+    def _create_autoplay_controls(self, parent):
+        """Автовоспроизведение, N шагов и точки останова live-режима"""
+        row = tk.Frame(parent, bg='#f0f0f0')
+        row.pack(fill="x", pady=(0, 5))
 
+        tk.Label(row, text="Шаг/с:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.rate_spin = tk.Spinbox(row, from_=1, to=1000000, width=6, font=("Arial", 9))
+        self.rate_spin.delete(0, tk.END)
+        self.rate_spin.insert(0, "5")
+        self.rate_spin.pack(side="left", padx=(2, 4))
+
+        self.autoplay_button = tk.Button(row, text="▶ Авто", command=self._toggle_autoplay,
+                                         font=("Arial", 8, "bold"), cursor="hand2")
+        self.autoplay_button.pack(side="left", padx=2)
+
+        tk.Label(row, text="N:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left", padx=(6, 0))
+        self.run_steps_entry = tk.Entry(row, width=6, font=("Arial", 9))
+        self.run_steps_entry.insert(0, "100")
+        self.run_steps_entry.pack(side="left", padx=2)
+
+        tk.Button(row, text="N шагов", command=self._run_n_steps,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=2)
+
+        bp_row = tk.Frame(parent, bg='#f0f0f0')
+        bp_row.pack(fill="x", pady=(0, 5))
+
+        tk.Label(bp_row, text="Останов q:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.bp_state_entry = tk.Entry(bp_row, width=5, font=("Arial", 9))
+        self.bp_state_entry.pack(side="left", padx=2)
+        tk.Label(bp_row, text="A:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.bp_input_entry = tk.Entry(bp_row, width=4, font=("Arial", 9))
+        self.bp_input_entry.pack(side="left", padx=2)
+        tk.Label(bp_row, text="B:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.bp_output_entry = tk.Entry(bp_row, width=4, font=("Arial", 9))
+        self.bp_output_entry.pack(side="left", padx=2)
+
+        tk.Button(bp_row, text="До останова", command=self._run_to_breakpoint,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=2)
+
+        seek_row = tk.Frame(parent, bg='#f0f0f0')
+        seek_row.pack(fill="x", pady=(0, 5))
+
+        tk.Button(seek_row, text="◀ Назад", command=self._live_step_back,
+                  font=("Arial", 8, "bold"), cursor="hand2").pack(side="left", padx=2)
+
+        tk.Label(seek_row, text="Позиция k:", bg='#f0f0f0',
+                 font=("Arial", 9)).pack(side="left", padx=(6, 0))
+        self.seek_entry = tk.Entry(seek_row, width=8, font=("Arial", 9))
+        self.seek_entry.pack(side="left", padx=2)
+        self.seek_entry.bind('<Return>', lambda e: self._live_seek())
+
+        tk.Button(seek_row, text="Перейти", command=self._live_seek,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=2)
+
+        self._autoplay_job = None
+
+    def _create_trace_controls(self, parent):
+        """Оконный просмотр трассы: первые/последние N шагов, переход к шагу k"""
+        row = tk.Frame(parent, bg='#f0f0f0')
+        row.pack(fill="x", pady=(0, 5))
+
+        tk.Label(row, text="N:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.window_size_spin = tk.Spinbox(row, from_=1, to=100000, width=5,
+                                           font=("Arial", 9))
+        self.window_size_spin.delete(0, tk.END)
+        self.window_size_spin.insert(0, "20")
+        self.window_size_spin.pack(side="left", padx=(2, 6))
+
+        tk.Label(row, text="k:", bg='#f0f0f0', font=("Arial", 9)).pack(side="left")
+        self.jump_entry = tk.Entry(row, width=7, font=("Arial", 9))
+        self.jump_entry.pack(side="left", padx=(2, 2))
+
+        tk.Button(row, text="Показать", command=self._render_result_window,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=2)
+
+        self.compress_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(row, text="Сжатие", variable=self.compress_var,
+                       command=self._render_result_window, bg='#f0f0f0',
+                       font=("Arial", 8)).pack(side="left")
+
+        tk.Button(row, text="В файл…", command=self._save_trace,
+                  font=("Arial", 8), cursor="hand2").pack(side="left", padx=2)
+
+        self._last_result = None
 
-    
     # === ОБРАБОТЧИКИ СОБЫТИЙ ===
     
     def _on_vertex_selected(self, event=None):
@@ -219,6 +406,61 @@ class AnalysisPanel(BasePanel):
         if symbols and not self.symbol_combo.get():
             self.symbol_combo.current(0)
     
+    def _on_output_policy_selected(self, event=None):
+        policy = OUTPUT_POLICIES[self.output_policy_combo.current()]
+        self.state_manager.set_output_policy(policy)
+
+    def _determinize(self):
+        """Заменить НКА эквивалентным ДКА (достижимые подмножества)"""
+        automaton = self.state_manager.automaton
+        if automaton.is_deterministic():
+            messagebox.showinfo("Детерминизация", "Автомат уже детерминированный.")
+            return
+        if not messagebox.askyesno(
+                "Детерминизация",
+                "Заменить автомат детерминированным (состояния - подмножества)?"):
+            return
+        try:
+            self.state_manager.determinize()
+        except ValueError as e:
+            messagebox.showerror("Детерминизация", str(e))
+
+    def _complete_with_sink(self) -> bool:
+        """Дополнить незаданные переходы стоковым состоянием"""
+        try:
+            added = self.state_manager.complete_with_sink()
+        except ValueError as e:
+            messagebox.showerror("Полнота", str(e))
+            return False
+        if not added:
+            messagebox.showinfo("Полнота", "Автомат уже полный.")
+        return True
+
+    def _prune_unreachable(self):
+        """Удалить состояния, недостижимые из q0"""
+        if not messagebox.askyesno("Недостижимые состояния",
+                                   "Удалить состояния, недостижимые из q0, и их переходы?"):
+            return
+        try:
+            removed = self.state_manager.prune_unreachable()
+        except ValueError as e:
+            messagebox.showerror("Недостижимые состояния", str(e))
+            return
+        messagebox.showinfo("Недостижимые состояния",
+                            f"Удалено состояний: {removed}" if removed
+                            else "Все состояния достижимы из q0.")
+
+    def _ensure_complete(self, title: str) -> bool:
+        """Проверить полноту; если переходов не хватает - предложить сток"""
+        if self.state_manager.automaton.is_complete():
+            return True
+        return messagebox.askyesno(
+            title,
+            "Автомат не является полным.\n"
+            f"{self.service.format_missing_transitions()}\n\n"
+            "Дополнить незаданные переходы стоковым состоянием?"
+        ) and self._complete_with_sink()
+
     def _set_initial_state(self):
         """Установить начальное состояние только по вершине"""
         state = self.state_combo.get().strip()
@@ -242,29 +484,114 @@ class AnalysisPanel(BasePanel):
             messagebox.showwarning("Ошибка", "Введите входное слово!")
             return
         
-        # NEW: make sure the automaton is deterministic before processing
-        if not self.state_manager.automaton.is_complete():
-            messagebox.showerror(
-                "Недетерминированный автомат",
-                "Нельзя обработать слово: автомат не является полным!"
-            )
+        # Обработка только на полном автомате
+        if not self._ensure_complete("Неполный автомат"):
             return
         
         if not self.state_manager.automaton.get_initial_state():
             messagebox.showwarning("Ошибка", "Сначала установите начальное состояние!")
             return
         
-        # Обрабатываем через автомат
-        result = self.state_manager.automaton.process_word(word)
+        if self._word_job is not None and not self._word_job.done:
+            messagebox.showwarning("Ошибка", "Слово уже обрабатывается!")
+            return
+        
+        # Снимок автомата обрабатывается в рабочем потоке
+        self._word_job = WordProcessingJob(
+            self.state_manager.automaton.compile(),
+            word
+        ).start()
+        
+        self.process_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self._clear_result_output()
+        self.after(POLL_INTERVAL_MS, self._poll_word_job)
+    
+    def _poll_word_job(self):
+        """Опрос фоновой обработки (вызывается через after())"""
+        job = self._word_job
+        if job is None:
+            return
+        
+        if not job.done:
+            if job.total is None:
+                text = "Разбиение слова на символы..."
+            else:
+                text = f"Обработано: {job.processed}/{job.total} ({job.progress:.0%})"
+            self.progress_label.config(text=text)
+            self.after(POLL_INTERVAL_MS, self._poll_word_job)
+            return
         
-        # Форматируем через сервис
-        formatted = self.service.format_process_result(result)
+        self._word_job = None
+        self.process_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        if job.cancelled:
+            status = "Отменено"
+        elif not job.result['success']:
+            status = "Ошибка"
+        else:
+            status = "Готово"
+        self.progress_label.config(text=f"{status}: {job.processed}/{job.total or 0}")
+        
+        self._last_result = job.result
+        self._render_result_window()
+    
+    def _render_result_window(self):
+        """Показать ограниченное окно трассы (размер не зависит от длины слова)"""
+        result = self._last_result
+        if result is None:
+            return
+        
+        try:
+            size = max(1, int(self.window_size_spin.get()))
+        except ValueError:
+            size = 20
+        jump = self.jump_entry.get().strip()
+        around = int(jump) if jump.isdigit() else None
+        
+        ranges = self.service.window_ranges(
+            len(result['steps']), head=size, tail=size,
+            around=around, radius=size // 2
+        )
+        lines = self.service.iter_process_result_lines(
+            result, step_ranges=ranges, compress=self.compress_var.get(),
+            output_limit=OUTPUT_DISPLAY_LIMIT
+        )
         
-        # Отображаем результат
         self.result_text.config(state='normal')
         self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(1.0, formatted)
+        self.result_text.insert(1.0, "".join(lines))
         self.result_text.config(state='disabled')
+        if around is not None:
+            self.result_text.see(self._find_step_line(around))
+    
+    def _find_step_line(self, step_number: int) -> str:
+        """Позиция строки шага в result_text (для прокрутки к шагу k)"""
+        position = self.result_text.search(f"Шаг {step_number}:", 1.0, tk.END)
+        return position or 1.0
+    
+    def _save_trace(self):
+        """Записать полную трассу в файл (потоково)"""
+        if self._last_result is None:
+            messagebox.showwarning("Трасса", "Сначала обработайте слово.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Текст", "*.txt")]
+        )
+        if not path:
+            return
+        try:
+            self.service.write_process_result(
+                self._last_result, path, compress=self.compress_var.get()
+            )
+        except OSError as e:
+            messagebox.showerror("Трасса", str(e))
+    
+    def _cancel_word_processing(self):
+        """Отменить фоновую обработку; частичный результат будет показан"""
+        if self._word_job is not None:
+            self._word_job.cancel()
     
     def _clear_result_output(self):
         """Очищает текстовое поле 'Результат'."""
@@ -283,18 +610,19 @@ class AnalysisPanel(BasePanel):
             messagebox.showwarning("Live-Edit", "Сначала задайте начальное состояние q0.")
             return
 
-        alphabet = self.state_manager.automaton.get_input_alphabet()
-        if not alphabet:
+        validator = self.state_manager.input_validator
+        if not validator.alphabet:
             messagebox.showwarning("Live-Edit", "Автомат не содержит переходов. Добавьте рёбра перед запуском.")
             return
 
-        if any(ch not in alphabet for ch in word):
-            messagebox.showwarning(
-                "Live-Edit",
-                f"Слово содержит символы вне алфавита A = {{ {', '.join(alphabet)} }}.")
+        is_valid, error = validator.validate_word(word)
+        if not is_valid:
+            messagebox.showwarning("Live-Edit", f"{error}.")
             return
 
+        self._stop_autoplay()
         self._clear_result_output()
+        self._last_result = None
         try:
             status = self.state_manager.start_live_edit(word)
         except ValueError as exc:
@@ -304,11 +632,7 @@ class AnalysisPanel(BasePanel):
 
 
     def _live_step(self):
-        if not self.state_manager.automaton.is_complete():
-            messagebox.showerror(
-                "Live-Edit",
-                "Невозможно обработать следующий символ: автомат не полный."
-            )
+        if not self._ensure_complete("Live-Edit"):
             return
         
         try:
@@ -321,14 +645,120 @@ class AnalysisPanel(BasePanel):
             messagebox.showinfo("Live-Edit", "Слово полностью обработано.")
 
     def _reset_live(self):
+        self._stop_autoplay()
         self.state_manager.reset_live_edit()
         self._clear_result_output()
         self.live_status_label.config(text="Live-Edit: ожидание запуска")
 
+    def _live_step_back(self):
+        self._stop_autoplay()
+        try:
+            status = self.state_manager.step_back_live_edit()
+        except ValueError as exc:
+            messagebox.showwarning("Live-Edit", str(exc))
+            return
+        self._render_live_status(status)
+
+    def _live_seek(self):
+        """Перейти к позиции k слова (вперёд или назад)"""
+        self._stop_autoplay()
+        try:
+            position = int(self.seek_entry.get())
+            status = self.state_manager.seek_live_edit(position)
+        except ValueError as exc:
+            messagebox.showwarning("Live-Edit", str(exc) or "k должно быть целым числом.")
+            return
+        self._render_live_status(status)
+        if status.get('error'):
+            messagebox.showerror("Live-Edit", status['error'])
+
+    def _parse_breakpoints(self) -> Breakpoints:
+        """Точки останова из полей ввода (значения через запятую)"""
+        def values(entry):
+            return {v.strip() for v in entry.get().split(",") if v.strip()}
+        return Breakpoints(
+            states=values(self.bp_state_entry),
+            input_symbols=values(self.bp_input_entry),
+            output_symbols=values(self.bp_output_entry)
+        )
+
+    def _live_run(self, max_steps=None, breakpoints=None) -> bool:
+        """
+        Серия шагов одним вызовом (одно уведомление и одна перерисовка)
+
+        Returns:
+            bool: True, если можно продолжать (нет ошибки, останова и конца слова)
+        """
+        if not self.state_manager.live_processor.is_active:
+            messagebox.showwarning("Live-Edit", "Сначала запустите live-режим кнопкой «Пуск».")
+            return False
+        try:
+            status = self.state_manager.run_live_edit(max_steps, breakpoints)
+        except ValueError as exc:
+            messagebox.showerror("Live-Edit", str(exc))
+            return False
+        self._render_live_status(status)
+
+        if status['error']:
+            messagebox.showerror("Live-Edit", status['error'])
+            return False
+        if status['breakpoint_hit']:
+            return False
+        if status['finished']:
+            messagebox.showinfo("Live-Edit", "Слово полностью обработано.")
+            return False
+        return True
+
+    def _run_n_steps(self):
+        try:
+            count = int(self.run_steps_entry.get())
+        except ValueError:
+            messagebox.showwarning("Live-Edit", "N должно быть целым числом.")
+            return
+        self._live_run(max(1, count), self._parse_breakpoints())
+
+    def _run_to_breakpoint(self):
+        breakpoints = self._parse_breakpoints()
+        if breakpoints.is_empty():
+            messagebox.showwarning("Live-Edit", "Задайте хотя бы одну точку останова.")
+            return
+        self._live_run(None, breakpoints)
+
+    def _toggle_autoplay(self):
+        if self._autoplay_job is not None:
+            self._stop_autoplay()
+            return
+        if not self.state_manager.live_processor.is_active:
+            messagebox.showwarning("Live-Edit", "Сначала запустите live-режим кнопкой «Пуск».")
+            return
+        try:
+            rate = max(1, int(self.rate_spin.get()))
+        except ValueError:
+            rate = 5
+        # Не чаще одного обновления за кадр: при большой скорости - пачка шагов за тик
+        interval = max(FRAME_MS, 1000 // rate)
+        steps_per_tick = max(1, round(rate * interval / 1000))
+        self.autoplay_button.config(text="⏸ Пауза")
+        self._autoplay_tick(interval, steps_per_tick, self._parse_breakpoints())
+
+    def _autoplay_tick(self, interval, steps_per_tick, breakpoints):
+        self._autoplay_job = None
+        if self._live_run(steps_per_tick, breakpoints):
+            self._autoplay_job = self.after(
+                interval, self._autoplay_tick, interval, steps_per_tick, breakpoints
+            )
+        else:
+            self._stop_autoplay()
+
+    def _stop_autoplay(self):
+        if self._autoplay_job is not None:
+            self.after_cancel(self._autoplay_job)
+            self._autoplay_job = None
+        self.autoplay_button.config(text="▶ Авто")
+
     def _render_live_status(self, status: dict):
-        history = status.get('history', [])
         pointer = status.get('pointer', 0)
-        length = len(status.get('word', ""))
+        length = status.get('length', len(status.get('word', "")))
         current_state = status.get('current_state', '∅')
         last = status.get('last_step')
 
@@ -339,27 +769,36 @@ class AnalysisPanel(BasePanel):
             text=f"w[{pointer}/{length}], q={current_state}{extra}"
         )
 
-        output_chars = []
-        for step in history:
-            if step.output_symbol:
-                output_chars.append(step.output_symbol)
-
-        result_text = ""
-        if output_chars:
-            result_text += "".join(output_chars)
-        else:
-            result_text += "—"
+        if status.get('breakpoint_hit'):
+            self.live_status_label.config(
+                text=self.live_status_label.cget("text") + f" | ⛔ {status['breakpoint_hit']}"
+            )
 
+        # Дописываем только новые выходные символы; полная история - get_history()
+        delta_output = status.get('delta_output', "")
         self.result_text.config(state='normal')
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(1.0, result_text)
+        trim = status.get('output_trim', 0)
+        if trim:
+            # Переход назад по истории: убираем только хвост выходного слова
+            self.result_text.delete(f"end-{trim + 1}c", "end-1c")
+        if status.get('history_length', 0) == 0 or (
+                trim and self.result_text.compare("end-1c", "==", "1.0")):
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(1.0, "—")
+            self._live_output_empty = True
+        elif delta_output:
+            if self._live_output_empty:
+                self.result_text.delete(1.0, tk.END)
+                self._live_output_empty = False
+            self.result_text.insert(tk.END + "-1c", delta_output)
         self.result_text.config(state='disabled')
 
 
-
-
     def on_state_changed(self, event_type: str, data=None):
         """Обновить отображение при изменении состояния"""
+        if event_type.startswith('live_edit'):
+            return  # Автомат не изменился - статус рисует _render_live_status
+        
         # Обновляем комбобоксы состояний
         info = self.service.get_automaton_info()
         self.state_combo['values'] = info['states']
@@ -367,13 +806,27 @@ class AnalysisPanel(BasePanel):
         # Обновляем алфавиты
         input_str = "{ " + ", ".join(info['input_alphabet']) + " }" if info['input_alphabet'] else "{ }"
         output_str = "{ " + ", ".join(info['output_alphabet']) + " }" if info['output_alphabet'] else "{ }"
+        if info['symbol_ambiguity']:
+            # Многобуквенные символы: слово читается по самому длинному совпадению
+            first, second = info['symbol_ambiguity']
+            input_str += f"\n⚠ неоднозначно: {'·'.join(first)} = {'·'.join(second)}"
         
         self.input_alphabet_label.config(text=input_str)
         self.output_alphabet_label.config(text=output_str)
+        self.determinism_label.config(
+            text="ДКА" if info['is_deterministic'] else "НКА, выход подмножества:"
+        )
+        completeness = info['completeness']
+        self.completeness_label.config(
+            text=f"Полнота: {completeness['percentage']:.1f}%"
+            + (f" (не задано: {completeness['missing']})" if completeness['missing'] else "")
+        )
         
         # Обновляем метку начального состояния
         if event_type == 'initial_state_changed' and data:
             self.current_label.config(text=f"Текущее: q0 = {data}")
         elif event_type == 'cleared':
             self.current_label.config(text="Текущее: q0 не задано")
+        elif event_type == 'state_restored' and data and data.get('initial_state'):
+            self.current_label.config(text=f"Текущее: q0 = {data['initial_state']}")
 
@@ -2,8 +2,19 @@
 # ui/panels/edge_panel.py - Панель управления рёбрами
 # ============================================================================
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import ttk, messagebox, filedialog
+from services.automaton_io import read_transition_rows, moore_rows, read_patterns
 from ui.panels.base_panel import BasePanel
+from ui.virtual_listbox import VirtualListbox
+
+# Подписи полей фильтра -> поля TransitionIndex (None - все поля)
+FILTER_CHOICES = {
+    "Все": None,
+    "q(t)": 'from_state',
+    "A": 'input_symbol',
+    "B": 'output_symbol',
+    "q(t+1)": 'to_state',
+}
 
 class EdgePanel(BasePanel):
     """Панель для добавления и управления рёбрами (переходами)"""
@@ -85,6 +96,44 @@ class EdgePanel(BasePanel):
             pady=5
         )
         add_button.grid(row=4, column=0, columnspan=2, pady=10)
+
+        # Импорт таблицы переходов одной пачкой
+        import_button = tk.Button(
+            input_frame,
+            text="📂 Импорт…",
+            command=self._import_edges,
+            bg='#2196F3',
+            fg='white',
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+            padx=10,
+            pady=5
+        )
+        import_button.grid(row=4, column=2, columnspan=2, pady=10)
+
+        # Автомат поиска образцов (Ахо-Корасик) из файла образцов
+        tk.Button(
+            input_frame,
+            text="🔎 Образцы…",
+            command=self._load_patterns,
+            bg='#9C27B0',
+            fg='white',
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+            padx=10,
+            pady=5
+        ).grid(row=6, column=0, columnspan=4, pady=(5, 0))
+
+        # Несколько переходов по одному (q, a) - недетерминированный автомат
+        self.nondeterministic_var = tk.BooleanVar(value=self.state_manager.allow_nondeterministic)
+        tk.Checkbutton(
+            input_frame,
+            text="Разрешить НКА (несколько q(t+1) по A)",
+            variable=self.nondeterministic_var,
+            command=self._toggle_nondeterministic,
+            bg='#f0f0f0',
+            font=("Arial", 8)
+        ).grid(row=5, column=0, columnspan=4, sticky="w")
     
     def _create_edge_list(self):
         """Создать список рёбер с прокруткой"""
@@ -99,25 +148,40 @@ class EdgePanel(BasePanel):
         # list_frame.pack(padx=10, pady=10, fill="both", expand=True)
         list_frame.pack(padx=10, pady=10, fill="x")
 
-        
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-       
-       
+        # Фильтр по префиксу поля (через индексы, без просмотра всех рёбер)
+        filter_row = tk.Frame(list_frame, bg='#f0f0f0')
+        filter_row.pack(fill="x", pady=(0, 5))
 
+        tk.Label(filter_row, text="Поиск:", bg='#f0f0f0',
+                 font=("Arial", 9)).pack(side="left")
 
-        self.listbox = tk.Listbox(
-            list_frame,
-            font=("Courier", 10),
-            height=10,
-            yscrollcommand=scrollbar.set,
-            selectmode=tk.SINGLE
+        self.filter_field_combo = ttk.Combobox(
+            filter_row,
+            values=list(FILTER_CHOICES),
+            width=6,
+            font=("Arial", 9),
+            state='readonly'
         )
+        self.filter_field_combo.current(0)
+        self.filter_field_combo.pack(side="left", padx=5)
+        self.filter_field_combo.bind('<<ComboboxSelected>>', lambda e: self._apply_filter())
 
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *args: self._apply_filter())
+        tk.Entry(filter_row, textvariable=self.filter_var, width=10,
+                 font=("Arial", 10)).pack(side="left", fill="x", expand=True)
 
-        self.listbox.pack(fill="x")  # было fill="both", expand=True
-        scrollbar.config(command=self.listbox.yview)
+        self._filtered = None  # None - фильтр не активен
+
+        # В виджете хранятся только видимые строки, остальные берутся из автомата
+        self.edge_list = VirtualListbox(
+            list_frame,
+            row_count=self._row_count,
+            fetch_rows=self._format_rows,
+            height=10,
+            font=("Courier", 10)
+        )
+        self.edge_list.pack(fill="x")
     
     def _create_control_buttons(self):
         """Создать кнопки управления"""
@@ -203,7 +267,8 @@ class EdgePanel(BasePanel):
         
         # Валидация через сервис
         is_valid, error = self.service.validate_transition(
-            from_state, input_sym, output_sym, to_state
+            from_state, input_sym, output_sym, to_state,
+            allow_nondeterministic=self.state_manager.allow_nondeterministic
         )
         
         if not is_valid:
@@ -217,15 +282,80 @@ class EdgePanel(BasePanel):
         for entry in [self.entry_q_t, self.entry_A, self.entry_B, self.entry_q_t_plus_1]:
             entry.delete(0, tk.END)
     
+    def _toggle_nondeterministic(self):
+        self.state_manager.allow_nondeterministic = self.nondeterministic_var.get()
+
+    def _import_edges(self):
+        """Импортировать переходы из CSV/текстовой таблицы или JSON"""
+        path = filedialog.askopenfilename(
+            title="Импорт переходов",
+            filetypes=[("Таблица переходов", "*.csv *.txt"), ("JSON", "*.json"),
+                       ("Все файлы", "*.*")]
+        )
+        if not path:
+            return
+
+        try:
+            table = read_transition_rows(path)
+            if table.model == "mealy" and not messagebox.askyesno(
+                "Таблица Мили",
+                "Выходы заданы на рёбрах (автомат Мили).\n"
+                "Преобразовать в автомат Мура с расщеплением состояний?"
+            ):
+                return
+            # Выходы рёбер Мили переходят в выходы копий состояний
+            rows, initial_state, _ = moore_rows(table)
+            # Проверка и добавление всей пачки, одно уведомление
+            added = self.state_manager.add_transitions(rows)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка импорта", str(e))
+            return
+
+        automaton = self.state_manager.automaton
+        initial_state = initial_state or (rows[0][0] if rows else None)
+        if automaton.get_initial_state() is None and initial_state is not None:
+            try:
+                self.state_manager.set_initial_state(initial_state)
+            except ValueError:
+                pass
+        messagebox.showinfo("Импорт", f"Добавлено рёбер: {added}")
+
+    def _load_patterns(self):
+        """Построить автомат поиска образцов (по образцу в строке файла)"""
+        path = filedialog.askopenfilename(
+            title="Файл образцов",
+            filetypes=[("Текст", "*.txt"), ("Все файлы", "*.*")]
+        )
+        if not path:
+            return
+        if self.state_manager.automaton.get_transition_count() and not messagebox.askyesno(
+            "Подтверждение", "Текущий автомат будет заменён автоматом поиска образцов. Продолжить?"
+        ):
+            return
+
+        try:
+            patterns = read_patterns(path)
+            states = self.state_manager.load_patterns(patterns)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        messagebox.showinfo(
+            "Образцы",
+            f"Образцов: {len(patterns)}, состояний: {states}\n"
+            "Выход состояния - номера найденных образцов (с нуля)"
+        )
+
     def _delete_selected(self):
         """Удалить выбранное ребро"""
-        selection = self.listbox.curselection()
+        index = self.edge_list.selected_index()
         
-        if not selection:
+        if index is None:
             messagebox.showwarning("Ошибка", "Выберите ребро для удаления!")
             return
         
-        index = selection[0]
+        if self._filtered is not None:
+            # Индекс в отфильтрованном списке -> индекс в автомате
+            index = self.state_manager.transition_index.position(self._filtered[index])
         self.state_manager.remove_transition(index)
     
     def _clear_all(self):
@@ -240,32 +370,59 @@ class EdgePanel(BasePanel):
     
     def on_state_changed(self, event_type: str, data=None):
         """Обновить отображение при изменении состояния"""
-        self._refresh_list()
+        if event_type.startswith('live_edit') or event_type == 'initial_state_changed':
+            return  # Список рёбер не меняется
+
+        if self._filtered is not None:
+            self._filtered = self._search()
+            self.edge_list.refresh()
+        elif event_type == 'transition_removed':
+            self.edge_list.row_removed(data['index'])
+        elif event_type in ('cleared', 'state_restored'):
+            self.edge_list.reset()
+        else:
+            self.edge_list.refresh()
+
+        self._update_counter()
+
+    def _apply_filter(self):
+        """Пересчитать фильтр после изменения запроса"""
+        self._filtered = self._search() if self.filter_var.get().strip() else None
+        self.edge_list.reset()
+
+    def _search(self):
+        field = FILTER_CHOICES[self.filter_field_combo.get()]
+        return self.state_manager.transition_index.search(self.filter_var.get().strip(), field)
+
+    def _row_count(self) -> int:
+        if self._filtered is not None:
+            return len(self._filtered)
+        return self.state_manager.automaton.get_transition_count()
     
-    def _refresh_list(self):
+    def _format_rows(self, start: int, stop: int):
+        """Отформатировать только строки [start, stop) списка рёбер"""
+        automaton = self.state_manager.automaton
+        if self._filtered is not None:
+            # Порядковый номер в автомате не хранится - строки без номера
+            return [
+                f"{t.from_state} --({t.symbol} / {automaton.get_output(t.to_state, '?')})--> {t.to_state}"
+                for t in self._filtered[start:stop]
+            ]
 
-        """Обновить список рёбер (ИСПРАВЛЕНО)"""
-        self.listbox.delete(0, tk.END)
-        
+        rows = []
+        for i, (from_state, input_sym, to_state) in enumerate(
+                automaton.get_transitions_slice(start, stop), start):
+            # Выходной символ {B} берётся у КОНЕЧНОГО состояния (логика Мура)
+            output_sym = automaton.get_output(to_state, '?')
+            rows.append(f"{i}. {from_state} --({input_sym} / {output_sym})--> {to_state}")
+        return rows
+
+    def _update_counter(self):
+        """Обновить счётчик рёбер и узлов"""
         automaton = self.state_manager.automaton
-        transitions = automaton.get_transitions() # Это [(from, in, to), ...]
-        outputs = automaton.get_outputs()         # Это {state: output, ...}
-        
-        for i, t in enumerate(transitions):
-            from_state, input_sym, to_state = t
-            
-            # Получаем выходной символ {B} для КОНЕЧНОГО состояния (логика Мура)
-            output_sym = outputs.get(to_state, '?') # '?' если выход не найден
-            
-            # Собираем строку в нужном формате
-            formatted_str = f"{i}. {from_state} --({input_sym} / {output_sym})--> {to_state}"
-            self.listbox.insert(tk.END, formatted_str)
-        
-        # Обновляем счётчик
-        info = self.service.get_automaton_info()
         self.counter_label.config(
-            text=f"Рёбер: {info['transitions_count']} | Узлов: {len(info['states'])}"
-        )   
+            text=f"Рёбер: {automaton.get_transition_count()} | Узлов: {len(automaton.states)}"
+        )
 
     def _remove_state(self, state: str):
         if not state:
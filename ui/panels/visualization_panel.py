@@ -2,6 +2,9 @@
 # ui/panels/visualization_panel.py - Панель визуализации
 # ============================================================================
 import tkinter as tk
+from tkinter import filedialog, messagebox
+from domain.graph_analysis import reachable_states
+from ui.diagram_scene import edges_from_automaton
 from ui.graph_drawing import GraphCanvas
 from ui.panels.base_panel import BasePanel
 
@@ -30,6 +33,32 @@ class VisualizationPanel(BasePanel):
             height=500
         )
         self.canvas.pack(fill="both", expand=True)
+
+        controls = tk.Frame(title_frame, bg='white')
+        controls.pack(fill="x", pady=(5, 0))
+
+        # Недостижимые из q0 состояния не рисуются (автомат не меняется)
+        self.reachable_only_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            controls,
+            text="Только достижимые из q0",
+            variable=self.reachable_only_var,
+            command=self._refresh_graph,
+            bg='white',
+            font=("Arial", 8)
+        ).pack(side="left")
+
+        tk.Button(
+            controls,
+            text="Экспорт SVG/PNG",
+            command=self._export_diagram,
+            bg='#607D8B',
+            fg='white',
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+            padx=10,
+            pady=3
+        ).pack(side="right")
         
         # Объект для рисования
         self.graph_canvas = GraphCanvas(self.canvas, 500, 500)
@@ -48,25 +77,49 @@ class VisualizationPanel(BasePanel):
     
     def on_state_changed(self, event_type: str, data=None):
         """Перерисовать граф при изменении состояния"""
+        if event_type.startswith('live_edit'):
+            return  # Шаги live-режима граф не меняют
         self._refresh_graph()
     
+    def _visible_states(self):
+        """Рисуемые состояния: все или только достижимые из q0"""
+        automaton = self.state_manager.automaton
+        if self.reachable_only_var.get() and automaton.get_initial_state() is not None:
+            return reachable_states(automaton)
+        return list(automaton.get_states())
+
     def _refresh_graph(self):
         """Обновить визуализацию (ИСПРАВЛЕНО)"""
         automaton = self.state_manager.automaton
         
-        # Получаем данные
-        transitions = automaton.get_transitions() # [(from, in, to), ...]
-        nodes = list(automaton.get_states())
+        nodes = self._visible_states()
         initial_state = automaton.get_initial_state()
-        outputs = automaton.get_outputs()         # {state: output, ...}
 
-        # (ДОБАВЛЕНО) Собираем 4-элементные кортежи, которые ждет graph_drawing
-        # (from, input, output, to)
-        edges_for_drawing = []
-        for from_state, input_sym, to_state in transitions:
-            # Берем выход {B} из КОНЕЧНОГО состояния (по нашей логике Мура)
-            output_sym = outputs.get(to_state, '?') 
-            edges_for_drawing.append((from_state, input_sym, output_sym, to_state))
-        
-        # (ИЗМЕНЕНО) Передаем 'edges_for_drawing'
-        self.graph_canvas.draw_graph(edges_for_drawing, nodes, initial_state)
\ No newline at end of file
+        # Кортежи (from, input, output, to), выход берётся из КОНЕЧНОГО состояния
+        edges_for_drawing = edges_from_automaton(automaton, nodes)
+
+        self.graph_canvas.draw_graph(edges_for_drawing, nodes, initial_state)
+
+    def _export_diagram(self):
+        """Сохранить текущую диаграмму в SVG или PNG"""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".svg",
+            filetypes=[("SVG", "*.svg"), ("PNG", "*.png")]
+        )
+        if not path:
+            return
+
+        # Экспортёр загружается только при первом экспорте
+        from ui.diagram_export import export_scene
+
+        automaton = self.state_manager.automaton
+        nodes = self._visible_states()
+        scene = self.graph_canvas.builder.build(
+            edges_from_automaton(automaton, nodes),
+            nodes,
+            automaton.get_initial_state()
+        )
+        try:
+            export_scene(scene, path)
+        except (ValueError, RuntimeError, OSError) as e:
+            messagebox.showerror("Экспорт", str(e))
@@ -0,0 +1,122 @@
+# ============================================================================
+# ui/virtual_listbox.py - Виртуализированный список
+# ============================================================================
+import tkinter as tk
+
+
+class VirtualListbox(tk.Frame):
+    """
+    Список, который хранит в tk.Listbox только видимое окно строк.
+
+    Строки не копируются в виджет: при прокрутке и обновлении
+    запрашиваются и форматируются только `height` строк, начиная с `top`.
+    Стоимость обновления не зависит от общего числа строк.
+    """
+
+    def __init__(self, parent, row_count, fetch_rows, height=10, **listbox_options):
+        """
+        Args:
+            parent: Родительский виджет
+            row_count: Функция без аргументов -> общее число строк
+            fetch_rows: Функция (start, stop) -> список строк для отображения
+            height: Число видимых строк
+            **listbox_options: Параметры tk.Listbox (шрифт и т.п.)
+        """
+        super().__init__(parent, bg=parent.cget('bg'))
+        self._row_count = row_count
+        self._fetch_rows = fetch_rows
+        self._height = height
+        self._top = 0
+        self._selected = None
+
+        self.scrollbar = tk.Scrollbar(self, command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox = tk.Listbox(
+            self,
+            height=height,
+            selectmode=tk.SINGLE,
+            exportselection=False,
+            **listbox_options
+        )
+        self.listbox.pack(fill="x")
+
+        self.listbox.bind('<<ListboxSelect>>', self._on_select)
+        self.listbox.bind('<MouseWheel>', self._on_mousewheel)
+        self.listbox.bind('<Button-4>', lambda e: self._scroll_by(-1))
+        self.listbox.bind('<Button-5>', lambda e: self._scroll_by(1))
+
+    # === Публичный интерфейс ===
+
+    def refresh(self):
+        """Перерисовать видимое окно строк"""
+        total = self._row_count()
+        self._top = max(0, min(self._top, total - self._height))
+        stop = min(total, self._top + self._height)
+
+        self.listbox.delete(0, tk.END)
+        rows = self._fetch_rows(self._top, stop) if stop > self._top else []
+        if rows:
+            self.listbox.insert(tk.END, *rows)
+
+        if self._selected is not None and self._selected >= total:
+            self._selected = None
+        if self._selected is not None and self._top <= self._selected < stop:
+            self.listbox.selection_set(self._selected - self._top)
+
+        if total:
+            self.scrollbar.set(self._top / total, stop / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def row_removed(self, index: int):
+        """Строка с индексом index удалена из источника"""
+        if self._selected is not None:
+            if self._selected == index:
+                self._selected = None
+            elif self._selected > index:
+                self._selected -= 1
+        if index < self._top:
+            self._top -= 1
+        self.refresh()
+
+    def reset(self):
+        """Сбросить прокрутку и выделение (источник полностью заменён)"""
+        self._top = 0
+        self._selected = None
+        self.refresh()
+
+    def selected_index(self):
+        """Абсолютный индекс выделенной строки или None"""
+        return self._selected
+
+    def see(self, index: int):
+        """Прокрутить так, чтобы строка index была видна"""
+        if index < self._top or index >= self._top + self._height:
+            self._top = max(0, index - self._height // 2)
+            self.refresh()
+
+    # === Обработчики ===
+
+    def _on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self._selected = self._top + selection[0]
+
+    def _on_scroll(self, *args):
+        total = self._row_count()
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * total)
+            self.refresh()
+        elif args[0] == 'scroll':
+            step = self._height if args[2] == 'pages' else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        self._scroll_by(-1 if event.delta > 0 else 1)
+        return "break"
+
+    def _scroll_by(self, rows: int):
+        self._top += rows
+        self.refresh()
+        return "break"
@@ -3,18 +3,48 @@
 # ============================================================================
 """
 Утилиты и вспомогательные функции
+
+Имена импортируются лениво (при первом обращении).
 """
 
-from .validators import (
-    InputValidator,
-    validate_state_name,
-    validate_symbol,
-    validate_word
-)
+from importlib import import_module
+
+
+def lazy_exports(namespace, exports):
+    """
+    Модульный __getattr__ для ленивого импорта имён пакета
+
+    Args:
+        namespace: globals() пакета (импортированное имя запоминается в нём)
+        exports: {имя: модуль, из которого оно импортируется}
+
+    Returns:
+        Callable: Функция для присваивания __getattr__ в __init__ пакета
+    """
+    def __getattr__(name):
+        if name in exports:
+            value = getattr(import_module(exports[name]), name)
+            namespace[name] = value
+            return value
+        raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}")
+    return __getattr__
+
+_LAZY_EXPORTS = {
+    'InputValidator': 'utils.validators',
+    'validate_state_name': 'utils.validators',
+    'validate_symbol': 'utils.validators',
+    'validate_word': 'utils.validators',
+    'validate_edge': 'utils.validators',
+    'validate_edges': 'utils.validators',
+}
 
 __all__ = [
     'InputValidator',
     'validate_state_name',
     'validate_symbol',
-    'validate_word'
-]
\ No newline at end of file
+    'validate_word',
+    'validate_edge',
+    'validate_edges'
+]
+
+__getattr__ = lazy_exports(globals(), _LAZY_EXPORTS)
@@ -1 +1,187 @@
-# Валидаторы ввода
+# ============================================================================
+# utils/validators.py
+# ============================================================================
+"""
+Валидаторы ввода
+Имена состояний и символов проверяются заранее скомпилированным регулярным
+выражением, слова - через frozenset входного алфавита. InputValidator
+кэширует алфавит до следующего изменения автомата (automaton.version).
+
+Все функции возвращают (is_valid, error_message), как
+AutomatonService.validate_transition().
+"""
+
+import re
+from typing import FrozenSet, Iterable, List, Tuple
+
+from domain.tokenizer import Tokenizer
+
+# Имя состояния или символ: без пробелов и без разделителей таблицы
+# переходов (',', ';', '#'), иначе их нельзя сохранить в текстовом формате
+NAME_PATTERN = re.compile(r"[^\s,;#]+")
+
+# Максимальная длина имени состояния / символа
+MAX_NAME_LENGTH = 64
+
+
+def validate_state_name(name: str) -> Tuple[bool, str]:
+    """
+    Проверить имя состояния
+
+    Returns:
+        Tuple[bool, str]: (is_valid, error_message)
+    """
+    return _validate_name(name, "Имя состояния")
+
+
+def validate_symbol(symbol: str) -> Tuple[bool, str]:
+    """
+    Проверить входной или выходной символ
+
+    Returns:
+        Tuple[bool, str]: (is_valid, error_message)
+    """
+    return _validate_name(symbol, "Символ")
+
+
+def validate_word(word: str, alphabet: FrozenSet[str]) -> Tuple[bool, str]:
+    """
+    Проверить, что слово состоит из символов односимвольного алфавита
+
+    Проверка выполняется разностью множеств, без цикла по символам в Python.
+    Для многобуквенных символов - InputValidator.validate_word().
+
+    Args:
+        word: Входное слово
+        alphabet: Входной алфавит (frozenset односимвольных строк)
+
+    Returns:
+        Tuple[bool, str]: (is_valid, error_message)
+    """
+    if not word:
+        return False, "Слово не должно быть пустым"
+    foreign = set(word) - alphabet
+    if not foreign:
+        return True, ""
+    position = min(word.index(symbol) for symbol in foreign)
+    return False, (
+        f"Символ '{word[position]}' (позиция {position + 1}) вне алфавита "
+        f"A = {{ {', '.join(sorted(alphabet))} }}"
+    )
+
+
+def validate_edge(row: Tuple[str, str, str, str]) -> Tuple[bool, str]:
+    """
+    Проверить формат полей ребра (q(t), A, B, q(t+1))
+
+    Returns:
+        Tuple[bool, str]: (is_valid, error_message)
+    """
+    fullmatch = NAME_PATTERN.fullmatch
+    for value, check in zip(row, _EDGE_FIELD_CHECKS):
+        # Быстрый путь для корректного поля - без форматирования сообщения
+        if not value or len(value) > MAX_NAME_LENGTH or fullmatch(value) is None:
+            return False, check(value)[1]
+    return True, ""
+
+
+def validate_edges(rows: Iterable[Tuple[str, str, str, str]]) -> List[str]:
+    """
+    Проверить формат полей пачки рёбер (q(t), A, B, q(t+1))
+
+    Returns:
+        List[str]: Ошибки вида "Переход N: ..." (пустой список - все поля корректны)
+    """
+    errors = []
+    for number, row in enumerate(rows, 1):
+        is_valid, error = validate_edge(row)
+        if not is_valid:
+            errors.append(f"Переход {number}: {error}")
+    return errors
+
+
+def _validate_name(name: str, what: str) -> Tuple[bool, str]:
+    if not name:
+        return False, f"Не задано: {what.lower()}"
+    if len(name) > MAX_NAME_LENGTH:
+        return False, f"{what} длиннее {MAX_NAME_LENGTH} символов"
+    if NAME_PATTERN.fullmatch(name) is None:
+        return False, f"{what} '{name}' содержит пробел или символ из ',;#'"
+    return True, ""
+
+
+_EDGE_FIELD_CHECKS = (validate_state_name, validate_symbol, validate_symbol, validate_state_name)
+
+
+class InputValidator:
+    """
+    Валидатор ввода, привязанный к автомату.
+
+    Входной алфавит строится один раз на версию автомата и хранится
+    как frozenset; пакетные методы проверяют много слов/рёбер за один вызов.
+    """
+
+    def __init__(self, automaton):
+        """
+        Args:
+            automaton: Экземпляр конечного автомата
+        """
+        self.automaton = automaton
+        self._version = -1
+        self._alphabet: FrozenSet[str] = frozenset()
+        self._sorted_alphabet: Tuple[str, ...] = ()
+        self._tokenizer = Tokenizer(())
+
+    @property
+    def alphabet(self) -> FrozenSet[str]:
+        """Входной алфавит текущей версии автомата"""
+        self._refresh()
+        return self._alphabet
+
+    @property
+    def sorted_alphabet(self) -> Tuple[str, ...]:
+        """Входной алфавит, отсортированный для отображения"""
+        self._refresh()
+        return self._sorted_alphabet
+
+    def validate_word(self, word: str) -> Tuple[bool, str]:
+        """Проверить слово по входному алфавиту автомата"""
+        self._refresh()
+        if self._tokenizer.single_char:
+            return validate_word(word, self._alphabet)
+        if not word:
+            return False, "Слово не должно быть пустым"
+        _, position = self._tokenizer.tokenize(word)
+        if position is None:
+            return True, ""
+        return False, (
+            f"С позиции {position + 1} ('{word[position:position + 10]}') не читается "
+            f"ни один символ алфавита A = {{ {', '.join(self._sorted_alphabet)} }}"
+        )
+
+    def validate_words(self, words: Iterable[str]) -> List[Tuple[int, str]]:
+        """
+        Проверить пачку слов
+
+        Returns:
+            List[Tuple[int, str]]: (номер слова с 1, ошибка) для неверных слов
+        """
+        alphabet = self.alphabet
+        single_char = self._tokenizer.single_char
+        errors = []
+        for number, word in enumerate(words, 1):
+            # Быстрый путь для корректных слов - без форматирования сообщения
+            if single_char and word and alphabet.issuperset(word):
+                continue
+            is_valid, error = self.validate_word(word)
+            if not is_valid:
+                errors.append((number, error))
+        return errors
+
+    def _refresh(self) -> None:
+        version = self.automaton.version
+        if version != self._version:
+            self._alphabet = frozenset(t.symbol for t in self.automaton.transitions)
+            self._sorted_alphabet = tuple(sorted(self._alphabet))
+            self._tokenizer = Tokenizer(self._alphabet)
+            self._version = version